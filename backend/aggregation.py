@@ -9,13 +9,13 @@ from collections import defaultdict
 from pydantic import BaseModel
 
 from database import (
-    Paper, PaperTags, DailySnapshot,
+    Paper, PaperTags, DailySnapshot, UpvoteSnapshot,
     get_papers_by_date_range,
     get_papers_with_tags_by_date_range,
     get_daily_snapshot,
     get_daily_snapshots_range,
     save_daily_snapshot,
-    record_upvote_snapshot,
+    record_upvote_snapshots_many,
 )
 from taxonomy import get_category_color
 
@@ -359,8 +359,9 @@ async def save_daily_snapshot_for_date(date_str: str) -> DailySnapshot:
 
     # Record upvote snapshots for trending analysis
     papers_with_tags = await get_papers_with_tags_by_date_range(date_str, date_str)
-    for item in papers_with_tags:
-        paper = item["paper"]
-        await record_upvote_snapshot(paper.id, date_str, paper.upvotes)
+    await record_upvote_snapshots_many([
+        UpvoteSnapshot(paper_id=item["paper"].id, date=date_str, upvotes=item["paper"].upvotes)
+        for item in papers_with_tags
+    ])
 
     return snapshot
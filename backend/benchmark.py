@@ -0,0 +1,383 @@
+"""
+Micro-benchmarks for hot paths in the backend.
+
+Usage:
+    python benchmark.py hydration [--rows 10000] [--repeat 5]
+    python benchmark.py queries [--papers 50000] [--repeat 5]
+    python benchmark.py graph [--clusters 50] [--papers 5000] [--repeat 5]
+    python benchmark.py parsing [--pages DIR | --http-cache] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import database
+from database import (
+    Paper, PaperTags, Taxonomy, UpvoteSnapshot, PaperQuery,
+    row_to_paper, joined_row_to_tags, encode_cursor,
+    upsert_papers_many, save_taxonomy, save_paper_tags_many, record_upvote_snapshots_many,
+)
+from llm_tagger import DEFAULT_CONTRIBUTION_TAGS, DEFAULT_TASK_TAGS, DEFAULT_MODALITY_TAGS
+
+
+def _best_of(repeat: int, fn) -> float:
+    """Run fn `repeat` times and return the fastest wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# ============= Row Hydration =============
+
+def _synthetic_joined_rows(count: int) -> list[sqlite3.Row]:
+    """Build papers LEFT JOIN paper_tags shaped rows in an in-memory database."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE rows (
+            id TEXT, title TEXT, abstract TEXT, published_date TEXT, hf_url TEXT,
+            arxiv_url TEXT, pdf_url TEXT, upvotes INTEGER, authors_json TEXT,
+            content_hash TEXT, appeared_date TEXT, created_at TEXT, updated_at TEXT,
+            primary_contribution_tag TEXT, secondary_contribution_tags_json TEXT,
+            task_tags_json TEXT, modality_tags_json TEXT, research_question TEXT,
+            confidence REAL, rationale TEXT, month TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                f"2401.{i:05d}", f"Paper {i}", "Abstract text. " * 80, "2024-01-15",
+                f"https://huggingface.co/papers/2401.{i:05d}",
+                f"https://arxiv.org/abs/2401.{i:05d}", f"https://arxiv.org/pdf/2401.{i:05d}.pdf",
+                i % 500, json.dumps([f"Author {i}-{j}" for j in range(6)]),
+                f"hash{i}", "2024-01-15", "2024-01-15T00:00:00", "2024-01-15T00:00:00",
+                "LLM / Foundation Models", json.dumps(["Efficient AI"]),
+                json.dumps(["generation", "reasoning"]), json.dumps(["text"]),
+                "Research question", 0.9, "Rationale", "2024-01",
+            )
+            for i in range(count)
+        ],
+    )
+    rows = conn.execute("SELECT * FROM rows").fetchall()
+    conn.close()
+    return rows
+
+
+def bench_hydration(rows: int, repeat: int):
+    """Compare validated and trusted hydration of joined paper rows."""
+    data = _synthetic_joined_rows(rows)
+
+    def hydrate(validate: bool):
+        def run():
+            for row in data:
+                row_to_paper(row, validate=validate)
+                joined_row_to_tags(row, validate=validate)
+        return run
+
+    validated = _best_of(repeat, hydrate(True))
+    trusted = _best_of(repeat, hydrate(False))
+    per_10k = 10_000 / rows
+
+    print(f"Hydrating {rows} joined rows (Paper + PaperTags), best of {repeat}")
+    print(f"  validated (model_validate):  {validated * per_10k * 1000:8.1f} ms / 10k rows")
+    print(f"  trusted (no validation):     {trusted * per_10k * 1000:8.1f} ms / 10k rows")
+    print(f"  speedup:                     {validated / trusted:8.2f}x")
+
+
+# ============= Query Plans =============
+
+# Values the synthetic database is guaranteed to contain
+SAMPLE_MONTH = "2024-01"
+SAMPLE_DATE = "2024-01-15"
+SAMPLE_PAPER_ID = "2401.00000"
+BATCH_PAPER_IDS = [f"2401.{i:05d}" for i in range(0, 100, 5)]
+
+
+async def seed_synthetic_database(papers: int, months: int = 12):
+    """
+    Fill the current database with synthetic papers, tags and upvote history.
+
+    Papers are spread evenly over `months` months starting at SAMPLE_MONTH,
+    every paper is tagged, and each has a few days of upvote snapshots.
+    """
+    clusters = DEFAULT_CONTRIBUTION_TAGS
+    per_month = max(1, papers // months)
+    for m in range(months):
+        month = f"2024-{m + 1:02d}"
+        await save_taxonomy(Taxonomy(
+            month=month,
+            contribution_tags=clusters,
+            task_tags=DEFAULT_TASK_TAGS,
+            modality_tags=DEFAULT_MODALITY_TAGS,
+        ))
+
+        batch, tags, snapshots = [], [], []
+        for i in range(per_month):
+            paper_id = f"24{m + 1:02d}.{i:05d}"
+            day = f"{month}-{i % 28 + 1:02d}"
+            batch.append(Paper(
+                id=paper_id,
+                title=f"Synthetic paper {i} on {clusters[i % len(clusters)]}",
+                abstract=f"We study {DEFAULT_TASK_TAGS[i % len(DEFAULT_TASK_TAGS)]} with transformers. " * 10,
+                published_date=day,
+                hf_url=f"https://huggingface.co/papers/{paper_id}",
+                upvotes=(i * 37) % 500,
+                authors=[f"Author {i}-{j}" for j in range(5)],
+                content_hash=f"hash{m}-{i}",
+                appeared_date=day,
+            ))
+            tags.append(PaperTags(
+                paper_id=paper_id,
+                month=month,
+                primary_contribution_tag=clusters[i % len(clusters)],
+                secondary_contribution_tags=[clusters[(i + 1) % len(clusters)]],
+                task_tags=[DEFAULT_TASK_TAGS[i % len(DEFAULT_TASK_TAGS)]],
+                modality_tags=[DEFAULT_MODALITY_TAGS[i % len(DEFAULT_MODALITY_TAGS)]],
+                confidence=(i % 10) / 10,
+            ))
+            snapshots.extend(
+                UpvoteSnapshot(paper_id=paper_id, date=f"{month}-{d:02d}", upvotes=d * 3)
+                for d in range(1, 4)
+            )
+        await upsert_papers_many(batch)
+        await save_paper_tags_many(tags)
+        await record_upvote_snapshots_many(snapshots)
+
+
+def query_cases() -> list[tuple]:
+    """
+    One entry per read query shape in database.py: (label, function, args, kwargs).
+
+    Listings are covered once per sort order and with every filter applied.
+    """
+    month_filters = dict(
+        month=SAMPLE_MONTH, clusters=[DEFAULT_CONTRIBUTION_TAGS[0]],
+        task=DEFAULT_TASK_TAGS[0], modality=DEFAULT_MODALITY_TAGS[0], search="transformers",
+    )
+    cases = [
+        ("get_paper", database.get_paper, (SAMPLE_PAPER_ID,), {}),
+        ("get_all_papers", database.get_all_papers, (), {}),
+        ("get_taxonomy", database.get_taxonomy, (SAMPLE_MONTH,), {}),
+        ("get_paper_tags", database.get_paper_tags, (SAMPLE_PAPER_ID,), {}),
+        ("get_all_paper_tags_for_month", database.get_all_paper_tags_for_month, (SAMPLE_MONTH,), {}),
+        ("get_papers_needing_tags", database.get_papers_needing_tags, ([Paper(
+            id=SAMPLE_PAPER_ID, title="", abstract="", published_date="", hf_url="", content_hash="x"
+        )], Taxonomy(
+            month=SAMPLE_MONTH, contribution_tags=[], task_tags=[], modality_tags=[]
+        )), {}),
+        ("get_papers_with_tags_for_month", database.get_papers_with_tags_for_month, (SAMPLE_MONTH,), {}),
+        ("get_papers_with_tags_for_month[filters]", database.get_papers_with_tags_for_month, (SAMPLE_MONTH,), dict(
+            task=DEFAULT_TASK_TAGS[0], modality=DEFAULT_MODALITY_TAGS[0], search="transformers"
+        )),
+        ("count_papers_for_month", database.count_papers_for_month, (SAMPLE_MONTH,), {}),
+        ("get_tag_counts_for_month", database.get_tag_counts_for_month, (SAMPLE_MONTH, "task"), {}),
+        ("get_cluster_facets_for_month", database.get_cluster_facets_for_month, (SAMPLE_MONTH,), {}),
+        ("count_papers_by_date", database.count_papers_by_date, (SAMPLE_DATE,), {}),
+        ("get_cluster_names_for_month", database.get_cluster_names_for_month, (SAMPLE_MONTH,), {}),
+        ("get_cluster_names_for_date", database.get_cluster_names_for_date, (SAMPLE_DATE,), {}),
+        ("get_month_index", database.get_month_index, (), {}),
+        ("get_paper_cards_by_ids", database.get_paper_cards_by_ids, (BATCH_PAPER_IDS,), {}),
+        ("get_papers_with_tags_by_ids", database.get_papers_with_tags_by_ids, (BATCH_PAPER_IDS,), {}),
+        ("search_papers", database.search_papers, ("transformers",), {}),
+        ("search_papers[range]", database.search_papers, ("transformers",), dict(
+            month=SAMPLE_MONTH, start_date="2024-01-01", end_date="2024-01-31"
+        )),
+        ("get_upvote_history", database.get_upvote_history, (SAMPLE_PAPER_ID,), {}),
+        ("get_papers_by_date", database.get_papers_by_date, (SAMPLE_DATE,), {}),
+        ("get_papers_by_date_range", database.get_papers_by_date_range, ("2024-01-01", "2024-01-31"), {}),
+        ("get_daily_snapshot", database.get_daily_snapshot, (SAMPLE_DATE,), {}),
+        ("get_daily_snapshots_range", database.get_daily_snapshots_range, ("2024-01-01", "2024-01-31"), {}),
+        ("get_papers_with_tags_by_date_range", database.get_papers_with_tags_by_date_range, ("2024-01-01", "2024-01-31"), {}),
+        ("get_data_versions", database.get_data_versions, ([SAMPLE_MONTH, database.GLOBAL_SCOPE],), {}),
+    ]
+    for sort_by in database.PAPER_SORT_KEYS:
+        cursor = encode_cursor(sort_by, 100, SAMPLE_PAPER_ID)
+        cases += [
+            (f"query_papers_with_tags[month,{sort_by}]", database.query_papers_with_tags,
+             (PaperQuery(month=SAMPLE_MONTH, sort_by=sort_by),), {}),
+            (f"query_paper_cards[month,{sort_by},filters]", database.query_paper_cards,
+             (PaperQuery(sort_by=sort_by, cursor=cursor, **month_filters),), {}),
+            (f"query_paper_cards[date,{sort_by}]", database.query_paper_cards,
+             (PaperQuery(appeared_date=SAMPLE_DATE, sort_by=sort_by, cursor=cursor),), {}),
+        ]
+    return cases
+
+
+async def _bench_queries(papers: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_PATH = Path(tmp) / "benchmark.db"
+        try:
+            await database.init_database()
+            start = time.perf_counter()
+            await seed_synthetic_database(papers)
+            print(f"Seeded {papers} papers in {time.perf_counter() - start:.1f}s, best of {repeat}:")
+
+            for label, fn, args, kwargs in query_cases():
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    await fn(*args, **kwargs)
+                    best = min(best, time.perf_counter() - start)
+                print(f"  {label:<50} {best * 1000:8.2f} ms")
+        finally:
+            await database.close_database()
+
+
+def bench_queries(papers: int, repeat: int):
+    """Time every read query against a synthetic database."""
+    asyncio.run(_bench_queries(papers, repeat))
+
+
+# ============= Cluster Graph =============
+
+def synthetic_papers_with_tags(papers: int, clusters: int, seed: int = 0) -> list[dict]:
+    """
+    Build {"paper", "tags"} items shaped like get_papers_with_tags_for_month().
+
+    Each paper gets one primary cluster, up to two secondary contribution
+    tags (sometimes outside the cluster list) and one to three task tags.
+    """
+    rng = random.Random(seed)
+    cluster_names = [f"Cluster {i}" for i in range(clusters)]
+    secondary_names = cluster_names + ["Unlisted Tag"]
+    task_names = [f"task-{i}" for i in range(max(5, clusters // 2))]
+
+    items = []
+    for i in range(papers):
+        paper_id = f"2401.{i:05d}"
+        items.append({
+            "paper": Paper(
+                id=paper_id, title=f"Paper {i}", abstract="", published_date=SAMPLE_DATE,
+                hf_url=f"https://huggingface.co/papers/{paper_id}", appeared_date=SAMPLE_DATE,
+            ),
+            "tags": PaperTags(
+                paper_id=paper_id,
+                month=SAMPLE_MONTH,
+                primary_contribution_tag=rng.choice(cluster_names),
+                secondary_contribution_tags=rng.sample(secondary_names, rng.randint(0, 2)),
+                task_tags=rng.sample(task_names, rng.randint(1, 3)),
+                modality_tags=[rng.choice(DEFAULT_MODALITY_TAGS)],
+            ),
+        })
+    return items
+
+
+def bench_graph(clusters: int, papers: int, repeat: int):
+    """Time build_cluster_graph on a synthetic month."""
+    from main import build_cluster_graph
+
+    items = synthetic_papers_with_tags(papers, clusters)
+    graph = build_cluster_graph(items)
+    elapsed = _best_of(repeat, lambda: build_cluster_graph(items))
+
+    print(f"Cluster graph for {papers} papers in {clusters} clusters, best of {repeat}")
+    print(f"  build_cluster_graph:  {elapsed * 1000:8.1f} ms ({len(graph.nodes)} nodes, {len(graph.links)} links)")
+
+
+# ============= Paper Page Parsing =============
+
+RECORDED_PAGES_DIR = Path(__file__).parent / "tests" / "fixtures" / "hf"
+
+
+def recorded_paper_pages(pages_dir: Path) -> list[tuple[str, str]]:
+    """(paper_id, html) for every saved paper page in a folder: *.html files named with their arxiv ID."""
+    pages = []
+    for path in sorted(pages_dir.glob("*.html")):
+        match = re.search(r'\d{4}\.\d{4,5}', path.stem)
+        if match:  # Listing pages and others are skipped
+            pages.append((match.group(), path.read_text(encoding="utf-8", errors="replace")))
+    return pages
+
+
+def cached_paper_pages() -> list[tuple[str, str]]:
+    """(paper_id, html) for every paper page in the scraper's on-disk HTTP cache."""
+    from http_cache import HttpCache, url_class
+
+    cache = HttpCache()
+    pages = []
+    for entry_path in sorted((cache.directory / "entries").rglob("*.json")):
+        url = json.loads(entry_path.read_bytes()).get("url", "")
+        cached = cache.lookup(url) if url_class(url) == "paper" else None
+        if cached:
+            pages.append((url.rsplit("/", 1)[-1], cached[1].decode("utf-8", errors="replace")))
+    return pages
+
+
+def bench_parsing(pages: list[tuple[str, str]], repeat: int):
+    """Compare paper page parse throughput of the BeautifulSoup and lxml extractors."""
+    from scraper import parse_paper_page, parse_paper_page_soup
+
+    if not pages:
+        print("No paper pages to parse")
+        return
+
+    total_mb = sum(len(html.encode("utf-8")) for _, html in pages) / 1e6
+    mismatches = [
+        paper_id for paper_id, html in pages
+        if parse_paper_page(html, paper_id) != parse_paper_page_soup(html, paper_id)
+    ]
+
+    def parse_all(parse):
+        def run():
+            for paper_id, html in pages:
+                parse(html, paper_id)
+        return run
+
+    soup = _best_of(repeat, parse_all(parse_paper_page_soup))
+    fast = _best_of(repeat, parse_all(parse_paper_page))
+
+    print(f"Parsing {len(pages)} paper pages ({total_mb:.2f} MB), best of {repeat}")
+    print(f"  BeautifulSoup (reference): {len(pages) / soup:8.1f} pages/s {total_mb / soup:7.2f} MB/s")
+    print(f"  lxml XPath:                {len(pages) / fast:8.1f} pages/s {total_mb / fast:7.2f} MB/s")
+    print(f"  speedup:                   {soup / fast:8.2f}x")
+    print(f"  output mismatches:         {len(mismatches):8d}" + (f" ({', '.join(mismatches[:5])})" if mismatches else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend micro-benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    hydration = subparsers.add_parser("hydration", help="Row to model hydration cost")
+    hydration.add_argument("--rows", type=int, default=10_000)
+    hydration.add_argument("--repeat", type=int, default=5)
+
+    queries = subparsers.add_parser("queries", help="Read query latency on a synthetic database")
+    queries.add_argument("--papers", type=int, default=50_000)
+    queries.add_argument("--repeat", type=int, default=5)
+
+    graph = subparsers.add_parser("graph", help="Cluster graph construction on a synthetic month")
+    graph.add_argument("--clusters", type=int, default=50)
+    graph.add_argument("--papers", type=int, default=5_000)
+    graph.add_argument("--repeat", type=int, default=5)
+
+    parsing = subparsers.add_parser("parsing", help="Paper page parse throughput on recorded HF pages")
+    source = parsing.add_mutually_exclusive_group()
+    source.add_argument("--pages", type=Path, default=RECORDED_PAGES_DIR, help="Folder of saved paper pages (*.html)")
+    source.add_argument("--http-cache", action="store_true", help="Use the paper pages in the scraper's HTTP cache")
+    parsing.add_argument("--repeat", type=int, default=5)
+
+    args = parser.parse_args()
+    if args.benchmark == "hydration":
+        bench_hydration(args.rows, args.repeat)
+    elif args.benchmark == "queries":
+        bench_queries(args.papers, args.repeat)
+    elif args.benchmark == "graph":
+        bench_graph(args.clusters, args.papers, args.repeat)
+    elif args.benchmark == "parsing":
+        pages = cached_paper_pages() if args.http_cache else recorded_paper_pages(args.pages)
+        bench_parsing(pages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+In-process response cache for HF Papers Explorer API endpoints.
+
+Entries hold serialized response bodies keyed by endpoint and normalized
+query parameters. Each entry remembers the data generation it was built
+from (see database.get_data_versions); once the generation moves on, the
+entry is stale. Stale entries are still served while a single background
+task rebuilds them (stale-while-revalidate), so readers stay fast while an
+indexing run keeps writing.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+# Cache limits and freshness from environment
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_MAX_AGE = float(os.environ.get("RESPONSE_CACHE_MAX_AGE", "300"))  # Seconds before revalidating
+RESPONSE_CACHE_MAX_STALE = float(os.environ.get("RESPONSE_CACHE_MAX_STALE", "3600"))  # Seconds a stale entry may be served
+
+
+class CacheEntry(NamedTuple):
+    """A cached response body and the data generation it was built from."""
+    body: bytes
+    headers: dict[str, str]
+    generation: int
+    created_at: float
+    encoded: dict[str, bytes] = {}  # Content-Encoding -> compressed body
+
+    @property
+    def size(self) -> int:
+        return (
+            len(self.body)
+            + sum(len(k) + len(v) for k, v in self.headers.items())
+            + sum(len(body) for body in self.encoded.values())
+        )
+
+
+def make_cache_key(endpoint: str, **params) -> tuple:
+    """
+    Build a cache key from an endpoint name and its query parameters.
+
+    Parameters left at None are dropped and string values are stripped, so
+    equivalent requests share an entry regardless of argument order.
+    """
+    normalized = []
+    for name, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        elif isinstance(value, (list, tuple)):
+            value = tuple(value)
+        normalized.append((name, value))
+    return (endpoint, tuple(normalized))
+
+
+class ResponseCache:
+    """
+    LRU cache of response bodies bounded by entry count and total bytes.
+
+    Use get_or_compute(); it returns the entry plus how it was served:
+    "HIT" (fresh), "STALE" (served while a refresh runs) or "MISS".
+    When `precompress` is given, it maps each new body to its compressed
+    variants, which are kept (and counted) alongside it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        max_age: float = RESPONSE_CACHE_MAX_AGE,
+        max_stale: float = RESPONSE_CACHE_MAX_STALE,
+        precompress: Optional[Callable[[bytes], dict[str, bytes]]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_stale = max_stale
+        self.precompress = precompress
+        self.total_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[CacheEntry]:
+        """Look up an entry without checking freshness."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, entry: CacheEntry):
+        """Store an entry, evicting least recently used ones over the limits."""
+        self.discard(key)
+        if entry.size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        self._entries[key] = entry
+        self.total_bytes += entry.size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+
+    def discard(self, key: tuple):
+        """Remove an entry if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+    def clear(self):
+        """Remove every entry."""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    async def get_or_compute(
+        self,
+        key: tuple,
+        generation: int,
+        compute: Callable[[], Awaitable[tuple[bytes, dict[str, str]]]],
+    ) -> tuple[CacheEntry, str]:
+        """
+        Serve an entry for `key`, building it with `compute` when needed.
+
+        Args:
+            key: Cache key from make_cache_key()
+            generation: Current data generation, read before computing
+            compute: Coroutine function returning (body, headers)
+
+        Returns:
+            (entry, status) where status is "HIT", "STALE" or "MISS"
+        """
+        entry = self.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.created_at
+            if entry.generation == generation and age < self.max_age:
+                self.hits += 1
+                return entry, "HIT"
+            if age < self.max_stale:
+                self.stale_hits += 1
+                self._refresh(key, generation, compute)
+                return entry, "STALE"
+
+        self.misses += 1
+        return await asyncio.shield(self._refresh(key, generation, compute)), "MISS"
+
+    def _refresh(self, key: tuple, generation: int, compute) -> asyncio.Task:
+        """Start (or join) the single rebuild task for a key at a generation."""
+        inflight_key = (key, generation)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.create_task(self._rebuild(key, generation, compute))
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda t: self._finish(inflight_key, t))
+        return task
+
+    async def _rebuild(self, key: tuple, generation: int, compute) -> CacheEntry:
+        body, headers = await compute()
+        encoded = self.precompress(body) if self.precompress else {}
+        entry = CacheEntry(body, headers, generation, time.monotonic(), encoded)
+        current = self._entries.get(key)
+        if current is None or current.generation <= generation:
+            self.put(key, entry)  # A rebuild for a newer generation may have finished first
+        return entry
+
+    def _finish(self, inflight_key: tuple, task: asyncio.Task):
+        self._inflight.pop(inflight_key, None)
+        key, generation = inflight_key
+        current = self._entries.get(key)
+        if not task.cancelled() and task.exception() is not None and (
+            current is None or current.generation <= generation
+        ):
+            # Failed background refresh: drop the entry so the next request retries inline
+            self.discard(key)
@@ -5,16 +5,15 @@ This ensures proper appeared_date tracking for temporal flow visualization.
 """
 
 import asyncio
-import aiosqlite
 import httpx
 import random
 from datetime import date, timedelta
-from database import DATABASE_PATH, init_database, upsert_paper
-from scraper import fetch_daily_paper_ids, fetch_paper_details
+from database import init_database, close_database, upsert_papers_many, read_connection, write_connection
+from http_cache import default_http_cache
+from scraper import ScraperSession, fetch_daily_listing, fetch_listing_papers
 
 
-# Rate limiting settings
-DELAY_BETWEEN_PAPERS = 1.5  # seconds between fetching each paper
+# Rate limiting settings (paper pages are paced by the session's adaptive limiter)
 DELAY_BETWEEN_DAYS = 3.0    # seconds between scraping days
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 30       # base delay for retry (will be multiplied by attempt)
@@ -23,14 +22,14 @@ RETRY_BASE_DELAY = 30       # base delay for retry (will be multiplied by attemp
 async def clean_database():
     """Remove all existing paper data from the database."""
     print("Cleaning database...")
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         # Delete in order to respect foreign key constraints
+        await db.execute("DELETE FROM paper_tag_assignments")
         await db.execute("DELETE FROM paper_tags")
         await db.execute("DELETE FROM upvote_history")
         await db.execute("DELETE FROM daily_snapshots")
         await db.execute("DELETE FROM papers")
         # Keep taxonomies as they can be reused
-        await db.commit()
     print("Database cleaned.")
 
 
@@ -55,37 +54,33 @@ async def fetch_with_retry(fetch_func, *args, **kwargs):
     return None
 
 
-async def scrape_daily_with_rate_limit(date_str: str):
+async def scrape_daily_with_rate_limit(date_str: str, session: ScraperSession):
     """
-    Scrape papers for a specific date with rate limiting.
+    Scrape papers for a specific date.
+
+    Metadata comes from the daily listing; paper pages are fetched only for
+    papers the listing does not fully describe, concurrently under the
+    session's adaptive rate limit.
 
     Args:
         date_str: Date string in format YYYY-MM-DD
+        session: Session shared by the whole download
 
     Returns:
         List of Paper objects
     """
     print(f"  Fetching paper list...")
-    paper_ids = await fetch_with_retry(fetch_daily_paper_ids, date_str)
+    listing = await fetch_with_retry(fetch_daily_listing, date_str, session=session)
 
-    if paper_ids is None:
+    if listing is None:
         return []
 
-    print(f"  Found {len(paper_ids)} papers")
-
-    papers = []
-    for i, paper_id in enumerate(paper_ids):
-        print(f"  Fetching paper {i + 1}/{len(paper_ids)}: {paper_id}")
-
-        paper = await fetch_with_retry(fetch_paper_details, paper_id, appeared_date=date_str)
-        if paper:
-            papers.append(paper)
+    print(f"  Found {len(listing)} papers")
 
-        # Rate limiting delay between papers
-        if i < len(paper_ids) - 1:
-            await asyncio.sleep(DELAY_BETWEEN_PAPERS)
+    def progress(done, total, paper_id):
+        print(f"  Fetched paper {done}/{total}: {paper_id}")
 
-    return papers
+    return await fetch_listing_papers(listing, session, date_str, progress)
 
 
 async def download_papers_day_by_day(start_date: str, end_date: str, resume_from: str = None):
@@ -112,45 +107,53 @@ async def download_papers_day_by_day(start_date: str, end_date: str, resume_from
 
     # If resuming, load existing paper IDs to avoid duplicates
     if resume_from:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with read_connection() as db:
             async with db.execute("SELECT id FROM papers") as cursor:
                 async for row in cursor:
                     seen_ids.add(row[0])
         print(f"Loaded {len(seen_ids)} existing paper IDs")
 
-    while current <= end:
-        date_str = current.strftime("%Y-%m-%d")
-        print(f"\n{'='*60}")
-        print(f"Scraping {date_str}")
-        print(f"{'='*60}")
+    # One pooled connection to huggingface.co for the whole download; pages
+    # fetched by an earlier run come from the on-disk cache or a 304
+    cache = default_http_cache()
+    async with ScraperSession(cache=cache) as session:
+        while current <= end:
+            date_str = current.strftime("%Y-%m-%d")
+            print(f"\n{'='*60}")
+            print(f"Scraping {date_str}")
+            print(f"{'='*60}")
 
-        try:
-            papers = await scrape_daily_with_rate_limit(date_str)
+            try:
+                papers = await scrape_daily_with_rate_limit(date_str, session)
 
-            new_count = 0
-            for paper in papers:
-                if paper.id not in seen_ids:
-                    await upsert_paper(paper)
-                    seen_ids.add(paper.id)
-                    new_count += 1
-                    total_papers += 1
-                else:
-                    print(f"    Skipping duplicate: {paper.id} (already appeared earlier)")
+                new_papers = []
+                for paper in papers:
+                    if paper.id not in seen_ids:
+                        new_papers.append(paper)
+                        seen_ids.add(paper.id)
+                    else:
+                        print(f"    Skipping duplicate: {paper.id} (already appeared earlier)")
 
-            print(f"  Saved {new_count} new papers (skipped {len(papers) - new_count} duplicates)")
+                await upsert_papers_many(new_papers)
+                new_count = len(new_papers)
+                total_papers += new_count
 
-        except Exception as e:
-            print(f"  Error scraping {date_str}: {e}")
-            print(f"  You can resume later with: resume_from='{date_str}'")
+                print(f"  Saved {new_count} new papers (skipped {len(papers) - new_count} duplicates)")
+
+            except Exception as e:
+                print(f"  Error scraping {date_str}: {e}")
+                print(f"  You can resume later with: resume_from='{date_str}'")
 
-        # Delay between days
-        if current < end:
-            await asyncio.sleep(DELAY_BETWEEN_DAYS)
+            # Delay between days
+            if current < end:
+                await asyncio.sleep(DELAY_BETWEEN_DAYS)
 
-        current += timedelta(days=1)
+            current += timedelta(days=1)
 
     print(f"\n{'='*60}")
     print(f"DONE! Total unique papers downloaded: {total_papers}")
+    if cache:
+        print(cache.summary())
     print(f"{'='*60}")
 
 
@@ -176,7 +179,10 @@ async def main():
         await clean_database()
 
     # Download papers day by day
-    await download_papers_day_by_day("2026-01-01", "2026-01-27", resume_from=resume_from)
+    try:
+        await download_papers_day_by_day("2026-01-01", "2026-01-27", resume_from=resume_from)
+    finally:
+        await close_database()
 
 
 if __name__ == "__main__":
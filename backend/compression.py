@@ -0,0 +1,222 @@
+"""
+Response compression for the HF Papers Explorer API.
+
+CompressionMiddleware gzip- or brotli-encodes responses above a size
+threshold, including streamed ones. Cached responses are compressed once
+when they are built (see precompress) and served as-is; the middleware
+leaves responses that already carry a Content-Encoding alone.
+"""
+
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip is offered without it
+    brotli = None
+
+
+# Compression settings from environment
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))  # Bytes
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "5"))
+
+# Cached bodies are compressed once, so they can afford stronger settings
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 9
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/x-ndjson",
+    "text/",
+)
+
+
+def supported_encodings() -> list[str]:
+    """Encodings this server can produce, most preferred first."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content coding for an Accept-Encoding header.
+
+    Returns the supported coding with the highest q-value (brotli wins ties),
+    or None when the client accepts neither.
+    """
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, precompressed: bool = False) -> bytes:
+    """Compress a whole body with gzip or brotli."""
+    if encoding == "br":
+        return brotli.compress(body, quality=PRECOMPRESS_BROTLI_QUALITY if precompressed else BROTLI_QUALITY)
+    level = PRECOMPRESS_GZIP_LEVEL if precompressed else GZIP_LEVEL
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def precompress(body: bytes) -> dict[str, bytes]:
+    """Every supported encoding of a body worth compressing (empty below the threshold)."""
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return {}
+    return {encoding: compress(body, encoding, precompressed=True) for encoding in supported_encodings()}
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the encoded representation: '"abc"' -> '"abc-gzip"'."""
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_etag_encoding(etag: str) -> str:
+    """Undo encoded_etag so a compressed response's ETag still revalidates."""
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def add_vary(headers: MutableHeaders, value: str):
+    """Append a field to the Vary header unless it is already listed."""
+    current = [v.strip() for v in headers.get("vary", "").split(",") if v.strip()]
+    if value.lower() not in (v.lower() for v in current):
+        headers["vary"] = ", ".join([*current, value])
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk so streams stay live."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses the client accepts gzip/br for.
+
+    Skips bodies under minimum_size, non-text content types and responses
+    that are already encoded (such as precompressed cache hits). Compressible
+    responses always get Vary: Accept-Encoding, compressed or not.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    """send() wrapper that holds the response start until the first body chunk."""
+
+    def __init__(self, send: Send, encoding: Optional[str], minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if self.compressor is not None:
+            data = self.compressor.chunk(body) if body else b""
+            if not more_body:
+                data += self.compressor.finish()
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        # First body message: decide how to answer
+        headers = MutableHeaders(raw=self.start["headers"])
+        compressible = (
+            headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            and self.start["status"] not in (204, 304)
+        )
+        if compressible:
+            add_vary(headers, "Accept-Encoding")
+        if (
+            not compressible
+            or self.encoding is None
+            or "content-encoding" in headers
+            or (not more_body and len(body) < self.minimum_size)
+        ):
+            self.passthrough = True
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        headers["content-encoding"] = self.encoding
+        if "etag" in headers:
+            headers["etag"] = encoded_etag(headers["etag"], self.encoding)
+        if more_body:
+            # Streamed: length is unknown up front
+            del headers["content-length"]
+            self.compressor = _StreamCompressor(self.encoding)
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": self.compressor.chunk(body), "more_body": True})
+            return
+
+        compressed = compress(body, self.encoding)
+        headers["content-length"] = str(len(compressed))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": False})
@@ -4,15 +4,41 @@ Uses SQLite with aiosqlite for async operations.
 """
 
 import aiosqlite
+import asyncio
+import base64
 import json
 import hashlib
+import os
+import re
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, NamedTuple, Optional, TypeVar
 from pydantic import BaseModel
 
 DATABASE_PATH = Path(__file__).parent / "papers.db"
 
+# Connection pool configuration from environment
+SQLITE_READERS = int(os.environ.get("SQLITE_READERS", "4"))  # Pooled reader connections
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # Readers never block on the writer
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", "-65536")),  # Negative = KiB
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", "5000")),  # Milliseconds
+    "temp_store": "MEMORY",
+}
+
+# Rows per transaction when pipelines flush bulk writes incrementally
+BULK_WRITE_BATCH_SIZE = 100
+
+# Rows fetched per round trip when streaming exports
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", "500"))
+
+# Rows read back from our own database were validated on the way in, so they
+# are hydrated without pydantic validation unless this is switched on
+VALIDATE_ROWS = os.environ.get("VALIDATE_ROWS", "").lower() in ("1", "true", "yes")
+
 
 class Paper(BaseModel):
     """Paper data model."""
@@ -68,6 +94,317 @@ class PaperTags(BaseModel):
     research_question: str = ""
     confidence: float = 0.0
     rationale: str = ""
+    content_hash: str = ""  # Paper content hash the tags were made from ("" = unknown)
+    taxonomy_version: int = 0  # Version of the month's taxonomy used for tagging
+
+
+# ============= Row Mapping =============
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _hydrate(model: type[ModelT], fields: dict, validate: Optional[bool]) -> ModelT:
+    """
+    Build a model from trusted column values.
+
+    The trusted path does what model_construct does when every field is
+    given, minus its per-field default handling, which on pydantic 2.x costs
+    as much as validating the row.
+
+    Args:
+        model: Model class to build
+        fields: Every field value, already decoded from its JSON column
+        validate: Run full pydantic validation; None falls back to VALIDATE_ROWS
+    """
+    if VALIDATE_ROWS if validate is None else validate:
+        return model.model_validate(fields)
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", fields)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(fields))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def row_to_paper(row: aiosqlite.Row, validate: Optional[bool] = None) -> Paper:
+    """Build a Paper from a papers row (or a join selecting p.*)."""
+    return _hydrate(Paper, {
+        "id": row['id'],
+        "title": row['title'],
+        "abstract": row['abstract'],
+        "published_date": row['published_date'] or "",
+        "hf_url": row['hf_url'],
+        "arxiv_url": row['arxiv_url'],
+        "pdf_url": row['pdf_url'],
+        "upvotes": row['upvotes'],
+        "authors": json.loads(row['authors_json']),
+        "content_hash": row['content_hash'] or "",
+        "appeared_date": row['appeared_date'],
+        "created_at": row['created_at'],
+        "updated_at": row['updated_at'],
+    }, validate)
+
+
+def row_to_paper_tags(row: aiosqlite.Row, validate: Optional[bool] = None) -> PaperTags:
+    """Build PaperTags from a paper_tags row."""
+    return _hydrate(PaperTags, {
+        "paper_id": row['paper_id'],
+        "month": row['month'],
+        "primary_contribution_tag": row['primary_contribution_tag'],
+        "secondary_contribution_tags": json.loads(row['secondary_contribution_tags_json']),
+        "task_tags": json.loads(row['task_tags_json']),
+        "modality_tags": json.loads(row['modality_tags_json']),
+        "research_question": row['research_question'] or "",
+        "confidence": row['confidence'],
+        "rationale": row['rationale'] or "",
+        "content_hash": row['content_hash'] or "",
+        "taxonomy_version": row['taxonomy_version'] or 0,
+    }, validate)
+
+
+def joined_row_to_tags(
+    row: aiosqlite.Row,
+    month: Optional[str] = None,
+    validate: Optional[bool] = None
+) -> Optional[PaperTags]:
+    """
+    Build PaperTags from a papers LEFT JOIN paper_tags row.
+
+    Joined queries do not select tagging provenance, so content_hash and
+    taxonomy_version are left unset.
+
+    Args:
+        row: Joined row with p.* and the paper_tags tag columns
+        month: Month to assign when the query does not select pt.month
+        validate: See _hydrate
+
+    Returns:
+        PaperTags, or None for an untagged paper
+    """
+    if not row['primary_contribution_tag']:
+        return None
+    return _hydrate(PaperTags, {
+        "paper_id": row['id'],
+        "month": month if month is not None else row['month'] or "",
+        "primary_contribution_tag": row['primary_contribution_tag'],
+        "secondary_contribution_tags": json.loads(row['secondary_contribution_tags_json'] or '[]'),
+        "task_tags": json.loads(row['task_tags_json'] or '[]'),
+        "modality_tags": json.loads(row['modality_tags_json'] or '[]'),
+        "research_question": row['research_question'] or "",
+        "confidence": row['confidence'] or 0.0,
+        "rationale": row['rationale'] or "",
+        "content_hash": "",
+        "taxonomy_version": 0,
+    }, validate)
+
+
+def row_to_upvote_snapshot(row: aiosqlite.Row, validate: Optional[bool] = None) -> UpvoteSnapshot:
+    """Build an UpvoteSnapshot from an upvote_history row."""
+    return _hydrate(UpvoteSnapshot, {
+        "paper_id": row['paper_id'],
+        "date": row['date'],
+        "upvotes": row['upvotes'],
+    }, validate)
+
+
+def row_to_daily_snapshot(row: aiosqlite.Row, validate: Optional[bool] = None) -> DailySnapshot:
+    """Build a DailySnapshot from a daily_snapshots row."""
+    return _hydrate(DailySnapshot, {
+        "date": row['date'],
+        "total_papers": row['total_papers'],
+        "cluster_counts": json.loads(row['cluster_counts_json']),
+        "top_paper_ids": json.loads(row['top_paper_ids_json']),
+        "new_paper_ids": json.loads(row['new_paper_ids_json']),
+    }, validate)
+
+
+# ============= Connection Management =============
+
+class ConnectionManager:
+    """
+    Long-lived SQLite connections: a pool of readers plus a single writer.
+
+    All connections run in WAL mode, so readers keep serving requests while
+    the indexer holds the write transaction. Writes are serialized through
+    one connection and committed when the `write()` block exits.
+    """
+
+    def __init__(self, path: Path, readers: int = SQLITE_READERS, pragmas: Optional[dict] = None):
+        self.path = Path(path)
+        self.readers = max(1, readers)
+        self.pragmas = {**SQLITE_PRAGMAS, **(pragmas or {})}
+        self.is_open = False
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._reader_pool: asyncio.Queue = asyncio.Queue()
+        self._reader_connections: list[aiosqlite.Connection] = []
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = aiosqlite.connect(self.path)
+        # Don't keep short-lived scripts alive if they forget to close the pool
+        conn.daemon = True
+        await conn
+        conn.row_factory = aiosqlite.Row
+        for name, value in self.pragmas.items():
+            await conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    async def open(self):
+        """Open the writer and reader connections (idempotent)."""
+        if self.is_open:
+            return
+        async with self._open_lock:
+            if self.is_open:
+                return
+            # Writer first so WAL mode is set before any reader attaches
+            self._writer = await self._connect()
+            for _ in range(self.readers):
+                conn = await self._connect()
+                self._reader_connections.append(conn)
+                self._reader_pool.put_nowait(conn)
+            self.is_open = True
+
+    async def close(self):
+        """Close all pooled connections."""
+        async with self._open_lock:
+            for conn in self._reader_connections:
+                await conn.close()
+            if self._writer is not None:
+                await self._writer.close()
+            self._reader_connections = []
+            self._reader_pool = asyncio.Queue()
+            self._writer = None
+            self.is_open = False
+
+    async def set_trace_callback(self, callback):
+        """Install a sqlite3 trace callback (or None) on every pooled connection."""
+        await self.open()
+        for conn in [self._writer, *self._reader_connections]:
+            await conn.set_trace_callback(callback)
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection from the pool."""
+        await self.open()
+        conn = await self._reader_pool.get()
+        try:
+            yield conn
+        finally:
+            self._reader_pool.put_nowait(conn)
+
+    @asynccontextmanager
+    async def dedicated_read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Open a reader outside the pool for the duration of the block.
+
+        For long-running reads such as streamed exports, which would
+        otherwise hold a pooled reader for as long as the client reads.
+        """
+        conn = await self._connect()
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the writer for one transaction; commits on success, rolls back on error."""
+        await self.open()
+        async with self._write_lock:
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
+                raise
+
+
+# Global connection manager instance
+_manager: Optional[ConnectionManager] = None
+
+
+def get_connection_manager() -> ConnectionManager:
+    """Get or create the global connection manager for DATABASE_PATH."""
+    global _manager
+    if _manager is None:
+        _manager = ConnectionManager(DATABASE_PATH)
+    return _manager
+
+
+async def open_database():
+    """Open the pooled connections (called from the app lifespan)."""
+    await get_connection_manager().open()
+
+
+async def close_database():
+    """Close the pooled connections and drop the global manager."""
+    global _manager
+    if _manager is not None:
+        await _manager.close()
+        _manager = None
+
+
+def read_connection():
+    """Context manager yielding a pooled reader connection."""
+    return get_connection_manager().read()
+
+
+def write_connection():
+    """Context manager yielding the writer connection inside a transaction."""
+    return get_connection_manager().write()
+
+
+# ============= Data Versions =============
+
+# Scope bumped by every write, for endpoints that read across months
+GLOBAL_SCOPE = "*"
+
+BUMP_DATA_VERSION_SQL = """
+    INSERT INTO data_versions (scope, version, updated_at) VALUES (?, 1, ?)
+    ON CONFLICT(scope) DO UPDATE SET
+        version = data_versions.version + 1,
+        updated_at = excluded.updated_at
+"""
+
+
+async def _bump_data_versions(db: aiosqlite.Connection, months) -> None:
+    """
+    Bump the change counters of the given months and of GLOBAL_SCOPE.
+
+    Called inside the writer's transaction, so new versions commit together
+    with the data they describe and are seen by every process.
+    """
+    scopes = {GLOBAL_SCOPE} | {month for month in months if month}
+    updated_at = datetime.now().isoformat()
+    await db.executemany(BUMP_DATA_VERSION_SQL, [(scope, updated_at) for scope in sorted(scopes)])
+
+
+async def get_data_versions(scopes: list[str]) -> dict[str, int]:
+    """
+    Current change counters for months (YYYY-MM) or GLOBAL_SCOPE.
+
+    Response caches and ETags compare these to tell whether anything an
+    endpoint reads has changed. Scopes never written to are 0.
+    """
+    versions = dict.fromkeys(scopes, 0)
+    async with read_connection() as db:
+        async with db.execute(
+            "SELECT scope, version FROM data_versions WHERE scope IN (SELECT value FROM json_each(?))",
+            (json.dumps(scopes),)
+        ) as cursor:
+            async for row in cursor:
+                versions[row['scope']] = row['version']
+    return versions
+
+
+async def _tagged_months(db: aiosqlite.Connection, paper_ids: list[str]) -> set[str]:
+    """Months the given papers are currently tagged under."""
+    async with db.execute(
+        "SELECT DISTINCT month FROM paper_tags WHERE paper_id IN (SELECT value FROM json_each(?))",
+        (json.dumps(paper_ids),)
+    ) as cursor:
+        return {row['month'] for row in await cursor.fetchall()}
 
 
 def compute_content_hash(title: str, abstract: str) -> str:
@@ -76,179 +413,339 @@ def compute_content_hash(title: str, abstract: str) -> str:
     return hashlib.sha256(content.encode()).hexdigest()[:16]
 
 
+# ============= Migrations =============
+
+# Rows handled per write transaction by batched migration backfills
+MIGRATION_BATCH_SIZE = int(os.environ.get("MIGRATION_BATCH_SIZE", "1000"))
+
+
+class Migration(NamedTuple):
+    """
+    A numbered schema change, applied in order and recorded in PRAGMA user_version.
+
+    `schema` runs in one write transaction and must be idempotent, since a
+    crash before user_version is bumped runs it again. `backfill`, if set,
+    is called as backfill(db, after, batch_size) in its own transaction per
+    chunk: it handles up to batch_size rows keyed after `after` and returns
+    the last key it handled, or None once no rows are left. Committing per
+    chunk lets other writers in between on a large database.
+    """
+    version: int
+    description: str
+    schema: Callable[[aiosqlite.Connection], Awaitable[None]]
+    backfill: Optional[Callable[[aiosqlite.Connection, str, int], Awaitable[Optional[str]]]] = None
+
+
+async def _add_column(db: aiosqlite.Connection, table: str, column: str, definition: str):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+        columns = {row['name'] for row in await cursor.fetchall()}
+    if column not in columns:
+        await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+async def _next_keys(db: aiosqlite.Connection, table: str, key: str, after: str, limit: int) -> list[str]:
+    """The next `limit` values of `key` in `table` that sort after `after`."""
+    async with db.execute(
+        f"SELECT {key} FROM {table} WHERE {key} > ? ORDER BY {key} LIMIT ?", (after, limit)
+    ) as cursor:
+        return [row[0] for row in await cursor.fetchall()]
+
+
+async def _schema_v1_baseline(db: aiosqlite.Connection):
+    """Tables that existed before versioned migrations."""
+    # Papers table
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS papers (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            abstract TEXT NOT NULL,
+            published_date TEXT,
+            hf_url TEXT NOT NULL,
+            arxiv_url TEXT,
+            pdf_url TEXT,
+            upvotes INTEGER DEFAULT 0,
+            authors_json TEXT DEFAULT '[]',
+            content_hash TEXT,
+            appeared_date TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Databases created before appeared_date was tracked
+    await _add_column(db, "papers", "appeared_date", "TEXT")
+
+    # Upvote history table - tracks upvotes over time
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS upvote_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            paper_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            upvotes INTEGER NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (paper_id) REFERENCES papers(id),
+            UNIQUE(paper_id, date)
+        )
+    """)
+
+    # Daily snapshots table - pre-computed daily aggregations
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS daily_snapshots (
+            date TEXT PRIMARY KEY,
+            total_papers INTEGER NOT NULL,
+            cluster_counts_json TEXT NOT NULL,
+            top_paper_ids_json TEXT NOT NULL,
+            new_paper_ids_json TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Taxonomies table
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS taxonomies (
+            month TEXT PRIMARY KEY,
+            contribution_tags_json TEXT NOT NULL,
+            task_tags_json TEXT NOT NULL,
+            modality_tags_json TEXT NOT NULL,
+            definitions_json TEXT DEFAULT '{}',
+            version INTEGER DEFAULT 1,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Paper tags table
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS paper_tags (
+            paper_id TEXT PRIMARY KEY,
+            month TEXT NOT NULL,
+            primary_contribution_tag TEXT NOT NULL,
+            secondary_contribution_tags_json TEXT DEFAULT '[]',
+            task_tags_json TEXT DEFAULT '[]',
+            modality_tags_json TEXT DEFAULT '[]',
+            research_question TEXT,
+            confidence REAL DEFAULT 0.0,
+            rationale TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (paper_id) REFERENCES papers(id)
+        )
+    """)
+
+    # Indexes for faster queries
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_paper_tags_month ON paper_tags(month)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_paper_tags_primary ON paper_tags(primary_contribution_tag)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_papers_appeared_date ON papers(appeared_date)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_upvote_history_paper ON upvote_history(paper_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_upvote_history_date ON upvote_history(date)")
+
+
+async def _schema_v2_tag_assignments(db: aiosqlite.Connection):
+    """Normalized tag assignments - one row per (paper, kind, tag)."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS paper_tag_assignments (
+            paper_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (paper_id, kind, tag),
+            FOREIGN KEY (paper_id) REFERENCES papers(id)
+        ) WITHOUT ROWID
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_tag_assignments_kind_tag ON paper_tag_assignments(kind, tag, paper_id)")
+
+
+async def _backfill_v2_tag_assignments(db: aiosqlite.Connection, after: str, batch_size: int) -> Optional[str]:
+    """Fill assignments for tags saved before the table existed."""
+    paper_ids = await _next_keys(db, "paper_tags", "paper_id", after, batch_size)
+    if not paper_ids:
+        return None
+    await backfill_tag_assignments(db, paper_ids)
+    return paper_ids[-1]
+
+
+async def _schema_v3_search_index(db: aiosqlite.Connection):
+    """Full-text search index over title/abstract."""
+    await create_search_index(db)
+
+
+async def _schema_v4_tag_provenance(db: aiosqlite.Connection):
+    """Record the content hash and taxonomy version tags were made from."""
+    await _add_column(db, "paper_tags", "content_hash", "TEXT")
+    await _add_column(db, "paper_tags", "taxonomy_version", "INTEGER")
+
+
+async def _backfill_v4_tag_provenance(db: aiosqlite.Connection, after: str, batch_size: int) -> Optional[str]:
+    """
+    Assume tags saved before provenance was recorded are current, so the
+    upgrade does not re-tag (and re-bill) every paper.
+    """
+    paper_ids = await _next_keys(db, "paper_tags", "paper_id", after, batch_size)
+    if not paper_ids:
+        return None
+    await db.execute("""
+        UPDATE paper_tags SET
+            content_hash = (SELECT p.content_hash FROM papers p WHERE p.id = paper_tags.paper_id),
+            taxonomy_version = (SELECT t.version FROM taxonomies t WHERE t.month = paper_tags.month)
+        WHERE paper_id IN (SELECT value FROM json_each(?))
+          AND content_hash IS NULL
+          AND rationale IS NOT 'Tagging failed'
+    """, (json.dumps(paper_ids),))
+    return paper_ids[-1]
+
+
+async def _schema_v5_listing_indexes(db: aiosqlite.Connection):
+    """Indexes that let listing queries avoid table scans and sort steps."""
+    # Full listings by upvotes
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_papers_upvotes ON papers(upvotes)")
+    # Per-day and date-range listings come out of the index already ordered
+    # by upvotes, with id as the keyset tiebreaker
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_papers_appeared_upvotes ON papers(appeared_date, upvotes, id)")
+    await db.execute("DROP INDEX IF EXISTS idx_papers_appeared_date")
+    # Cluster names and counts for a month without touching the table
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_paper_tags_month_primary ON paper_tags(month, primary_contribution_tag)")
+    await db.execute("DROP INDEX IF EXISTS idx_paper_tags_month")
+
+
+async def _schema_v6_data_versions(db: aiosqlite.Connection):
+    """Change counters per month and overall, bumped by every write."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS data_versions (
+            scope TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+
+async def _schema_v7_data_version_times(db: aiosqlite.Connection):
+    """When each scope was last written, for the month index."""
+    await _add_column(db, "data_versions", "updated_at", "TEXT")
+
+
+MIGRATIONS = [
+    Migration(1, "Baseline schema", _schema_v1_baseline),
+    Migration(2, "Normalized tag assignments", _schema_v2_tag_assignments, _backfill_v2_tag_assignments),
+    Migration(3, "Full-text search index", _schema_v3_search_index),
+    Migration(4, "Tagging provenance", _schema_v4_tag_provenance, _backfill_v4_tag_provenance),
+    Migration(5, "Listing indexes", _schema_v5_listing_indexes),
+    Migration(6, "Data versions", _schema_v6_data_versions),
+    Migration(7, "Data version timestamps", _schema_v7_data_version_times),
+]
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+async def get_schema_version() -> int:
+    """Read the schema version recorded in PRAGMA user_version."""
+    async with read_connection() as db:
+        async with db.execute("PRAGMA user_version") as cursor:
+            return (await cursor.fetchone())[0]
+
+
+async def run_migrations(batch_size: int = MIGRATION_BATCH_SIZE) -> list[int]:
+    """
+    Apply every migration newer than the database's user_version.
+
+    Args:
+        batch_size: Rows per transaction for batched backfills
+
+    Returns:
+        Versions that were applied (empty when the schema is current)
+    """
+    current = await get_schema_version()
+    if current >= SCHEMA_VERSION:
+        return []
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+        async with write_connection() as db:
+            await migration.schema(db)
+        if migration.backfill:
+            after = ""
+            while after is not None:
+                async with write_connection() as db:
+                    after = await migration.backfill(db, after, batch_size)
+        async with write_connection() as db:
+            await db.execute(f"PRAGMA user_version = {migration.version}")
+        applied.append(migration.version)
+    return applied
+
+
 async def init_database():
-    """Initialize the database with required tables."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        # Papers table
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS papers (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                abstract TEXT NOT NULL,
-                published_date TEXT,
-                hf_url TEXT NOT NULL,
-                arxiv_url TEXT,
-                pdf_url TEXT,
-                upvotes INTEGER DEFAULT 0,
-                authors_json TEXT DEFAULT '[]',
-                content_hash TEXT,
-                appeared_date TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+    """
+    Bring the database schema up to date.
 
-        # Add appeared_date column if it doesn't exist (migration)
-        try:
-            await db.execute("ALTER TABLE papers ADD COLUMN appeared_date TEXT")
-        except aiosqlite.OperationalError:
-            pass  # Column already exists
+    When the schema is already current this is a single PRAGMA read.
+    """
+    await run_migrations()
 
-        # Upvote history table - tracks upvotes over time
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS upvote_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                paper_id TEXT NOT NULL,
-                date TEXT NOT NULL,
-                upvotes INTEGER NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (paper_id) REFERENCES papers(id),
-                UNIQUE(paper_id, date)
-            )
-        """)
 
-        # Daily snapshots table - pre-computed daily aggregations
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS daily_snapshots (
-                date TEXT PRIMARY KEY,
-                total_papers INTEGER NOT NULL,
-                cluster_counts_json TEXT NOT NULL,
-                top_paper_ids_json TEXT NOT NULL,
-                new_paper_ids_json TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Taxonomies table
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS taxonomies (
-                month TEXT PRIMARY KEY,
-                contribution_tags_json TEXT NOT NULL,
-                task_tags_json TEXT NOT NULL,
-                modality_tags_json TEXT NOT NULL,
-                definitions_json TEXT DEFAULT '{}',
-                version INTEGER DEFAULT 1,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Paper tags table
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS paper_tags (
-                paper_id TEXT PRIMARY KEY,
-                month TEXT NOT NULL,
-                primary_contribution_tag TEXT NOT NULL,
-                secondary_contribution_tags_json TEXT DEFAULT '[]',
-                task_tags_json TEXT DEFAULT '[]',
-                modality_tags_json TEXT DEFAULT '[]',
-                research_question TEXT,
-                confidence REAL DEFAULT 0.0,
-                rationale TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (paper_id) REFERENCES papers(id)
-            )
-        """)
-        
-        # Indexes for faster queries
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_paper_tags_month ON paper_tags(month)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_paper_tags_primary ON paper_tags(primary_contribution_tag)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_papers_appeared_date ON papers(appeared_date)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_upvote_history_paper ON upvote_history(paper_id)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_upvote_history_date ON upvote_history(date)")
+UPSERT_PAPER_SQL = """
+    INSERT INTO papers (id, title, abstract, published_date, hf_url, arxiv_url, pdf_url, upvotes, authors_json, content_hash, appeared_date, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        title = excluded.title,
+        abstract = excluded.abstract,
+        published_date = excluded.published_date,
+        hf_url = excluded.hf_url,
+        arxiv_url = excluded.arxiv_url,
+        pdf_url = excluded.pdf_url,
+        upvotes = excluded.upvotes,
+        authors_json = excluded.authors_json,
+        content_hash = excluded.content_hash,
+        appeared_date = COALESCE(papers.appeared_date, excluded.appeared_date),
+        updated_at = excluded.updated_at
+"""
 
-        await db.commit()
+
+def _paper_params(paper: Paper, updated_at: str) -> tuple:
+    """Bind parameters for UPSERT_PAPER_SQL."""
+    return (
+        paper.id, paper.title, paper.abstract, paper.published_date,
+        paper.hf_url, paper.arxiv_url, paper.pdf_url, paper.upvotes,
+        json.dumps(paper.authors), paper.content_hash, paper.appeared_date,
+        updated_at
+    )
 
 
 async def upsert_paper(paper: Paper):
     """Insert or update a paper record."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute("""
-            INSERT INTO papers (id, title, abstract, published_date, hf_url, arxiv_url, pdf_url, upvotes, authors_json, content_hash, appeared_date, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                title = excluded.title,
-                abstract = excluded.abstract,
-                published_date = excluded.published_date,
-                hf_url = excluded.hf_url,
-                arxiv_url = excluded.arxiv_url,
-                pdf_url = excluded.pdf_url,
-                upvotes = excluded.upvotes,
-                authors_json = excluded.authors_json,
-                content_hash = excluded.content_hash,
-                appeared_date = COALESCE(papers.appeared_date, excluded.appeared_date),
-                updated_at = excluded.updated_at
-        """, (
-            paper.id, paper.title, paper.abstract, paper.published_date,
-            paper.hf_url, paper.arxiv_url, paper.pdf_url, paper.upvotes,
-            json.dumps(paper.authors), paper.content_hash, paper.appeared_date,
-            datetime.now().isoformat()
-        ))
-        await db.commit()
+    await upsert_papers_many([paper])
+
+
+async def upsert_papers_many(papers: list[Paper]):
+    """Insert or update many paper records in a single transaction."""
+    if not papers:
+        return
+    updated_at = datetime.now().isoformat()
+    async with write_connection() as db:
+        await db.executemany(UPSERT_PAPER_SQL, [_paper_params(p, updated_at) for p in papers])
+        months = await _tagged_months(db, [p.id for p in papers])
+        await _bump_data_versions(db, months | {p.appeared_date[:7] for p in papers if p.appeared_date})
 
 
 async def get_paper(paper_id: str) -> Optional[Paper]:
     """Get a paper by ID."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute("SELECT * FROM papers WHERE id = ?", (paper_id,)) as cursor:
             row = await cursor.fetchone()
             if row:
-                return Paper(
-                    id=row['id'],
-                    title=row['title'],
-                    abstract=row['abstract'],
-                    published_date=row['published_date'] or "",
-                    hf_url=row['hf_url'],
-                    arxiv_url=row['arxiv_url'],
-                    pdf_url=row['pdf_url'],
-                    upvotes=row['upvotes'],
-                    authors=json.loads(row['authors_json']),
-                    content_hash=row['content_hash'] or "",
-                    appeared_date=row['appeared_date'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                )
+                return row_to_paper(row)
     return None
 
 
 async def get_all_papers() -> list[Paper]:
     """Get all papers."""
     papers = []
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute("SELECT * FROM papers ORDER BY upvotes DESC") as cursor:
             async for row in cursor:
-                papers.append(Paper(
-                    id=row['id'],
-                    title=row['title'],
-                    abstract=row['abstract'],
-                    published_date=row['published_date'] or "",
-                    hf_url=row['hf_url'],
-                    arxiv_url=row['arxiv_url'],
-                    pdf_url=row['pdf_url'],
-                    upvotes=row['upvotes'],
-                    authors=json.loads(row['authors_json']),
-                    content_hash=row['content_hash'] or "",
-                    appeared_date=row['appeared_date'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                ))
+                papers.append(row_to_paper(row))
     return papers
 
 
 async def save_taxonomy(taxonomy: Taxonomy):
     """Save or update taxonomy for a month."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         await db.execute("""
             INSERT INTO taxonomies (month, contribution_tags_json, task_tags_json, modality_tags_json, definitions_json, version)
             VALUES (?, ?, ?, ?, ?, ?)
@@ -266,13 +763,12 @@ async def save_taxonomy(taxonomy: Taxonomy):
             json.dumps(taxonomy.definitions),
             taxonomy.version
         ))
-        await db.commit()
+        await _bump_data_versions(db, [taxonomy.month])
 
 
 async def get_taxonomy(month: str) -> Optional[Taxonomy]:
     """Get taxonomy for a month."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute("SELECT * FROM taxonomies WHERE month = ?", (month,)) as cursor:
             row = await cursor.fetchone()
             if row:
@@ -287,183 +783,865 @@ async def get_taxonomy(month: str) -> Optional[Taxonomy]:
     return None
 
 
+SAVE_PAPER_TAGS_SQL = """
+    INSERT INTO paper_tags (paper_id, month, primary_contribution_tag, secondary_contribution_tags_json, task_tags_json, modality_tags_json, research_question, confidence, rationale, content_hash, taxonomy_version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(paper_id) DO UPDATE SET
+        month = excluded.month,
+        primary_contribution_tag = excluded.primary_contribution_tag,
+        secondary_contribution_tags_json = excluded.secondary_contribution_tags_json,
+        task_tags_json = excluded.task_tags_json,
+        modality_tags_json = excluded.modality_tags_json,
+        research_question = excluded.research_question,
+        confidence = excluded.confidence,
+        rationale = excluded.rationale,
+        content_hash = excluded.content_hash,
+        taxonomy_version = excluded.taxonomy_version
+"""
+
+
+def _paper_tags_params(tags: PaperTags) -> tuple:
+    """Bind parameters for SAVE_PAPER_TAGS_SQL."""
+    return (
+        tags.paper_id, tags.month, tags.primary_contribution_tag,
+        json.dumps(tags.secondary_contribution_tags),
+        json.dumps(tags.task_tags),
+        json.dumps(tags.modality_tags),
+        tags.research_question, tags.confidence, tags.rationale,
+        tags.content_hash or None, tags.taxonomy_version or None
+    )
+
+
+# Kinds of rows in paper_tag_assignments, keyed to the PaperTags field they come from
+TAG_KINDS = {
+    "primary": "primary_contribution_tag",
+    "secondary": "secondary_contribution_tags",
+    "task": "task_tags",
+    "modality": "modality_tags",
+}
+
+
+def _tag_assignment_rows(tags: PaperTags) -> list[tuple]:
+    """Flatten a PaperTags record into (paper_id, kind, tag) rows."""
+    rows = []
+    for kind, field in TAG_KINDS.items():
+        values = getattr(tags, field)
+        if isinstance(values, str):
+            values = [values] if values else []
+        rows.extend((tags.paper_id, kind, tag) for tag in values)
+    return rows
+
+
+async def _replace_tag_assignments(db: aiosqlite.Connection, tags_list: list[PaperTags]):
+    """Rewrite the normalized assignment rows for the given papers."""
+    await db.executemany(
+        "DELETE FROM paper_tag_assignments WHERE paper_id = ?",
+        [(t.paper_id,) for t in tags_list]
+    )
+    await db.executemany(
+        "INSERT OR IGNORE INTO paper_tag_assignments (paper_id, kind, tag) VALUES (?, ?, ?)",
+        [row for t in tags_list for row in _tag_assignment_rows(t)]
+    )
+
+
+async def backfill_tag_assignments(db: aiosqlite.Connection, paper_ids: Optional[list[str]] = None) -> int:
+    """
+    Populate paper_tag_assignments from the JSON columns of paper_tags.
+
+    Only papers that have no assignment rows yet are touched, so running it
+    again is a no-op.
+
+    Args:
+        db: Writer connection
+        paper_ids: Restrict the backfill to these papers (default: all)
+
+    Returns:
+        Number of assignment rows inserted
+    """
+    json_columns = {
+        "secondary": "secondary_contribution_tags_json",
+        "task": "task_tags_json",
+        "modality": "modality_tags_json",
+    }
+    missing = "pt.paper_id NOT IN (SELECT paper_id FROM paper_tag_assignments)"
+    params = []
+    if paper_ids is not None:
+        missing += " AND pt.paper_id IN (SELECT value FROM json_each(?))"
+        params = [json.dumps(paper_ids)] * (len(json_columns) + 1)
+    selects = [
+        f"""SELECT pt.paper_id, 'primary', pt.primary_contribution_tag
+            FROM paper_tags pt
+            WHERE pt.primary_contribution_tag != '' AND {missing}"""
+    ]
+    for kind, column in json_columns.items():
+        selects.append(
+            f"""SELECT pt.paper_id, '{kind}', j.value
+                FROM paper_tags pt, json_each(COALESCE(pt.{column}, '[]')) j
+                WHERE {missing}"""
+        )
+    cursor = await db.execute(
+        "INSERT OR IGNORE INTO paper_tag_assignments (paper_id, kind, tag) "
+        + " UNION ALL ".join(selects),
+        params
+    )
+    return cursor.rowcount
+
+
 async def save_paper_tags(tags: PaperTags):
     """Save paper tags."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute("""
-            INSERT INTO paper_tags (paper_id, month, primary_contribution_tag, secondary_contribution_tags_json, task_tags_json, modality_tags_json, research_question, confidence, rationale)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(paper_id) DO UPDATE SET
-                month = excluded.month,
-                primary_contribution_tag = excluded.primary_contribution_tag,
-                secondary_contribution_tags_json = excluded.secondary_contribution_tags_json,
-                task_tags_json = excluded.task_tags_json,
-                modality_tags_json = excluded.modality_tags_json,
-                research_question = excluded.research_question,
-                confidence = excluded.confidence,
-                rationale = excluded.rationale
-        """, (
-            tags.paper_id, tags.month, tags.primary_contribution_tag,
-            json.dumps(tags.secondary_contribution_tags),
-            json.dumps(tags.task_tags),
-            json.dumps(tags.modality_tags),
-            tags.research_question, tags.confidence, tags.rationale
-        ))
-        await db.commit()
+    await save_paper_tags_many([tags])
+
+
+async def save_paper_tags_many(tags_list: list[PaperTags]):
+    """Save tags for many papers in a single transaction."""
+    if not tags_list:
+        return
+    async with write_connection() as db:
+        # Papers may move between months, so the old months change too
+        months = await _tagged_months(db, [t.paper_id for t in tags_list])
+        await db.executemany(SAVE_PAPER_TAGS_SQL, [_paper_tags_params(t) for t in tags_list])
+        await _replace_tag_assignments(db, tags_list)
+        await _bump_data_versions(db, months | {t.month for t in tags_list})
 
 
 async def get_paper_tags(paper_id: str) -> Optional[PaperTags]:
     """Get tags for a paper."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute("SELECT * FROM paper_tags WHERE paper_id = ?", (paper_id,)) as cursor:
             row = await cursor.fetchone()
             if row:
-                return PaperTags(
-                    paper_id=row['paper_id'],
-                    month=row['month'],
-                    primary_contribution_tag=row['primary_contribution_tag'],
-                    secondary_contribution_tags=json.loads(row['secondary_contribution_tags_json']),
-                    task_tags=json.loads(row['task_tags_json']),
-                    modality_tags=json.loads(row['modality_tags_json']),
-                    research_question=row['research_question'] or "",
-                    confidence=row['confidence'],
-                    rationale=row['rationale'] or ""
-                )
+                return row_to_paper_tags(row)
     return None
 
 
 async def get_all_paper_tags_for_month(month: str) -> list[PaperTags]:
     """Get all paper tags for a specific month."""
     tags_list = []
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute("SELECT * FROM paper_tags WHERE month = ?", (month,)) as cursor:
             async for row in cursor:
-                tags_list.append(PaperTags(
-                    paper_id=row['paper_id'],
-                    month=row['month'],
-                    primary_contribution_tag=row['primary_contribution_tag'],
-                    secondary_contribution_tags=json.loads(row['secondary_contribution_tags_json']),
-                    task_tags=json.loads(row['task_tags_json']),
-                    modality_tags=json.loads(row['modality_tags_json']),
-                    research_question=row['research_question'] or "",
-                    confidence=row['confidence'],
-                    rationale=row['rationale'] or ""
-                ))
+                tags_list.append(row_to_paper_tags(row))
     return tags_list
 
 
-async def get_papers_with_tags_for_month(month: str) -> list[dict]:
-    """Get all papers with their tags for a month (joined query)."""
+async def get_papers_needing_tags(papers: list[Paper], taxonomy: Taxonomy) -> list[Paper]:
+    """
+    Drop papers whose stored tags are still current for a taxonomy.
+
+    Tags are current when they were made for the taxonomy's month, from its
+    present version and from the paper's present content hash. Papers
+    tagged under another month are returned so they move to this one.
+    Papers without a content hash are always returned.
+
+    Args:
+        papers: Candidate papers to tag
+        taxonomy: Taxonomy the papers are about to be tagged with
+
+    Returns:
+        The papers that need (re-)tagging, in their original order
+    """
+    current = set()
+    async with read_connection() as db:
+        async with db.execute("""
+            SELECT paper_id, content_hash FROM paper_tags
+            WHERE month = ? AND taxonomy_version = ?
+            AND paper_id IN (SELECT value FROM json_each(?))
+        """, (taxonomy.month, taxonomy.version, json.dumps([p.id for p in papers]))) as cursor:
+            async for row in cursor:
+                current.add((row['paper_id'], row['content_hash']))
+    return [p for p in papers if not p.content_hash or (p.id, p.content_hash) not in current]
+
+
+async def get_papers_with_tags_for_month(
+    month: str,
+    task: Optional[str] = None,
+    modality: Optional[str] = None,
+    search: Optional[str] = None
+) -> list[dict]:
+    """
+    Get all papers with their tags for a month (joined query).
+
+    Args:
+        month: Month in YYYY-MM format
+        task: Only include papers with this task tag
+        modality: Only include papers with this modality tag
+        search: Only include papers whose title/abstract match (full-text)
+    """
     results = []
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        query = """
+    conditions = ["pt.month = ?"]
+    params: list = [month]
+    for kind, tag in (("task", task), ("modality", modality)):
+        if tag:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM paper_tag_assignments a"
+                " WHERE a.paper_id = p.id AND a.kind = ? AND a.tag = ?)"
+            )
+            params.extend([kind, tag])
+    match = build_fts_query(search) if search else None
+    if match:
+        conditions.append("p.rowid IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)")
+        params.append(match)
+    elif search:
+        conditions.append("0")  # No word tokens: match nothing rather than everything
+
+    async with read_connection() as db:
+        query = f"""
             SELECT p.*, pt.primary_contribution_tag, pt.secondary_contribution_tags_json,
                    pt.task_tags_json, pt.modality_tags_json, pt.research_question,
                    pt.confidence, pt.rationale
-            FROM papers p
-            LEFT JOIN paper_tags pt ON p.id = pt.paper_id
-            WHERE pt.month = ?
+            FROM paper_tags pt
+            JOIN papers p ON p.id = pt.paper_id
+            WHERE {" AND ".join(conditions)}
             ORDER BY p.upvotes DESC
         """
-        async with db.execute(query, (month,)) as cursor:
+        async with db.execute(query, params) as cursor:
+            async for row in cursor:
+                results.append({
+                    "paper": row_to_paper(row),
+                    "tags": joined_row_to_tags(row, month)
+                })
+    return results
+
+
+async def count_papers_for_month(month: str) -> int:
+    """Count papers that have tags for a month."""
+    async with read_connection() as db:
+        async with db.execute(
+            """SELECT COUNT(*) FROM paper_tags pt
+               JOIN papers p ON p.id = pt.paper_id
+               WHERE pt.month = ?""",
+            (month,)
+        ) as cursor:
+            row = await cursor.fetchone()
+    return row[0]
+
+
+async def get_tag_counts_for_month(month: str, kind: str) -> dict[str, int]:
+    """
+    Count papers per tag of one kind for a month (facet counts).
+
+    Args:
+        month: Month in YYYY-MM format
+        kind: One of TAG_KINDS ("primary", "secondary", "task", "modality")
+
+    Returns:
+        Dict of tag -> paper count, most frequent first
+    """
+    if kind not in TAG_KINDS:
+        raise ValueError(f"Unknown tag kind: {kind}")
+
+    counts = {}
+    async with read_connection() as db:
+        async with db.execute(
+            # CROSS JOIN keeps the month's tag rows as the outer loop; otherwise
+            # the planner walks every assignment of this kind across all months
+            """SELECT a.tag, COUNT(*) AS n
+               FROM paper_tags pt
+               JOIN papers p ON p.id = pt.paper_id
+               CROSS JOIN paper_tag_assignments a ON a.paper_id = pt.paper_id AND a.kind = ?
+               WHERE pt.month = ?
+               GROUP BY a.tag
+               ORDER BY n DESC, a.tag""",
+            (kind, month)
+        ) as cursor:
+            async for row in cursor:
+                counts[row['tag']] = row['n']
+    return counts
+
+
+async def get_cluster_facets_for_month(month: str) -> dict[str, dict]:
+    """
+    Get per-cluster paper counts with task and modality facet counts.
+
+    Returns:
+        Dict of cluster name -> {"paper_count": int, "task_tags": {tag: count},
+        "modality_tags": {tag: count}}, tag counts most frequent first
+    """
+    facets = {}
+    async with read_connection() as db:
+        async with db.execute(
+            """SELECT pt.primary_contribution_tag AS cluster, COUNT(*) AS n
+               FROM paper_tags pt
+               JOIN papers p ON p.id = pt.paper_id
+               WHERE pt.month = ? AND pt.primary_contribution_tag != ''
+               GROUP BY cluster""",
+            (month,)
+        ) as cursor:
+            async for row in cursor:
+                facets[row['cluster']] = {
+                    "paper_count": row['n'],
+                    "task_tags": {},
+                    "modality_tags": {},
+                }
+
+        async with db.execute(
+            """SELECT pt.primary_contribution_tag AS cluster, a.kind, a.tag, COUNT(*) AS n
+               FROM paper_tags pt
+               JOIN papers p ON p.id = pt.paper_id
+               JOIN paper_tag_assignments a ON a.paper_id = pt.paper_id
+               WHERE pt.month = ? AND pt.primary_contribution_tag != ''
+                 AND a.kind IN ('task', 'modality')
+               GROUP BY cluster, a.kind, a.tag
+               ORDER BY n DESC, a.tag""",
+            (month,)
+        ) as cursor:
+            async for row in cursor:
+                facets[row['cluster']][f"{row['kind']}_tags"][row['tag']] = row['n']
+    return facets
+
+
+# ============= Paper Listing Queries =============
+
+# SQL sort expressions for paper listings; every sort is descending with
+# p.id as the tiebreaker so keyset cursors are stable
+PAPER_SORT_KEYS = {
+    "upvotes": "p.upvotes",
+    "date": "COALESCE(p.published_date, '')",
+    "confidence": "COALESCE(pt.confidence, 0.0)",
+}
+
+
+# Card projection: abstract snippet length and number of authors shown
+CARD_SNIPPET_LENGTH = 250
+CARD_AUTHOR_COUNT = 3
+
+# Columns for listing rows that carry full papers and tags
+FULL_PAPER_COLUMNS = """
+    p.*, pt.primary_contribution_tag, pt.secondary_contribution_tags_json,
+    pt.task_tags_json, pt.modality_tags_json, pt.research_question,
+    pt.confidence, pt.rationale, pt.month
+"""
+
+_CARD_AUTHOR_COLUMNS = ", ".join(
+    f"json_extract(p.authors_json, '$[{i}]') AS author_{i}" for i in range(CARD_AUTHOR_COUNT)
+)
+
+# Narrow columns for paper cards: snippet and first authors are cut in SQL
+# and created_at/updated_at/content_hash are never read
+CARD_COLUMNS = f"""
+    p.id, p.title,
+    CASE WHEN length(p.abstract) > {CARD_SNIPPET_LENGTH}
+         THEN substr(p.abstract, 1, {CARD_SNIPPET_LENGTH}) || '...'
+         ELSE p.abstract END AS abstract_snippet,
+    p.published_date, p.upvotes, p.hf_url, p.arxiv_url, p.pdf_url, p.appeared_date,
+    {_CARD_AUTHOR_COLUMNS},
+    pt.primary_contribution_tag, pt.secondary_contribution_tags_json,
+    pt.task_tags_json, pt.modality_tags_json, pt.research_question,
+    pt.confidence, pt.rationale
+"""
+
+
+class PaperQuery(BaseModel):
+    """
+    Filters, sort order and page window for a paper listing.
+
+    At least one of month (papers tagged for that month) or appeared_date
+    (papers that appeared that day, tagged or not) must be set.
+    """
+    month: Optional[str] = None
+    appeared_date: Optional[str] = None
+    clusters: Optional[list[str]] = None  # Primary contribution tag names
+    task: Optional[str] = None
+    modality: Optional[str] = None
+    search: Optional[str] = None
+    sort_by: str = "upvotes"
+    limit: int = 100
+    offset: int = 0
+    cursor: Optional[str] = None  # Keyset token from a previous page
+
+
+def encode_cursor(sort_by: str, sort_key, paper_id: str) -> str:
+    """Encode the position after a row as an opaque keyset cursor."""
+    raw = json.dumps([sort_by, sort_key, paper_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> tuple:
+    """
+    Decode a keyset cursor into (sort_key, paper_id).
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, sort_key, paper_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_sort != sort_by:
+        raise ValueError(f"Cursor was issued for sort_by={cursor_sort}")
+    return sort_key, paper_id
+
+
+def build_paper_query(query: PaperQuery, columns: str = FULL_PAPER_COLUMNS) -> tuple[str, list]:
+    """
+    Build one SQL statement for a filtered, sorted page of papers with tags.
+
+    Tag filters use paper_tag_assignments, search uses papers_fts, and the
+    page window is applied with a keyset condition (when a cursor is given)
+    plus LIMIT/OFFSET. One extra row is requested so the caller can tell
+    whether another page exists.
+
+    Args:
+        query: Listing filters and page window
+        columns: Select list, FULL_PAPER_COLUMNS or CARD_COLUMNS
+
+    Returns:
+        (sql, params) tuple
+
+    Raises:
+        ValueError: If sort_by is unknown, the cursor is invalid, or neither
+            month nor appeared_date is set
+    """
+    if query.sort_by not in PAPER_SORT_KEYS:
+        raise ValueError(f"Unknown sort_by: {query.sort_by}")
+    if not query.month and not query.appeared_date:
+        raise ValueError("A month or appeared_date is required")
+    sort_expr = PAPER_SORT_KEYS[query.sort_by]
+
+    conditions = []
+    params: list = []
+    if query.month:
+        # Month listings only include papers tagged for that month
+        source = "paper_tags pt JOIN papers p ON p.id = pt.paper_id"
+        conditions.append("pt.month = ?")
+        params.append(query.month)
+    else:
+        source = "papers p LEFT JOIN paper_tags pt ON pt.paper_id = p.id"
+    if query.appeared_date:
+        conditions.append("p.appeared_date = ?")
+        params.append(query.appeared_date)
+
+    if query.clusters is not None:
+        placeholders = ", ".join("?" for _ in query.clusters)
+        conditions.append(f"pt.primary_contribution_tag IN ({placeholders})")
+        params.extend(query.clusters)
+
+    for kind, tag in (("task", query.task), ("modality", query.modality)):
+        if tag:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM paper_tag_assignments a"
+                " WHERE a.paper_id = p.id AND a.kind = ? AND a.tag = ?)"
+            )
+            params.extend([kind, tag])
+
+    match = build_fts_query(query.search) if query.search else None
+    if match:
+        conditions.append("p.rowid IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)")
+        params.append(match)
+    elif query.search:
+        conditions.append("0")  # No word tokens: match nothing rather than everything
+
+    if query.cursor:
+        sort_key, paper_id = decode_cursor(query.cursor, query.sort_by)
+        conditions.append(f"({sort_expr}, p.id) < (?, ?)")
+        params.extend([sort_key, paper_id])
+
+    sql = f"""
+        SELECT {columns}, {sort_expr} AS sort_key
+        FROM {source}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY sort_key DESC, p.id DESC
+        LIMIT ? OFFSET ?
+    """
+    params.extend([query.limit + 1, query.offset])
+    return sql, params
+
+
+def _joined_row_to_item(row: aiosqlite.Row) -> dict:
+    """Build a {"paper", "tags"} dict from a papers + paper_tags row."""
+    return {
+        "paper": row_to_paper(row),
+        "tags": joined_row_to_tags(row)
+    }
+
+
+def _card_row_to_dict(row: aiosqlite.Row) -> dict:
+    """Build a card dict from a CARD_COLUMNS row."""
+    has_tags = bool(row['primary_contribution_tag'])
+    return {
+        "id": row['id'],
+        "title": row['title'],
+        "abstract_snippet": row['abstract_snippet'],
+        "published_date": row['published_date'] or "",
+        "upvotes": row['upvotes'],
+        "authors_short": [
+            author for author in (row[f'author_{i}'] for i in range(CARD_AUTHOR_COUNT))
+            if author is not None
+        ],
+        "hf_url": row['hf_url'],
+        "arxiv_url": row['arxiv_url'],
+        "pdf_url": row['pdf_url'],
+        "appeared_date": row['appeared_date'],
+        "has_tags": has_tags,
+        "primary_contribution_tag": row['primary_contribution_tag'] if has_tags else "OTHER",
+        "secondary_contribution_tags": json.loads(row['secondary_contribution_tags_json'] or '[]') if has_tags else [],
+        "task_tags": json.loads(row['task_tags_json'] or '[]') if has_tags else [],
+        "modality_tags": json.loads(row['modality_tags_json'] or '[]') if has_tags else [],
+        "research_question": (row['research_question'] or "") if has_tags else "",
+        "confidence": (row['confidence'] or 0.0) if has_tags else 0.0,
+        "rationale": (row['rationale'] or "") if has_tags else "",
+    }
+
+
+async def _run_paper_query(query: PaperQuery, columns: str, to_item) -> tuple[list, Optional[str]]:
+    """Execute a listing query and split off the next keyset cursor."""
+    sql, params = build_paper_query(query, columns)
+    async with read_connection() as db:
+        async with db.execute(sql, params) as cursor:
+            rows = await cursor.fetchall()
+
+    items = [to_item(row) for row in rows[:query.limit]]
+    next_cursor = None
+    if len(rows) > query.limit and items:
+        last = rows[query.limit - 1]
+        next_cursor = encode_cursor(query.sort_by, last['sort_key'], last['id'])
+    return items, next_cursor
+
+
+async def query_papers_with_tags(query: PaperQuery) -> tuple[list[dict], Optional[str]]:
+    """
+    Run a paper listing query returning full papers.
+
+    Returns:
+        (items, next_cursor) where items are {"paper", "tags"} dicts and
+        next_cursor is None on the last page
+    """
+    return await _run_paper_query(query, FULL_PAPER_COLUMNS, _joined_row_to_item)
+
+
+async def query_paper_cards(query: PaperQuery) -> tuple[list[dict], Optional[str]]:
+    """
+    Run a paper listing query using the narrow card projection.
+
+    Reads only what a paper card shows: a truncated abstract and the first
+    CARD_AUTHOR_COUNT authors, both cut in SQL.
+
+    Returns:
+        (cards, next_cursor) where cards are dicts from _card_row_to_dict and
+        next_cursor is None on the last page
+    """
+    return await _run_paper_query(query, CARD_COLUMNS, _card_row_to_dict)
+
+
+async def _fetch_papers_by_ids(paper_ids: list[str], columns: str, to_item) -> list:
+    """Look up papers joined with their tags in one query, in the order of paper_ids."""
+    async with read_connection() as db:
+        async with db.execute(
+            f"""
+            SELECT {columns}
+            FROM json_each(?) ids
+            JOIN papers p ON p.id = ids.value
+            LEFT JOIN paper_tags pt ON pt.paper_id = p.id
+            ORDER BY ids.key
+            """,
+            (json.dumps(paper_ids),)
+        ) as cursor:
+            return [to_item(row) for row in await cursor.fetchall()]
+
+
+async def get_papers_with_tags_by_ids(paper_ids: list[str]) -> list[dict]:
+    """
+    Get full papers and their tags for a list of ids.
+
+    Returns:
+        {"paper", "tags"} dicts in the order of paper_ids; unknown ids are skipped
+    """
+    return await _fetch_papers_by_ids(paper_ids, FULL_PAPER_COLUMNS, _joined_row_to_item)
+
+
+async def get_paper_cards_by_ids(paper_ids: list[str]) -> list[dict]:
+    """
+    Get card rows (see query_paper_cards) for a list of ids.
+
+    Returns:
+        Card dicts in the order of paper_ids; unknown ids are skipped
+    """
+    return await _fetch_papers_by_ids(paper_ids, CARD_COLUMNS, _card_row_to_dict)
+
+
+async def count_papers_by_date(date: str) -> int:
+    """Count papers that appeared on a specific date."""
+    async with read_connection() as db:
+        async with db.execute(
+            "SELECT COUNT(*) FROM papers WHERE appeared_date = ?", (date,)
+        ) as cursor:
+            row = await cursor.fetchone()
+    return row[0]
+
+
+async def get_cluster_names_for_month(month: str) -> list[str]:
+    """Get the distinct primary contribution tags (cluster names) of a month."""
+    async with read_connection() as db:
+        async with db.execute(
+            "SELECT DISTINCT primary_contribution_tag FROM paper_tags WHERE month = ?",
+            (month,)
+        ) as cursor:
+            return [row[0] async for row in cursor]
+
+
+MONTH_INDEX_SQL = """
+    WITH month_papers AS (
+        SELECT substr(appeared_date, 1, 7) AS month, id AS paper_id
+        FROM papers WHERE appeared_date IS NOT NULL
+        UNION
+        SELECT month, paper_id FROM paper_tags
+    )
+    SELECT
+        mp.month,
+        COUNT(*) AS paper_count,
+        COUNT(pt.paper_id) AS tagged_count,
+        COALESCE(dv.updated_at, MAX(p.updated_at)) AS last_updated
+    FROM month_papers mp
+    JOIN papers p ON p.id = mp.paper_id
+    LEFT JOIN paper_tags pt ON pt.paper_id = mp.paper_id AND pt.month = mp.month
+    LEFT JOIN data_versions dv ON dv.scope = mp.month
+    GROUP BY mp.month
+    ORDER BY mp.month DESC
+"""
+
+
+async def get_month_index() -> list[dict]:
+    """
+    Summarize every month that has papers, newest first.
+
+    A paper belongs to the month it appeared in and to the month it is
+    tagged under. This reads the whole papers table, so callers should
+    cache it against the GLOBAL_SCOPE data version.
+
+    Returns:
+        Dicts with month, paper_count, tagged_count and last_updated (the
+        month's last write, or its newest paper for older databases)
+    """
+    async with read_connection() as db:
+        async with db.execute(MONTH_INDEX_SQL) as cursor:
+            return [
+                {
+                    "month": row['month'],
+                    "paper_count": row['paper_count'],
+                    "tagged_count": row['tagged_count'],
+                    "last_updated": row['last_updated'],
+                }
+                async for row in cursor
+            ]
+
+
+async def get_cluster_names_for_date(date: str) -> list[str]:
+    """Get the distinct primary contribution tags of papers that appeared on a date."""
+    async with read_connection() as db:
+        async with db.execute(
+            """
+            SELECT DISTINCT pt.primary_contribution_tag
+            FROM papers p JOIN paper_tags pt ON pt.paper_id = p.id
+            WHERE p.appeared_date = ?
+            """,
+            (date,)
+        ) as cursor:
+            return [row[0] async for row in cursor]
+
+
+# ============= Full-Text Search =============
+
+# Markers wrapped around matched terms in highlights and snippets
+SEARCH_HIGHLIGHT_START = "<mark>"
+SEARCH_HIGHLIGHT_END = "</mark>"
+
+# BM25 column weights: title matches count more than abstract matches
+SEARCH_TITLE_WEIGHT = 10.0
+SEARCH_ABSTRACT_WEIGHT = 1.0
+
+
+async def create_search_index(db: aiosqlite.Connection):
+    """
+    Create the papers_fts FTS5 index and the triggers that keep it in sync.
+
+    papers_fts is an external-content table over papers(title, abstract)
+    keyed on the papers rowid, so the text is not stored twice. Call
+    rebuild_search_index() after a VACUUM, which may renumber rowids.
+    """
+    async with db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'papers_fts'"
+    ) as cursor:
+        exists = await cursor.fetchone() is not None
+
+    await db.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+            title, abstract,
+            content='papers', content_rowid='rowid',
+            tokenize='porter unicode61'
+        )
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+            INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+            INSERT INTO papers_fts(papers_fts, rowid, title, abstract)
+            VALUES ('delete', old.rowid, old.title, old.abstract);
+        END
+    """)
+    # Upserts rewrite every column, so only reindex when the text really changed
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE OF title, abstract ON papers
+        WHEN old.title IS NOT new.title OR old.abstract IS NOT new.abstract BEGIN
+            INSERT INTO papers_fts(papers_fts, rowid, title, abstract)
+            VALUES ('delete', old.rowid, old.title, old.abstract);
+            INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+        END
+    """)
+
+    if not exists:
+        # Index papers stored before the search index existed (migration)
+        await db.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+
+
+async def rebuild_search_index():
+    """Rebuild papers_fts from the papers table."""
+    async with write_connection() as db:
+        await db.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+
+
+def build_fts_query(text: str) -> Optional[str]:
+    """
+    Turn free-text user input into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term, so FTS5 operators in the input
+    are treated as plain text and partial words still match. All terms must
+    match. Returns None if the input has no searchable words.
+    """
+    terms = re.findall(r"\w+", text.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+async def search_papers(
+    query: str,
+    month: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0
+) -> list[dict]:
+    """
+    Full-text search over paper titles and abstracts, ranked by BM25.
+
+    Args:
+        query: Free-text search input
+        month: Only include papers tagged for this month (YYYY-MM)
+        start_date: Only include papers that appeared on or after this date
+        end_date: Only include papers that appeared on or before this date
+        limit: Maximum results to return
+        offset: Number of results to skip
+
+    Returns:
+        List of {"paper", "tags", "score", "title_highlight", "snippet"} dicts,
+        best match first (lower BM25 score is better)
+    """
+    match = build_fts_query(query)
+    if not match:
+        return []
+
+    conditions = ["papers_fts MATCH ?"]
+    params: list = [match]
+    if month:
+        conditions.append("pt.month = ?")
+        params.append(month)
+    if start_date:
+        conditions.append("p.appeared_date >= ?")
+        params.append(start_date)
+    if end_date:
+        conditions.append("p.appeared_date <= ?")
+        params.append(end_date)
+
+    results = []
+    async with read_connection() as db:
+        sql = f"""
+            SELECT p.*, pt.primary_contribution_tag, pt.secondary_contribution_tags_json,
+                   pt.task_tags_json, pt.modality_tags_json, pt.research_question,
+                   pt.confidence, pt.rationale, pt.month,
+                   bm25(papers_fts, {SEARCH_TITLE_WEIGHT}, {SEARCH_ABSTRACT_WEIGHT}) AS score,
+                   highlight(papers_fts, 0, '{SEARCH_HIGHLIGHT_START}', '{SEARCH_HIGHLIGHT_END}') AS title_highlight,
+                   snippet(papers_fts, 1, '{SEARCH_HIGHLIGHT_START}', '{SEARCH_HIGHLIGHT_END}', '...', 32) AS snippet
+            FROM papers_fts
+            JOIN papers p ON p.rowid = papers_fts.rowid
+            LEFT JOIN paper_tags pt ON pt.paper_id = p.id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY score
+            LIMIT ? OFFSET ?
+        """
+        async with db.execute(sql, params + [limit, offset]) as cursor:
             async for row in cursor:
                 results.append({
-                    "paper": Paper(
-                        id=row['id'],
-                        title=row['title'],
-                        abstract=row['abstract'],
-                        published_date=row['published_date'] or "",
-                        hf_url=row['hf_url'],
-                        arxiv_url=row['arxiv_url'],
-                        pdf_url=row['pdf_url'],
-                        upvotes=row['upvotes'],
-                        authors=json.loads(row['authors_json']),
-                        content_hash=row['content_hash'] or "",
-                        appeared_date=row['appeared_date']
-                    ),
-                    "tags": PaperTags(
-                        paper_id=row['id'],
-                        month=month,
-                        primary_contribution_tag=row['primary_contribution_tag'] or "OTHER",
-                        secondary_contribution_tags=json.loads(row['secondary_contribution_tags_json'] or '[]'),
-                        task_tags=json.loads(row['task_tags_json'] or '[]'),
-                        modality_tags=json.loads(row['modality_tags_json'] or '[]'),
-                        research_question=row['research_question'] or "",
-                        confidence=row['confidence'] or 0.0,
-                        rationale=row['rationale'] or ""
-                    ) if row['primary_contribution_tag'] else None
+                    **_joined_row_to_item(row),
+                    "score": row['score'],
+                    "title_highlight": row['title_highlight'],
+                    "snippet": row['snippet'],
                 })
     return results
 
 
 # ============= Temporal Tracking Functions =============
 
+RECORD_UPVOTE_SNAPSHOT_SQL = """
+    INSERT INTO upvote_history (paper_id, date, upvotes)
+    VALUES (?, ?, ?)
+    ON CONFLICT(paper_id, date) DO UPDATE SET
+        upvotes = excluded.upvotes
+"""
+
+
 async def record_upvote_snapshot(paper_id: str, date: str, upvotes: int):
     """Record upvote count for a paper on a specific date."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute("""
-            INSERT INTO upvote_history (paper_id, date, upvotes)
-            VALUES (?, ?, ?)
-            ON CONFLICT(paper_id, date) DO UPDATE SET
-                upvotes = excluded.upvotes
-        """, (paper_id, date, upvotes))
-        await db.commit()
+    async with write_connection() as db:
+        await db.execute(RECORD_UPVOTE_SNAPSHOT_SQL, (paper_id, date, upvotes))
+        await _bump_data_versions(db, [])
+
+
+async def record_upvote_snapshots_many(snapshots: list[UpvoteSnapshot]):
+    """Record upvote counts for many papers in a single transaction."""
+    if not snapshots:
+        return
+    async with write_connection() as db:
+        await db.executemany(
+            RECORD_UPVOTE_SNAPSHOT_SQL,
+            [(s.paper_id, s.date, s.upvotes) for s in snapshots]
+        )
+        await _bump_data_versions(db, [])
 
 
 async def get_upvote_history(paper_id: str) -> list[UpvoteSnapshot]:
     """Get upvote history for a paper."""
     history = []
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute(
             "SELECT * FROM upvote_history WHERE paper_id = ? ORDER BY date",
             (paper_id,)
         ) as cursor:
             async for row in cursor:
-                history.append(UpvoteSnapshot(
-                    paper_id=row['paper_id'],
-                    date=row['date'],
-                    upvotes=row['upvotes']
-                ))
+                history.append(row_to_upvote_snapshot(row))
     return history
 
 
 async def get_papers_by_date(date: str) -> list[Paper]:
     """Get all papers that appeared on a specific date."""
     papers = []
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute(
             "SELECT * FROM papers WHERE appeared_date = ? ORDER BY upvotes DESC",
             (date,)
         ) as cursor:
             async for row in cursor:
-                papers.append(Paper(
-                    id=row['id'],
-                    title=row['title'],
-                    abstract=row['abstract'],
-                    published_date=row['published_date'] or "",
-                    hf_url=row['hf_url'],
-                    arxiv_url=row['arxiv_url'],
-                    pdf_url=row['pdf_url'],
-                    upvotes=row['upvotes'],
-                    authors=json.loads(row['authors_json']),
-                    content_hash=row['content_hash'] or "",
-                    appeared_date=row['appeared_date'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                ))
+                papers.append(row_to_paper(row))
     return papers
 
 
 async def get_papers_by_date_range(start_date: str, end_date: str) -> list[Paper]:
     """Get all papers that appeared between start_date and end_date (inclusive)."""
     papers = []
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute(
             """SELECT * FROM papers
                WHERE appeared_date >= ? AND appeared_date <= ?
@@ -471,27 +1649,13 @@ async def get_papers_by_date_range(start_date: str, end_date: str) -> list[Paper
             (start_date, end_date)
         ) as cursor:
             async for row in cursor:
-                papers.append(Paper(
-                    id=row['id'],
-                    title=row['title'],
-                    abstract=row['abstract'],
-                    published_date=row['published_date'] or "",
-                    hf_url=row['hf_url'],
-                    arxiv_url=row['arxiv_url'],
-                    pdf_url=row['pdf_url'],
-                    upvotes=row['upvotes'],
-                    authors=json.loads(row['authors_json']),
-                    content_hash=row['content_hash'] or "",
-                    appeared_date=row['appeared_date'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                ))
+                papers.append(row_to_paper(row))
     return papers
 
 
 async def save_daily_snapshot(snapshot: DailySnapshot):
     """Save a daily snapshot."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         await db.execute("""
             INSERT INTO daily_snapshots (date, total_papers, cluster_counts_json, top_paper_ids_json, new_paper_ids_json)
             VALUES (?, ?, ?, ?, ?)
@@ -507,34 +1671,26 @@ async def save_daily_snapshot(snapshot: DailySnapshot):
             json.dumps(snapshot.top_paper_ids),
             json.dumps(snapshot.new_paper_ids)
         ))
-        await db.commit()
+        await _bump_data_versions(db, [])
 
 
 async def get_daily_snapshot(date: str) -> Optional[DailySnapshot]:
     """Get daily snapshot for a specific date."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute(
             "SELECT * FROM daily_snapshots WHERE date = ?",
             (date,)
         ) as cursor:
             row = await cursor.fetchone()
             if row:
-                return DailySnapshot(
-                    date=row['date'],
-                    total_papers=row['total_papers'],
-                    cluster_counts=json.loads(row['cluster_counts_json']),
-                    top_paper_ids=json.loads(row['top_paper_ids_json']),
-                    new_paper_ids=json.loads(row['new_paper_ids_json'])
-                )
+                return row_to_daily_snapshot(row)
     return None
 
 
 async def get_daily_snapshots_range(start_date: str, end_date: str) -> list[DailySnapshot]:
     """Get all daily snapshots in a date range."""
     snapshots = []
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute(
             """SELECT * FROM daily_snapshots
                WHERE date >= ? AND date <= ?
@@ -542,56 +1698,47 @@ async def get_daily_snapshots_range(start_date: str, end_date: str) -> list[Dail
             (start_date, end_date)
         ) as cursor:
             async for row in cursor:
-                snapshots.append(DailySnapshot(
-                    date=row['date'],
-                    total_papers=row['total_papers'],
-                    cluster_counts=json.loads(row['cluster_counts_json']),
-                    top_paper_ids=json.loads(row['top_paper_ids_json']),
-                    new_paper_ids=json.loads(row['new_paper_ids_json'])
-                ))
+                snapshots.append(row_to_daily_snapshot(row))
     return snapshots
 
 
+PAPERS_WITH_TAGS_BY_DATE_RANGE_SQL = """
+    SELECT p.*, pt.primary_contribution_tag, pt.secondary_contribution_tags_json,
+           pt.task_tags_json, pt.modality_tags_json, pt.research_question,
+           pt.confidence, pt.rationale, pt.month
+    FROM papers p
+    LEFT JOIN paper_tags pt ON p.id = pt.paper_id
+    WHERE p.appeared_date >= ? AND p.appeared_date <= ?
+    ORDER BY p.appeared_date DESC, p.upvotes DESC
+"""
+
+
 async def get_papers_with_tags_by_date_range(start_date: str, end_date: str) -> list[dict]:
     """Get all papers with their tags for a date range."""
     results = []
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        query = """
-            SELECT p.*, pt.primary_contribution_tag, pt.secondary_contribution_tags_json,
-                   pt.task_tags_json, pt.modality_tags_json, pt.research_question,
-                   pt.confidence, pt.rationale, pt.month
-            FROM papers p
-            LEFT JOIN paper_tags pt ON p.id = pt.paper_id
-            WHERE p.appeared_date >= ? AND p.appeared_date <= ?
-            ORDER BY p.appeared_date DESC, p.upvotes DESC
-        """
-        async with db.execute(query, (start_date, end_date)) as cursor:
+    async with read_connection() as db:
+        async with db.execute(PAPERS_WITH_TAGS_BY_DATE_RANGE_SQL, (start_date, end_date)) as cursor:
             async for row in cursor:
-                results.append({
-                    "paper": Paper(
-                        id=row['id'],
-                        title=row['title'],
-                        abstract=row['abstract'],
-                        published_date=row['published_date'] or "",
-                        hf_url=row['hf_url'],
-                        arxiv_url=row['arxiv_url'],
-                        pdf_url=row['pdf_url'],
-                        upvotes=row['upvotes'],
-                        authors=json.loads(row['authors_json']),
-                        content_hash=row['content_hash'] or "",
-                        appeared_date=row['appeared_date']
-                    ),
-                    "tags": PaperTags(
-                        paper_id=row['id'],
-                        month=row['month'] or "",
-                        primary_contribution_tag=row['primary_contribution_tag'] or "OTHER",
-                        secondary_contribution_tags=json.loads(row['secondary_contribution_tags_json'] or '[]'),
-                        task_tags=json.loads(row['task_tags_json'] or '[]'),
-                        modality_tags=json.loads(row['modality_tags_json'] or '[]'),
-                        research_question=row['research_question'] or "",
-                        confidence=row['confidence'] or 0.0,
-                        rationale=row['rationale'] or ""
-                    ) if row['primary_contribution_tag'] else None
-                })
+                results.append(_joined_row_to_item(row))
     return results
+
+
+async def iter_papers_with_tags_by_date_range(
+    start_date: str,
+    end_date: str,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> AsyncIterator[list[dict]]:
+    """
+    Stream papers with their tags for a date range in chunks.
+
+    Same rows and order as get_papers_with_tags_by_date_range(), read from
+    an open cursor on a dedicated connection so memory stays bounded by
+    chunk_size however large the range is.
+
+    Yields:
+        Lists of up to chunk_size {"paper", "tags"} dicts
+    """
+    async with get_connection_manager().dedicated_read() as db:
+        async with db.execute(PAPERS_WITH_TAGS_BY_DATE_RANGE_SQL, (start_date, end_date)) as cursor:
+            while rows := await cursor.fetchmany(chunk_size):
+                yield [_joined_row_to_item(row) for row in rows]
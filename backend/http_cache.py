@@ -0,0 +1,206 @@
+"""
+On-disk HTTP cache for scraper requests to huggingface.co.
+
+Bodies are stored content-addressed (named by their SHA-256), so pages that
+did not change between crawls, or the same payload served under several
+URLs, are written once. Each URL has a small JSON entry pointing at its
+body together with the ETag and Last-Modified validators it was served
+with.
+
+An entry younger than its URL class's TTL is served without a request.
+Older entries are revalidated with If-None-Match / If-Modified-Since; a 304
+refreshes the entry and the stored body is reused. Paper pages rarely
+change, so they stay fresh for much longer than listings.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+# Cache location and freshness from environment
+HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+HTTP_CACHE_DIR = Path(os.environ.get("HTTP_CACHE_DIR", Path(__file__).parent / ".http_cache"))
+HTTP_CACHE_PAPER_TTL = float(os.environ.get("HTTP_CACHE_PAPER_TTL", str(7 * 24 * 3600)))  # Seconds
+HTTP_CACHE_LISTING_TTL = float(os.environ.get("HTTP_CACHE_LISTING_TTL", "3600"))  # Seconds
+
+PAPER_PAGE_PATH = re.compile(r'^/papers/\d{4}\.\d{4,5}$')
+
+
+def url_class(url: str) -> str:
+    """Classify a URL for its TTL: "paper" for paper pages, "listing" for everything else."""
+    return "paper" if PAPER_PAGE_PATH.match(urlsplit(url).path) else "listing"
+
+
+def default_ttls() -> dict[str, float]:
+    return {"paper": HTTP_CACHE_PAPER_TTL, "listing": HTTP_CACHE_LISTING_TTL}
+
+
+class HttpCacheEntry(NamedTuple):
+    """Validators and body reference stored for one URL."""
+    url: str
+    body_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    stored_at: float  # Wall-clock time of the last download or 304
+    fetch_seconds: float  # How long the full download took
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers that make the server answer 304 if the page is unchanged."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cached_response(entry: HttpCacheEntry, body: bytes) -> httpx.Response:
+    """Rebuild a 200 response from a cache entry and its body."""
+    headers = {"Content-Type": entry.content_type} if entry.content_type else {}
+    return httpx.Response(200, content=body, headers=headers, request=httpx.Request("GET", entry.url))
+
+
+class HttpCache:
+    """
+    Content-addressed page cache with per-URL-class TTLs.
+
+    Methods do blocking file I/O; async callers run them in a thread.
+    Counters: `hits` were served from disk, `revalidated` got a 304,
+    `misses` were downloaded in full. `bytes_saved` and `seconds_saved`
+    estimate what the first two avoided, using the size and download time
+    recorded when each page was last fetched in full.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttls: Optional[dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            directory: Cache root (HTTP_CACHE_DIR by default)
+            ttls: Seconds an entry is served without revalidation, by url_class()
+            clock: Wall-clock time source (entries outlive the process)
+        """
+        self.directory = Path(directory or HTTP_CACHE_DIR)
+        self.ttls = ttls or default_ttls()
+        self._clock = clock
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.seconds_saved = 0.0
+
+    def _entry_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / "entries" / key[:2] / f"{key}.json"
+
+    def _body_path(self, body_hash: str) -> Path:
+        return self.directory / "bodies" / body_hash[:2] / body_hash
+
+    def _write(self, path: Path, data: bytes):
+        """Write atomically so concurrent crawls never read a partial file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def lookup(self, url: str) -> Optional[tuple[HttpCacheEntry, bytes]]:
+        """The stored entry and body for a URL, or None if absent or unreadable."""
+        try:
+            entry = HttpCacheEntry(**json.loads(self._entry_path(url).read_bytes()))
+            return entry, self._body_path(entry.body_hash).read_bytes()
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def is_fresh(self, entry: HttpCacheEntry) -> bool:
+        """Whether an entry may be served without asking the server."""
+        return self._clock() - entry.stored_at < self.ttls.get(url_class(entry.url), 0.0)
+
+    def _save(self, entry: HttpCacheEntry):
+        self._write(self._entry_path(entry.url), json.dumps(entry._asdict()).encode())
+
+    def store(self, url: str, response: httpx.Response, fetch_seconds: float) -> Optional[HttpCacheEntry]:
+        """
+        Save a full 200 response.
+
+        Returns the new entry, or None if it could not be written (the
+        crawl goes on uncached).
+        """
+        self.misses += 1
+        body = response.content
+        body_hash = hashlib.sha256(body).hexdigest()
+        entry = HttpCacheEntry(
+            url=url,
+            body_hash=body_hash,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            content_type=response.headers.get("content-type"),
+            stored_at=self._clock(),
+            fetch_seconds=fetch_seconds,
+        )
+        try:
+            body_path = self._body_path(body_hash)
+            if not body_path.exists():  # Same content, same file
+                self._write(body_path, body)
+            self._save(entry)
+        except OSError as e:
+            print(f"HTTP cache write failed for {url}: {e}")
+            return None
+        return entry
+
+    def record_hit(self, entry: HttpCacheEntry, body: bytes):
+        """Count a page served from disk without a request."""
+        self.hits += 1
+        self.bytes_saved += len(body)
+        self.seconds_saved += entry.fetch_seconds
+
+    def refresh(
+        self, entry: HttpCacheEntry, body: bytes, response: httpx.Response, elapsed: float
+    ) -> HttpCacheEntry:
+        """Handle a 304: restart the entry's TTL and take any new validators."""
+        self.revalidated += 1
+        self.bytes_saved += len(body)
+        self.seconds_saved += max(0.0, entry.fetch_seconds - elapsed)
+        entry = entry._replace(
+            etag=response.headers.get("etag") or entry.etag,
+            last_modified=response.headers.get("last-modified") or entry.last_modified,
+            stored_at=self._clock(),
+        )
+        try:
+            self._save(entry)
+        except OSError as e:
+            print(f"HTTP cache write failed for {entry.url}: {e}")
+        return entry
+
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "seconds_saved": round(self.seconds_saved, 3),
+        }
+
+    def summary(self) -> str:
+        """One-line report of the counters."""
+        return (
+            f"HTTP cache: {self.hits} hits, {self.revalidated} not modified, {self.misses} misses; "
+            f"saved {self.bytes_saved / 1e6:.1f} MB and ~{self.seconds_saved:.1f}s"
+        )
+
+
+def default_http_cache() -> Optional[HttpCache]:
+    """The cache scraper sessions use by default, or None if HTTP_CACHE_ENABLED is off."""
+    return HttpCache() if HTTP_CACHE_ENABLED else None
@@ -277,14 +277,16 @@ ArXiv ID: {paper.id}"""
                 modality_tags=modality,
                 research_question=tags_data.get("research_question", ""),
                 confidence=float(tags_data.get("confidence", 0.5)),
-                rationale=tags_data.get("rationale", "")
+                rationale=tags_data.get("rationale", ""),
+                content_hash=paper.content_hash,
+                taxonomy_version=taxonomy.version
             )
     except LLMError as e:
         print(f"LLM tagging failed for {paper.id}: {e}")
     except Exception as e:
         print(f"LLM tagging failed for {paper.id}: {e}")
 
-    # Return default tags on failure
+    # Return default tags on failure (no provenance, so the paper is retried)
     return PaperTags(
         paper_id=paper.id,
         month=taxonomy.month,
@@ -702,5 +704,7 @@ def tag_paper_heuristic(paper: Paper, taxonomy: Taxonomy) -> PaperTags:
         modality_tags=modality_tags,
         research_question="",
         confidence=0.7,  # Slightly higher confidence with better keywords
-        rationale="Heuristic tagging with comprehensive keywords from HF papers analysis"
+        rationale="Heuristic tagging with comprehensive keywords from HF papers analysis",
+        content_hash=paper.content_hash,
+        taxonomy_version=taxonomy.version
     )
@@ -7,25 +7,43 @@ import os
 import re
 import json
 import asyncio
-from typing import Optional
+import csv
+import hashlib
+import io
+from typing import AsyncIterator, Literal, Optional
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from collections import defaultdict
 
 from database import (
-    init_database,
-    upsert_paper, get_paper, get_all_papers,
+    init_database, open_database, close_database,
+    upsert_paper, upsert_papers_many, get_paper, get_all_papers,
     save_taxonomy, get_taxonomy,
-    save_paper_tags, get_paper_tags, get_all_paper_tags_for_month,
+    save_paper_tags, save_paper_tags_many, get_paper_tags, get_all_paper_tags_for_month,
+    get_papers_needing_tags,
     get_papers_with_tags_for_month,
+    count_papers_for_month, get_cluster_facets_for_month,
+    search_papers,
+    PaperQuery, query_paper_cards, get_cluster_names_for_month, get_cluster_names_for_date,
+    count_papers_by_date, get_month_index,
+    get_paper_cards_by_ids, get_papers_with_tags_by_ids,
     get_papers_by_date, get_papers_by_date_range,
+    iter_papers_with_tags_by_date_range,
     get_upvote_history,
+    get_data_versions, GLOBAL_SCOPE, encode_cursor,
+    BULK_WRITE_BATCH_SIZE,
     Paper, Taxonomy, PaperTags
 )
-from scraper import scrape_month, scrape_daily, scrape_date_range, fetch_month_paper_ids, fetch_paper_details
+from cache import ResponseCache, make_cache_key
+from compression import CompressionMiddleware, choose_encoding, encoded_etag, precompress, strip_etag_encoding
+from serialization import FastResponse, MEDIA_TYPES, encode, negotiate_format, response_format
+from scraper import (
+    scrape_month, scrape_daily, scrape_date_range, fetch_month_paper_ids, fetch_paper_details,
+    open_scraper_session, close_scraper_session
+)
 from aggregation import (
     compute_daily_stats, compute_weekly_stats, compute_flow_data,
     compute_trend_data, save_daily_snapshot_for_date,
@@ -51,18 +69,25 @@ from emerging import (
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    await open_database()
     await init_database()
     print("Database initialized")
+    # One pooled HTTP client for every scrape the app runs
+    await open_scraper_session()
     yield
     # Shutdown
     print("Shutting down")
+    await close_scraper_session()
+    await close_database()
 
 
 app = FastAPI(
     title="HF Papers Explorer API",
     description="API for exploring Hugging Face Papers of the Month",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastResponse,
+    dependencies=[Depends(negotiate_format)]
 )
 
 # CORS middleware for frontend
@@ -72,8 +97,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Cache", "ETag"],
 )
 
+# gzip/brotli for large responses; cached ones arrive precompressed
+app.add_middleware(CompressionMiddleware)
+
 
 # ============= Response Models =============
 
@@ -114,6 +143,14 @@ class MonthSummary(BaseModel):
     taxonomy: Optional[dict] = None
 
 
+class SearchResult(BaseModel):
+    """A ranked full-text search hit."""
+    paper: PaperCard
+    score: float  # BM25 score, lower is better
+    titleHighlight: str  # Title with matched terms wrapped in <mark>
+    snippet: str  # Abstract excerpt around the best match
+
+
 class ClusterNode(BaseModel):
     """Node in the cluster graph."""
     id: str
@@ -138,6 +175,47 @@ class ClusterGraph(BaseModel):
     links: list[ClusterLink]
 
 
+class MonthBundle(BaseModel):
+    """Month payloads built from one load; sections not requested are null."""
+    month: str
+    summary: Optional[MonthSummary] = None
+    clusters: Optional[list[ClusterInfo]] = None
+    graph: Optional[ClusterGraph] = None
+    papers: Optional[list[PaperCard]] = None
+    nextCursor: Optional[str] = None  # Continue the papers section via /papers?cursor=
+
+
+# Most ids one POST /api/papers/batch request may resolve
+PAPER_BATCH_MAX_IDS = 500
+
+
+class PaperBatchRequest(BaseModel):
+    """Paper ids to resolve in one request, as cards or full details."""
+    ids: list[str] = Field(..., min_length=1, max_length=PAPER_BATCH_MAX_IDS)
+    view: Literal["card", "detail"] = "card"
+
+
+class MonthInfo(BaseModel):
+    """An indexed month in the month picker."""
+    month: str
+    paperCount: int  # Papers that appeared in or are tagged for the month
+    taggedCount: int
+    lastUpdated: Optional[str] = None
+
+
+class MonthIndex(BaseModel):
+    """Months with papers, newest first."""
+    months: list[MonthInfo]
+
+
+class DailyPapers(BaseModel):
+    """One page of papers that appeared on a date."""
+    date: str
+    total_papers: int  # All papers of the day, before filters
+    papers: list[PaperCard]
+    nextCursor: Optional[str] = None
+
+
 # ============= Helper Functions =============
 
 def paper_to_card(paper: Paper, tags: Optional[PaperTags]) -> PaperCard:
@@ -165,6 +243,28 @@ def paper_to_card(paper: Paper, tags: Optional[PaperTags]) -> PaperCard:
     )
 
 
+def card_row_to_card(card: dict) -> PaperCard:
+    """Convert a narrow card row from query_paper_cards to a PaperCard."""
+    return PaperCard(
+        paperId=card["id"],
+        title=card["title"],
+        abstractSnippet=card["abstract_snippet"],
+        publishedDate=card["published_date"],
+        upvotes=card["upvotes"],
+        authorsShort=card["authors_short"],
+        primaryTag=card["primary_contribution_tag"],
+        secondaryTags=card["secondary_contribution_tags"],
+        taskTags=card["task_tags"],
+        modality=card["modality_tags"] if card["has_tags"] else ["text"],
+        hfUrl=card["hf_url"],
+        pdfUrl=card["pdf_url"] or f"https://arxiv.org/pdf/{card['id']}.pdf",
+        arxivUrl=card["arxiv_url"] or f"https://arxiv.org/abs/{card['id']}",
+        researchQuestion=card["research_question"],
+        confidence=card["confidence"],
+        rationale=card["rationale"]
+    )
+
+
 def slugify(text: str) -> str:
     """Convert text to URL-friendly slug."""
     text = text.lower()
@@ -173,37 +273,140 @@ def slugify(text: str) -> str:
     return text.strip('-')
 
 
-def build_clusters(papers_with_tags: list[dict]) -> list[ClusterInfo]:
-    """Build cluster information from papers with tags."""
-    clusters_data = defaultdict(lambda: {
-        "papers": [],
-        "task_tags": defaultdict(int),
-        "modalities": defaultdict(int)
-    })
-    
-    for item in papers_with_tags:
-        tags = item.get("tags")
-        if not tags:
-            continue
-        
-        primary_tag = tags.primary_contribution_tag
-        clusters_data[primary_tag]["papers"].append(item)
-        
-        for task in tags.task_tags:
-            clusters_data[primary_tag]["task_tags"][task] += 1
-        
-        for mod in tags.modality_tags:
-            clusters_data[primary_tag]["modalities"][mod] += 1
-    
+async def resolve_cluster_names(month: str, cluster_id: str) -> list[str]:
+    """Find the cluster names of a month whose slug matches cluster_id."""
+    names = await get_cluster_names_for_month(month)
+    return [name for name in names if slugify(name) == cluster_id]
+
+
+async def fetch_paper_cards(query: PaperQuery) -> tuple[list[PaperCard], dict[str, str]]:
+    """Run a paper listing query; the next keyset cursor is returned as a header."""
+    try:
+        cards, next_cursor = await query_paper_cards(query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return [card_row_to_card(card) for card in cards], headers
+
+
+# ============= Conditional Requests =============
+
+def make_etag(endpoint: str, versions: dict[str, int], **params) -> str:
+    """
+    Strong ETag for an endpoint response.
+
+    Derived from the data versions the endpoint reads and the parameters
+    that change its output, so it changes whenever the body could.
+    """
+    key = (app.version, make_cache_key(endpoint, **params), sorted(versions.items()))
+    return '"' + hashlib.sha256(repr(key).encode()).hexdigest()[:32] + '"'
+
+
+def matching_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    The If-None-Match entry that matches an ETag (weak comparison), if any.
+
+    Encoded variants ("...-gzip") match their base ETag; the client's own tag
+    is returned so a 304 names the representation it already holds.
+    """
+    if not if_none_match:
+        return None
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        if tag == "*" or strip_etag_encoding(tag) == etag:
+            return etag if tag == "*" else tag
+    return None
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept, Accept-Encoding"}
+    )
+
+
+async def conditional_response(request: Request, endpoint: str, scopes: list[str], compute, **params) -> Response:
+    """
+    Serve an endpoint with an ETag, answering If-None-Match with 304.
+
+    The data versions are read before `compute` runs, so a matching request
+    skips the endpoint's queries entirely.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        endpoint: Endpoint name for the ETag
+        scopes: Data version scopes the endpoint reads
+        compute: Coroutine function returning the response content
+        **params: Query parameters that change the response
+    """
+    etag = make_etag(endpoint, await get_data_versions(scopes), format=response_format.get(), **params)
+    if matched := matching_etag(request.headers.get("if-none-match"), etag):
+        return not_modified(matched)
+    return FastResponse(await compute(), headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+# ============= Response Cache =============
+
+response_cache = ResponseCache(precompress=precompress)
+
+
+async def cached_response(request: Request, endpoint: str, scope: str, compute, **params) -> Response:
+    """
+    Serve an endpoint through response_cache.
+
+    Entries are invalidated by the scope's data version, which the database
+    write functions bump. The version also yields the response ETag, so
+    matching If-None-Match requests get a 304 without touching the cache.
+    Entries carry gzip/brotli variants built once with the body, so hot
+    responses are not recompressed per request.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        endpoint: Endpoint name for the cache key
+        scope: Data version scope the endpoint reads (a month or GLOBAL_SCOPE)
+        compute: Coroutine function returning (content, headers)
+        **params: Query parameters that change the response
+    """
+    fmt = response_format.get()
+    version = (await get_data_versions([scope]))[scope]
+    etag = make_etag(endpoint, {scope: version}, format=fmt, **params)
+    if matched := matching_etag(request.headers.get("if-none-match"), etag):
+        return not_modified(matched)
+
+    async def build():
+        content, headers = await compute()
+        return encode(content, fmt), {**headers, "ETag": etag}
+
+    # A stale entry keeps the ETag it was built with, so clients revalidate again
+    entry, status = await response_cache.get_or_compute(
+        make_cache_key(endpoint, format=fmt, **params), version, build
+    )
+    headers = {**entry.headers, "X-Cache": status, "Cache-Control": "no-cache", "Vary": "Accept, Accept-Encoding"}
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding in entry.encoded:
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = encoded_etag(headers["ETag"], encoding)
+        return Response(entry.encoded[encoding], media_type=MEDIA_TYPES[fmt], headers=headers)
+    return Response(entry.body, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+async def cached_month_response(request: Request, endpoint: str, month: str, compute, **params) -> Response:
+    """Serve a month-scoped endpoint through cached_response."""
+    return await cached_response(request, endpoint, month, compute, month=month, **params)
+
+
+def build_clusters(cluster_facets: dict[str, dict]) -> list[ClusterInfo]:
+    """Build cluster information from per-cluster facet counts."""
     clusters = []
-    for tag_name, data in clusters_data.items():
+    for tag_name, data in cluster_facets.items():
         top_tasks = sorted(data["task_tags"].items(), key=lambda x: -x[1])[:5]
-        top_mods = sorted(data["modalities"].items(), key=lambda x: -x[1])[:3]
-        
+        top_mods = sorted(data["modality_tags"].items(), key=lambda x: -x[1])[:3]
+
         clusters.append(ClusterInfo(
             clusterId=slugify(tag_name),
             name=tag_name,
-            paperCount=len(data["papers"]),
+            paperCount=data["paper_count"],
             topTaskTags=[t[0] for t in top_tasks],
             topModalities=[m[0] for m in top_mods]
         ))
@@ -213,113 +416,210 @@ def build_clusters(papers_with_tags: list[dict]) -> list[ClusterInfo]:
     return clusters
 
 
+def build_month_summary(month: str, total_papers: int, clusters: list[ClusterInfo], taxonomy: Optional[Taxonomy]) -> MonthSummary:
+    """Assemble a month summary, falling back to the default taxonomy."""
+    return MonthSummary(
+        month=month,
+        totalPapers=total_papers,
+        clusters=clusters,
+        taxonomy={
+            "contribution_tags": taxonomy.contribution_tags if taxonomy else DEFAULT_CONTRIBUTION_TAGS,
+            "task_tags": taxonomy.task_tags if taxonomy else DEFAULT_TASK_TAGS,
+            "modality_tags": taxonomy.modality_tags if taxonomy else DEFAULT_MODALITY_TAGS,
+            "definitions": taxonomy.definitions if taxonomy else {}
+        }
+    )
+
+
+def build_cluster_facets(papers_with_tags: list[dict]) -> dict[str, dict]:
+    """
+    Per-cluster facet counts from already loaded papers.
+
+    Same shape and ordering as get_cluster_facets_for_month(): clusters by
+    name, each tag counted once per paper, most frequent first, ties by tag name.
+    """
+    counts = defaultdict(lambda: {"paper_count": 0, "task_tags": defaultdict(int), "modality_tags": defaultdict(int)})
+    for item in papers_with_tags:
+        tags = item.get("tags")
+        if not tags or not tags.primary_contribution_tag:
+            continue
+        facets = counts[tags.primary_contribution_tag]
+        facets["paper_count"] += 1
+        for task in set(tags.task_tags):
+            facets["task_tags"][task] += 1
+        for mod in set(tags.modality_tags):
+            facets["modality_tags"][mod] += 1
+
+    return {
+        cluster: {
+            "paper_count": facets["paper_count"],
+            "task_tags": dict(sorted(facets["task_tags"].items(), key=lambda x: (-x[1], x[0]))),
+            "modality_tags": dict(sorted(facets["modality_tags"].items(), key=lambda x: (-x[1], x[0]))),
+        }
+        for cluster, facets in sorted(counts.items())
+    }
+
+
+# Sort values of loaded {"paper", "tags"} items, matching database.PAPER_SORT_KEYS
+ITEM_SORT_KEYS = {
+    "upvotes": lambda item: item["paper"].upvotes,
+    "date": lambda item: item["paper"].published_date or "",
+    "confidence": lambda item: (item["tags"].confidence or 0.0) if item["tags"] else 0.0,
+}
+
+
+def first_page_cards(papers_with_tags: list[dict], sort_by: str, limit: int) -> tuple[list[PaperCard], Optional[str]]:
+    """
+    First page of cards from already loaded papers, in the same order as the
+    /papers listing, plus the keyset cursor for the next page.
+    """
+    sort_value = ITEM_SORT_KEYS[sort_by]
+    ordered = sorted(papers_with_tags, key=lambda item: (sort_value(item), item["paper"].id), reverse=True)
+
+    page = ordered[:limit]
+    next_cursor = None
+    if len(ordered) > limit and page:
+        last = page[-1]
+        next_cursor = encode_cursor(sort_by, sort_value(last), last["paper"].id)
+    return [paper_to_card(item["paper"], item["tags"]) for item in page], next_cursor
+
+
+# Paper IDs listed per link
+MAX_SHARED_PAPER_IDS = 10
+
+
 def build_cluster_graph(papers_with_tags: list[dict]) -> ClusterGraph:
-    """Build cluster graph with nodes and connections based on shared papers."""
-    # Build cluster nodes with paper IDs
-    clusters_data = defaultdict(lambda: {
-        "papers": [],
-        "paper_ids": set(),
-        "task_tags": defaultdict(int),
-        "modalities": defaultdict(int)
-    })
-    
-    # Also track papers by their task tags for finding connections
-    task_to_papers = defaultdict(set)
-    paper_to_clusters = defaultdict(set)
-    
+    """
+    Build cluster graph with nodes and connections based on shared papers.
+
+    Clusters are the papers' primary contribution tags. Two clusters A and B
+    (A first seen before B) are linked with strength
+
+        |papers of A or B listing the other as a secondary tag
+         ∪ papers of A sharing a task tag with any paper of B| + |common task tags|
+
+    Instead of comparing every pair of clusters, each paper's partner
+    clusters are derived once and accumulated into sparse pair counts.
+    Papers with the same primary tag, task tags and secondary tags have the
+    same partners, so partners are computed once per such signature.
+    """
+    # Cluster index in order of first appearance, which fixes link direction
+    cluster_index: dict[str, int] = {}
+    cluster_papers: list[list[dict]] = []
+    task_counts: list[dict[str, int]] = []
+    modality_counts: list[dict[str, int]] = []
+    signatures: dict[tuple, list[str]] = defaultdict(list)
+
     for item in papers_with_tags:
         tags = item.get("tags")
         paper = item.get("paper")
         if not tags or not paper:
             continue
-        
+
         primary_tag = tags.primary_contribution_tag
-        paper_id = paper.id
-        
-        clusters_data[primary_tag]["papers"].append(item)
-        clusters_data[primary_tag]["paper_ids"].add(paper_id)
-        paper_to_clusters[paper_id].add(primary_tag)
-        
+        index = cluster_index.get(primary_tag)
+        if index is None:
+            index = cluster_index[primary_tag] = len(cluster_index)
+            cluster_papers.append([])
+            task_counts.append(defaultdict(int))
+            modality_counts.append(defaultdict(int))
+
+        cluster_papers[index].append(item)
         for task in tags.task_tags:
-            clusters_data[primary_tag]["task_tags"][task] += 1
-            task_to_papers[task].add(paper_id)
-        
+            task_counts[index][task] += 1
         for mod in tags.modality_tags:
-            clusters_data[primary_tag]["modalities"][mod] += 1
-        
-        # Also consider secondary contribution tags for connections
-        for secondary_tag in tags.secondary_contribution_tags:
-            paper_to_clusters[paper_id].add(secondary_tag)
-    
+            modality_counts[index][mod] += 1
+
+        signature = (index, frozenset(tags.task_tags), frozenset(tags.secondary_contribution_tags))
+        signatures[signature].append(paper.id)
+
     # Build nodes
+    names = list(cluster_index)
     nodes = []
-    for tag_name, data in clusters_data.items():
-        top_tasks = sorted(data["task_tags"].items(), key=lambda x: -x[1])[:5]
-        top_mods = sorted(data["modalities"].items(), key=lambda x: -x[1])[:3]
-        
+    for index, tag_name in enumerate(names):
+        top_tasks = sorted(task_counts[index].items(), key=lambda x: -x[1])[:5]
+        top_mods = sorted(modality_counts[index].items(), key=lambda x: -x[1])[:3]
+
         nodes.append(ClusterNode(
             id=slugify(tag_name),
             name=tag_name,
-            paperCount=len(data["papers"]),
+            paperCount=len(cluster_papers[index]),
             topTaskTags=[t[0] for t in top_tasks],
             topModalities=[m[0] for m in top_mods],
-            paperIds=list(data["paper_ids"])
+            paperIds=list(dict.fromkeys(item["paper"].id for item in cluster_papers[index]))
         ))
-    
+
     # Sort nodes by paper count
     nodes.sort(key=lambda n: -n.paperCount)
-    
-    # Build links based on shared task tags and secondary contribution tags
+
+    # Clusters whose papers use each task tag, as bitmasks over cluster indexes
+    task_clusters: dict[str, int] = defaultdict(int)
+    for index, tasks in enumerate(task_counts):
+        for task in tasks:
+            task_clusters[task] |= 1 << index
+
+    # Common task tags per cluster pair
+    common_tasks: dict[tuple[int, int], int] = defaultdict(int)
+    for mask in task_clusters.values():
+        members = _mask_indexes(mask)
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                common_tasks[(first, second)] += 1
+
+    # Partner clusters of each paper: a paper of cluster A is shared with B when
+    # B is one of its secondary tags, or B comes after A and has papers with
+    # one of its task tags
+    partner_groups: dict[tuple[int, int], list[str]] = defaultdict(list)
+    for (index, tasks, secondary_tags), paper_ids in signatures.items():
+        partners = 0
+        for task in tasks:
+            partners |= task_clusters[task]
+        partners &= ~((2 << index) - 1)  # Task overlap only counts towards later clusters
+        for tag in secondary_tags:
+            partner = cluster_index.get(tag)
+            if partner is not None and partner != index:
+                partners |= 1 << partner
+        partner_groups[(index, partners)].extend(paper_ids)
+
+    # Shared papers per cluster pair
+    shared_counts: dict[tuple[int, int], int] = defaultdict(int)
+    shared_ids: dict[tuple[int, int], list[str]] = defaultdict(list)
+    for (index, partners), paper_ids in partner_groups.items():
+        for partner in _mask_indexes(partners):
+            pair = (index, partner) if index < partner else (partner, index)
+            shared_counts[pair] += len(paper_ids)
+            ids = shared_ids[pair]
+            if len(ids) < MAX_SHARED_PAPER_IDS:
+                ids.extend(paper_ids[:MAX_SHARED_PAPER_IDS - len(ids)])
+
+    # Connection strength based on shared papers + shared tasks; ties keep pair order
+    slugs = [slugify(name) for name in names]
     links = []
-    cluster_names = list(clusters_data.keys())
-    
-    for i, cluster1 in enumerate(cluster_names):
-        for cluster2 in cluster_names[i+1:]:
-            # Find shared papers (papers that have both clusters in their tags)
-            shared_paper_ids = set()
-            
-            # Check papers in cluster1 that also reference cluster2
-            for paper_id in clusters_data[cluster1]["paper_ids"]:
-                if cluster2 in paper_to_clusters[paper_id]:
-                    shared_paper_ids.add(paper_id)
-            
-            # Check papers in cluster2 that also reference cluster1
-            for paper_id in clusters_data[cluster2]["paper_ids"]:
-                if cluster1 in paper_to_clusters[paper_id]:
-                    shared_paper_ids.add(paper_id)
-            
-            # Also find papers that share task tags between clusters
-            cluster1_tasks = set(clusters_data[cluster1]["task_tags"].keys())
-            cluster2_tasks = set(clusters_data[cluster2]["task_tags"].keys())
-            common_tasks = cluster1_tasks & cluster2_tasks
-            
-            for task in common_tasks:
-                task_papers = task_to_papers[task]
-                cluster1_papers = clusters_data[cluster1]["paper_ids"]
-                cluster2_papers = clusters_data[cluster2]["paper_ids"]
-                
-                # Papers from cluster1 sharing task with cluster2
-                for pid in cluster1_papers & task_papers:
-                    if clusters_data[cluster2]["paper_ids"] & task_papers:
-                        shared_paper_ids.add(pid)
-            
-            if shared_paper_ids or common_tasks:
-                # Connection strength based on shared tasks + secondary tags
-                strength = len(shared_paper_ids) + len(common_tasks)
-                if strength > 0:
-                    links.append(ClusterLink(
-                        source=slugify(cluster1),
-                        target=slugify(cluster2),
-                        sharedCount=strength,
-                        sharedPaperIds=list(shared_paper_ids)[:10]  # Limit for performance
-                    ))
-    
+    for pair in sorted(shared_counts.keys() | common_tasks.keys()):
+        strength = shared_counts.get(pair, 0) + common_tasks.get(pair, 0)
+        links.append(ClusterLink(
+            source=slugs[pair[0]],
+            target=slugs[pair[1]],
+            sharedCount=strength,
+            sharedPaperIds=shared_ids.get(pair, [])
+        ))
+
     # Sort links by strength
     links.sort(key=lambda l: -l.sharedCount)
-    
+
     return ClusterGraph(nodes=nodes, links=links)
 
 
+def _mask_indexes(mask: int) -> list[int]:
+    """Positions of the set bits in a bitmask, lowest first."""
+    indexes = []
+    while mask:
+        low = mask & -mask
+        indexes.append(low.bit_length() - 1)
+        mask ^= low
+    return indexes
+
+
 # ============= API Endpoints =============
 
 @app.get("/")
@@ -330,6 +630,7 @@ async def root():
 
 @app.get("/api/months/{month}/papers", response_model=list[PaperCard])
 async def get_month_papers(
+    request: Request,
     month: str,
     cluster: Optional[str] = None,
     task: Optional[str] = None,
@@ -337,7 +638,8 @@ async def get_month_papers(
     search: Optional[str] = None,
     sort_by: str = Query("upvotes", enum=["upvotes", "date", "confidence"]),
     limit: int = Query(100, le=500),
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = Query(None, description="Keyset cursor from X-Next-Cursor")
 ):
     """
     Get all papers for a month with optional filtering.
@@ -348,140 +650,173 @@ async def get_month_papers(
     - **modality**: Filter by modality
     - **search**: Search in title/abstract
     - **sort_by**: Sort by upvotes, date, or confidence
+    - **cursor**: Continue after the previous page (see the X-Next-Cursor header)
     """
-    papers_with_tags = await get_papers_with_tags_for_month(month)
-    
-    if not papers_with_tags:
-        return []
-    
-    # Apply filters
-    filtered = []
-    for item in papers_with_tags:
-        paper = item["paper"]
-        tags = item["tags"]
-        
-        # Cluster filter
-        if cluster and tags:
-            if slugify(tags.primary_contribution_tag) != cluster:
-                continue
-        
-        # Task filter
-        if task and tags:
-            if task not in tags.task_tags:
-                continue
-        
-        # Modality filter
-        if modality and tags:
-            if modality not in tags.modality_tags:
-                continue
-        
-        # Search filter
-        if search:
-            search_lower = search.lower()
-            if search_lower not in paper.title.lower() and search_lower not in paper.abstract.lower():
-                continue
-        
-        filtered.append(item)
-    
-    # Sort
-    if sort_by == "upvotes":
-        filtered.sort(key=lambda x: -x["paper"].upvotes)
-    elif sort_by == "date":
-        filtered.sort(key=lambda x: x["paper"].published_date, reverse=True)
-    elif sort_by == "confidence":
-        filtered.sort(key=lambda x: -(x["tags"].confidence if x["tags"] else 0))
-    
-    # Pagination
-    paginated = filtered[offset:offset + limit]
-    
-    # Convert to cards
-    cards = [paper_to_card(item["paper"], item["tags"]) for item in paginated]
-    return cards
+    async def compute():
+        clusters = await resolve_cluster_names(month, cluster) if cluster else None
+        if clusters == []:
+            return [], {}
+        return await fetch_paper_cards(PaperQuery(
+            month=month, clusters=clusters, task=task, modality=modality, search=search,
+            sort_by=sort_by, limit=limit, offset=offset, cursor=cursor
+        ))
+
+    return await cached_month_response(
+        request, "month_papers", month, compute,
+        cluster=cluster, task=task, modality=modality, search=search,
+        sort_by=sort_by, limit=limit, offset=offset, cursor=cursor
+    )
 
 
 @app.get("/api/months/{month}/clusters", response_model=list[ClusterInfo])
-async def get_month_clusters(month: str):
+async def get_month_clusters(request: Request, month: str):
     """Get cluster summaries for a month."""
-    papers_with_tags = await get_papers_with_tags_for_month(month)
-    
-    if not papers_with_tags:
-        return []
-    
-    return build_clusters(papers_with_tags)
+    async def compute():
+        cluster_facets = await get_cluster_facets_for_month(month)
+        return build_clusters(cluster_facets), {}
+
+    return await cached_month_response(request, "month_clusters", month, compute)
 
 
 @app.get("/api/months/{month}/cluster-graph", response_model=ClusterGraph)
-async def get_cluster_graph(month: str):
+async def get_cluster_graph(request: Request, month: str):
     """Get cluster graph with nodes and connections for visualization."""
-    papers_with_tags = await get_papers_with_tags_for_month(month)
-    
-    if not papers_with_tags:
-        return ClusterGraph(nodes=[], links=[])
-    
-    return build_cluster_graph(papers_with_tags)
+    async def compute():
+        papers_with_tags = await get_papers_with_tags_for_month(month)
+
+        if not papers_with_tags:
+            return ClusterGraph(nodes=[], links=[]), {}
+
+        return build_cluster_graph(papers_with_tags), {}
+
+    return await cached_month_response(request, "month_cluster_graph", month, compute)
 
 
 @app.get("/api/months/{month}/summary", response_model=MonthSummary)
-async def get_month_summary(month: str):
+async def get_month_summary(request: Request, month: str):
     """Get full summary for a month including taxonomy."""
-    papers_with_tags = await get_papers_with_tags_for_month(month)
-    taxonomy = await get_taxonomy(month)
-    
-    clusters = build_clusters(papers_with_tags) if papers_with_tags else []
-    
-    return MonthSummary(
-        month=month,
-        totalPapers=len(papers_with_tags),
-        clusters=clusters,
-        taxonomy={
-            "contribution_tags": taxonomy.contribution_tags if taxonomy else DEFAULT_CONTRIBUTION_TAGS,
-            "task_tags": taxonomy.task_tags if taxonomy else DEFAULT_TASK_TAGS,
-            "modality_tags": taxonomy.modality_tags if taxonomy else DEFAULT_MODALITY_TAGS,
-            "definitions": taxonomy.definitions if taxonomy else {}
-        }
+    async def compute():
+        total_papers = await count_papers_for_month(month)
+        cluster_facets = await get_cluster_facets_for_month(month)
+        taxonomy = await get_taxonomy(month)
+
+        clusters = build_clusters(cluster_facets)
+
+        return build_month_summary(month, total_papers, clusters, taxonomy), {}
+
+    return await cached_month_response(request, "month_summary", month, compute)
+
+
+BUNDLE_SECTIONS = ("summary", "clusters", "graph", "papers")
+
+
+@app.get("/api/months/{month}/bundle", response_model=MonthBundle)
+async def get_month_bundle(
+    request: Request,
+    month: str,
+    include: str = Query(",".join(BUNDLE_SECTIONS), description="Comma-separated sections: summary, clusters, graph, papers"),
+    sort_by: str = Query("upvotes", enum=["upvotes", "date", "confidence"]),
+    limit: int = Query(100, le=500)
+):
+    """
+    Get several month payloads in one round trip.
+
+    The month is loaded with a single joined query and every requested
+    section is built from those rows. Sections match the /summary,
+    /clusters, /cluster-graph and /papers endpoints (the papers section is
+    the first page for **sort_by** and **limit**, with **nextCursor** to continue).
+    """
+    requested = {section.strip() for section in include.split(",") if section.strip()}
+    unknown = requested - set(BUNDLE_SECTIONS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown bundle sections: {', '.join(sorted(unknown))}")
+    sections = tuple(section for section in BUNDLE_SECTIONS if section in requested)
+
+    async def compute():
+        if "summary" in sections:
+            papers_with_tags, taxonomy = await asyncio.gather(
+                get_papers_with_tags_for_month(month), get_taxonomy(month)
+            )
+        else:
+            papers_with_tags, taxonomy = await get_papers_with_tags_for_month(month), None
+
+        bundle = MonthBundle(month=month)
+        if "summary" in sections or "clusters" in sections:
+            clusters = build_clusters(build_cluster_facets(papers_with_tags))
+            if "clusters" in sections:
+                bundle.clusters = clusters
+            if "summary" in sections:
+                bundle.summary = build_month_summary(month, len(papers_with_tags), clusters, taxonomy)
+        if "graph" in sections:
+            bundle.graph = build_cluster_graph(papers_with_tags)
+        if "papers" in sections:
+            bundle.papers, bundle.nextCursor = first_page_cards(papers_with_tags, sort_by, limit)
+        return bundle, {}
+
+    return await cached_month_response(
+        request, "month_bundle", month, compute, include=sections, sort_by=sort_by, limit=limit
     )
 
 
 @app.get("/api/clusters/{cluster_id}/papers", response_model=list[PaperCard])
 async def get_cluster_papers(
+    request: Request,
     cluster_id: str,
     month: str = Query(..., description="Month in YYYY-MM format"),
     sort_by: str = Query("upvotes", enum=["upvotes", "date", "confidence"]),
     limit: int = Query(50, le=200),
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = Query(None, description="Keyset cursor from X-Next-Cursor")
 ):
     """Get papers in a specific cluster."""
-    papers_with_tags = await get_papers_with_tags_for_month(month)
-    
-    # Filter by cluster
-    filtered = [
-        item for item in papers_with_tags
-        if item["tags"] and slugify(item["tags"].primary_contribution_tag) == cluster_id
-    ]
-    
-    # Sort
-    if sort_by == "upvotes":
-        filtered.sort(key=lambda x: -x["paper"].upvotes)
-    elif sort_by == "date":
-        filtered.sort(key=lambda x: x["paper"].published_date, reverse=True)
-    elif sort_by == "confidence":
-        filtered.sort(key=lambda x: -(x["tags"].confidence if x["tags"] else 0))
-    
-    # Pagination
-    paginated = filtered[offset:offset + limit]
-    
-    return [paper_to_card(item["paper"], item["tags"]) for item in paginated]
+    async def compute():
+        clusters = await resolve_cluster_names(month, cluster_id)
+        if not clusters:
+            return [], {}
+        return await fetch_paper_cards(PaperQuery(
+            month=month, clusters=clusters, sort_by=sort_by,
+            limit=limit, offset=offset, cursor=cursor
+        ))
 
+    return await cached_month_response(
+        request, "cluster_papers", month, compute,
+        cluster_id=cluster_id, sort_by=sort_by, limit=limit, offset=offset, cursor=cursor
+    )
 
-@app.get("/api/papers/{paper_id}")
-async def get_paper_detail(paper_id: str):
-    """Get full details for a single paper."""
-    paper = await get_paper(paper_id)
-    if not paper:
-        raise HTTPException(status_code=404, detail="Paper not found")
-    
-    tags = await get_paper_tags(paper_id)
-    
+
+@app.get("/api/search", response_model=list[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, description="Search text"),
+    month: Optional[str] = Query(None, description="Limit to a month (YYYY-MM)"),
+    start_date: Optional[str] = Query(None, description="Appeared on or after (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Appeared on or before (YYYY-MM-DD)"),
+    limit: int = Query(50, le=200),
+    offset: int = 0
+):
+    """
+    Full-text search over paper titles and abstracts.
+
+    Results are ranked by BM25 (title matches weigh more) and include
+    highlighted titles and abstract snippets.
+    """
+    hits = await search_papers(
+        q, month=month, start_date=start_date, end_date=end_date,
+        limit=limit, offset=offset
+    )
+    # Built from trusted rows, so skip response_model re-validation
+    return FastResponse([
+        SearchResult(
+            paper=paper_to_card(hit["paper"], hit["tags"]),
+            score=hit["score"],
+            titleHighlight=hit["title_highlight"],
+            snippet=hit["snippet"]
+        )
+        for hit in hits
+    ])
+
+
+def paper_detail(paper: Paper, tags: Optional[PaperTags]) -> dict:
+    """Build the /api/papers/{paper_id} payload for a paper and its tags."""
     return {
         "paper": {
             "id": paper.id,
@@ -495,17 +830,56 @@ async def get_paper_detail(paper_id: str):
             "pdfUrl": paper.pdf_url
         },
         "tags": {
-            "primaryContributionTag": tags.primary_contribution_tag if tags else "OTHER",
-            "secondaryContributionTags": tags.secondary_contribution_tags if tags else [],
-            "taskTags": tags.task_tags if tags else [],
-            "modalityTags": tags.modality_tags if tags else [],
-            "researchQuestion": tags.research_question if tags else "",
-            "confidence": tags.confidence if tags else 0.0,
-            "rationale": tags.rationale if tags else ""
+            "primaryContributionTag": tags.primary_contribution_tag,
+            "secondaryContributionTags": tags.secondary_contribution_tags,
+            "taskTags": tags.task_tags,
+            "modalityTags": tags.modality_tags,
+            "researchQuestion": tags.research_question,
+            "confidence": tags.confidence,
+            "rationale": tags.rationale
         } if tags else None
     }
 
 
+@app.post("/api/papers/batch")
+async def get_papers_batch(batch: PaperBatchRequest):
+    """
+    Resolve a list of paper ids in one query.
+
+    Resolves the id lists held by other responses (cluster paperIds, shared
+    paper ids, top and sample papers) without one request per paper.
+
+    - **ids**: Paper ids, at most PAPER_BATCH_MAX_IDS; duplicates are ignored
+    - **view**: "card" for PaperCards, "detail" for /api/papers/{id} payloads
+
+    Returns papers in the requested order and the ids that were not found.
+    """
+    paper_ids = list(dict.fromkeys(batch.ids))
+    if batch.view == "card":
+        rows = await get_paper_cards_by_ids(paper_ids)
+        found = {row["id"] for row in rows}
+        papers = [card_row_to_card(row) for row in rows]
+    else:
+        items = await get_papers_with_tags_by_ids(paper_ids)
+        found = {item["paper"].id for item in items}
+        papers = [paper_detail(item["paper"], item["tags"]) for item in items]
+
+    return FastResponse({
+        "papers": papers,
+        "missing": [paper_id for paper_id in paper_ids if paper_id not in found]
+    })
+
+
+@app.get("/api/papers/{paper_id}")
+async def get_paper_detail(paper_id: str):
+    """Get full details for a single paper."""
+    paper = await get_paper(paper_id)
+    if not paper:
+        raise HTTPException(status_code=404, detail="Paper not found")
+
+    return paper_detail(paper, await get_paper_tags(paper_id))
+
+
 @app.get("/api/taxonomy/{month}")
 async def get_month_taxonomy(month: str):
     """Get taxonomy for a month."""
@@ -531,6 +905,94 @@ async def get_month_taxonomy(month: str):
     }
 
 
+# ============= Export =============
+
+EXPORT_COLUMNS = [
+    "id", "title", "abstract", "authors", "published_date", "appeared_date", "upvotes",
+    "hf_url", "arxiv_url", "pdf_url", "month", "primary_contribution_tag",
+    "secondary_contribution_tags", "task_tags", "modality_tags",
+    "research_question", "confidence", "rationale",
+]
+
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_record(item: dict) -> dict:
+    """Flatten a {"paper", "tags"} item into one export row (tag fields empty when untagged)."""
+    paper, tags = item["paper"], item["tags"]
+    return {
+        "id": paper.id,
+        "title": paper.title,
+        "abstract": paper.abstract,
+        "authors": paper.authors,
+        "published_date": paper.published_date,
+        "appeared_date": paper.appeared_date,
+        "upvotes": paper.upvotes,
+        "hf_url": paper.hf_url,
+        "arxiv_url": paper.arxiv_url,
+        "pdf_url": paper.pdf_url,
+        "month": tags.month if tags else None,
+        "primary_contribution_tag": tags.primary_contribution_tag if tags else None,
+        "secondary_contribution_tags": tags.secondary_contribution_tags if tags else [],
+        "task_tags": tags.task_tags if tags else [],
+        "modality_tags": tags.modality_tags if tags else [],
+        "research_question": tags.research_question if tags else None,
+        "confidence": tags.confidence if tags else None,
+        "rationale": tags.rationale if tags else None,
+    }
+
+
+async def stream_ndjson(chunks) -> AsyncIterator[str]:
+    """One JSON object per line, one flush per chunk of rows."""
+    async for chunk in chunks:
+        yield "".join(json.dumps(export_record(item)) + "\n" for item in chunk)
+
+
+async def stream_csv(chunks) -> AsyncIterator[str]:
+    """CSV with a header row; list columns are joined with "; "."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    async for chunk in chunks:
+        for item in chunk:
+            record = export_record(item)
+            for column, value in record.items():
+                if isinstance(value, list):
+                    record[column] = "; ".join(value)
+            writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()  # Header only, for an empty range
+
+
+@app.get("/api/export")
+async def export_papers(
+    start_date: str = Query(..., pattern=DATE_PATTERN, description="Start date YYYY-MM-DD (appeared date, inclusive)"),
+    end_date: str = Query(..., pattern=DATE_PATTERN, description="End date YYYY-MM-DD (inclusive)"),
+    format: str = Query("ndjson", pattern=f"^({'|'.join(EXPORT_MEDIA_TYPES)})$")
+):
+    """
+    Stream papers with their tags for a date range as NDJSON or CSV.
+
+    Rows are read from an open database cursor and sent in chunks as they
+    are read, so memory use does not grow with the size of the range.
+    """
+    chunks = iter_papers_with_tags_by_date_range(start_date, end_date)
+    body = stream_ndjson(chunks) if format == "ndjson" else stream_csv(chunks)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="papers_{start_date}_{end_date}.{format}"'}
+    )
+
+
 # ============= Indexing Endpoints =============
 
 class IndexRequest(BaseModel):
@@ -546,6 +1008,7 @@ class IndexStatus(BaseModel):
     month: str
     papers_scraped: int = 0
     papers_tagged: int = 0
+    papers_skipped: int = 0  # Unchanged papers whose tags were kept
     message: str = ""
 
 
@@ -582,6 +1045,7 @@ async def reindex_month(
         "status": "running",
         "papers_scraped": 0,
         "papers_tagged": 0,
+        "papers_skipped": 0,
         "message": "Starting..."
     }
 
@@ -603,8 +1067,7 @@ async def run_indexing(month: str, use_llm: bool, provider: Optional[str] = None
         indexing_status[month]["papers_scraped"] = len(papers)
 
         # Save papers to database
-        for paper in papers:
-            await upsert_paper(paper)
+        await upsert_papers_many(papers)
 
         indexing_status[month]["message"] = f"Scraped {len(papers)} papers. Generating taxonomy..."
 
@@ -625,18 +1088,29 @@ async def run_indexing(month: str, use_llm: bool, provider: Optional[str] = None
 
         indexing_status[month]["message"] = "Tagging papers..."
 
-        # Step 3: Tag papers
-        for i, paper in enumerate(papers):
+        # Step 3: Tag new or changed papers (flushed to the database in batches)
+        to_tag = await get_papers_needing_tags(papers, taxonomy)
+        indexing_status[month]["papers_skipped"] = len(papers) - len(to_tag)
+        pending_tags = []
+        for i, paper in enumerate(to_tag):
             if use_llm:
                 tags = await tag_paper(paper, taxonomy, provider=provider)
             else:
                 tags = tag_paper_heuristic(paper, taxonomy)
 
-            await save_paper_tags(tags)
+            pending_tags.append(tags)
+            if len(pending_tags) >= BULK_WRITE_BATCH_SIZE:
+                await save_paper_tags_many(pending_tags)
+                pending_tags = []
             indexing_status[month]["papers_tagged"] = i + 1
 
+        await save_paper_tags_many(pending_tags)
+
         indexing_status[month]["status"] = "completed"
-        indexing_status[month]["message"] = f"Successfully indexed {len(papers)} papers"
+        indexing_status[month]["message"] = (
+            f"Successfully indexed {len(papers)} papers "
+            f"({indexing_status[month]['papers_skipped']} unchanged, not re-tagged)"
+        )
 
     except LLMError as e:
         indexing_status[month]["status"] = "failed"
@@ -662,31 +1136,32 @@ async def get_indexing_status(month: str):
         month=month,
         papers_scraped=status["papers_scraped"],
         papers_tagged=status["papers_tagged"],
+        papers_skipped=status["papers_skipped"],
         message=status["message"]
     )
 
 
 # ============= Available Months =============
 
-@app.get("/api/months")
-async def get_available_months():
-    """Get list of available months (based on what's indexed)."""
-    # In a production system, you'd query the database
-    # For now, return a static list of recent months
-    import datetime
-
-    current = datetime.date.today()
-    months = []
+@app.get("/api/months", response_model=MonthIndex)
+async def get_available_months(request: Request):
+    """
+    Get the months that have papers, with paper and tagged counts.
 
-    for i in range(12):
-        year = current.year
-        month = current.month - i
-        if month <= 0:
-            month += 12
-            year -= 1
-        months.append(f"{year}-{month:02d}")
+    Built from the database once per write generation and served from the
+    response cache in between.
+    """
+    async def compute():
+        months = [
+            MonthInfo(
+                month=row["month"], paperCount=row["paper_count"],
+                taggedCount=row["tagged_count"], lastUpdated=row["last_updated"]
+            )
+            for row in await get_month_index()
+        ]
+        return MonthIndex(months=months), {}
 
-    return {"months": months}
+    return await cached_response(request, "months", GLOBAL_SCOPE, compute)
 
 
 # ============= LLM Provider Endpoints =============
@@ -753,66 +1228,85 @@ async def get_taxonomy_color(category_name: str, taxonomy_type: str = "contribut
 
 # ============= Temporal / Daily Endpoints =============
 
-@app.get("/api/daily/{date}")
+@app.get("/api/daily/{date}", response_model=DailyPapers)
 async def get_daily_papers(
+    request: Request,
     date: str,
     cluster: Optional[str] = None,
+    task: Optional[str] = None,
+    modality: Optional[str] = None,
     sort_by: str = Query("upvotes", enum=["upvotes", "date", "confidence"]),
-    limit: int = Query(100, le=500)
+    limit: int = Query(100, le=500),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from nextCursor")
 ):
     """
-    Get papers for a specific date with optional filtering.
+    Get a page of papers for a specific date with optional filtering.
+
+    Filters, sorting and paging run in one indexed query, so a page costs the
+    same however many papers the day has.
 
     Args:
         date: Date in YYYY-MM-DD format
-        cluster: Optional cluster filter
+        cluster: Cluster name or slug (primary contribution tag)
+        task: Filter by task tag
+        modality: Filter by modality
         sort_by: Sort order
         limit: Maximum papers to return
+        cursor: Continue after the previous page (see nextCursor)
     """
-    papers = await get_papers_by_date(date)
+    async def compute():
+        clusters = None
+        if cluster:
+            names = await get_cluster_names_for_date(date)
+            clusters = [name for name in names if slugify(name) == slugify(cluster)]
+        total_papers = await count_papers_by_date(date)
+        if clusters == []:
+            return DailyPapers(date=date, total_papers=total_papers, papers=[])
+        cards, headers = await fetch_paper_cards(PaperQuery(
+            appeared_date=date, clusters=clusters, task=task, modality=modality,
+            sort_by=sort_by, limit=limit, cursor=cursor
+        ))
+        return DailyPapers(
+            date=date, total_papers=total_papers, papers=cards, nextCursor=headers.get("X-Next-Cursor")
+        )
 
-    # TODO: Add filtering and join with tags
-    return {
-        "date": date,
-        "total_papers": len(papers),
-        "papers": [
-            {
-                "id": p.id,
-                "title": p.title,
-                "upvotes": p.upvotes,
-                "appeared_date": p.appeared_date
-            }
-            for p in papers[:limit]
-        ]
-    }
+    return await conditional_response(
+        request, "daily_papers", [GLOBAL_SCOPE], compute,
+        date=date, cluster=cluster, task=task, modality=modality,
+        sort_by=sort_by, limit=limit, cursor=cursor
+    )
 
 
 @app.get("/api/daily/{date}/stats")
-async def get_daily_statistics(date: str):
+async def get_daily_statistics(request: Request, date: str):
     """
     Get aggregated statistics for a specific date.
 
     Args:
         date: Date in YYYY-MM-DD format
     """
-    stats = await compute_daily_stats(date)
-    return stats
+    return await conditional_response(
+        request, "daily_stats", [GLOBAL_SCOPE], lambda: compute_daily_stats(date), date=date
+    )
 
 
 @app.get("/api/weekly/{week_start}/stats")
-async def get_weekly_statistics(week_start: str):
+async def get_weekly_statistics(request: Request, week_start: str):
     """
     Get aggregated statistics for a week.
 
     Args:
         week_start: Start date (Monday) in YYYY-MM-DD format
     """
-    stats = await compute_weekly_stats(week_start)
-    return stats
+    return await conditional_response(
+        request, "weekly_stats", [GLOBAL_SCOPE], lambda: compute_weekly_stats(week_start),
+        week_start=week_start
+    )
 
 
 @app.get("/api/flow")
 async def get_flow_visualization(
+    request: Request,
     start_date: str = Query(..., description="Start date YYYY-MM-DD"),
     end_date: str = Query(..., description="End date YYYY-MM-DD")
 ):
@@ -821,12 +1315,15 @@ async def get_flow_visualization(
 
     Returns daily cluster counts for creating stream/flow charts.
     """
-    flow_data = await compute_flow_data(start_date, end_date)
-    return flow_data
+    return await conditional_response(
+        request, "flow", [GLOBAL_SCOPE], lambda: compute_flow_data(start_date, end_date),
+        start_date=start_date, end_date=end_date
+    )
 
 
 @app.get("/api/trends/{cluster_name}")
 async def get_cluster_trend(
+    request: Request,
     cluster_name: str,
     start_date: str = Query(..., description="Start date YYYY-MM-DD"),
     end_date: str = Query(..., description="End date YYYY-MM-DD")
@@ -834,8 +1331,11 @@ async def get_cluster_trend(
     """
     Get trend data for a specific cluster over time.
     """
-    trend = await compute_trend_data(cluster_name, start_date, end_date)
-    return trend
+    return await conditional_response(
+        request, "cluster_trend", [GLOBAL_SCOPE],
+        lambda: compute_trend_data(cluster_name, start_date, end_date),
+        cluster_name=cluster_name, start_date=start_date, end_date=end_date
+    )
 
 
 @app.get("/api/papers/{paper_id}/upvote-history")
@@ -880,6 +1380,7 @@ async def reindex_daily(
         "status": "running",
         "papers_scraped": 0,
         "papers_tagged": 0,
+        "papers_skipped": 0,
         "message": "Starting..."
     }
 
@@ -903,8 +1404,7 @@ async def run_daily_indexing(date: str, use_llm: bool, provider: Optional[str] =
         indexing_status[task_key]["papers_scraped"] = len(papers)
 
         # Save papers
-        for paper in papers:
-            await upsert_paper(paper)
+        await upsert_papers_many(papers)
 
         indexing_status[task_key]["message"] = f"Scraped {len(papers)} papers. Tagging..."
 
@@ -925,22 +1425,33 @@ async def run_daily_indexing(date: str, use_llm: bool, provider: Optional[str] =
                 )
             await save_taxonomy(taxonomy)
 
-        # Step 3: Tag papers
+        # Step 3: Tag new or changed papers (flushed to the database in batches)
         from llm_tagger import tag_paper, tag_paper_heuristic
-        for i, paper in enumerate(papers):
+        to_tag = await get_papers_needing_tags(papers, taxonomy)
+        indexing_status[task_key]["papers_skipped"] = len(papers) - len(to_tag)
+        pending_tags = []
+        for i, paper in enumerate(to_tag):
             if use_llm:
                 tags = await tag_paper(paper, taxonomy, provider=provider)
             else:
                 tags = tag_paper_heuristic(paper, taxonomy)
 
-            await save_paper_tags(tags)
+            pending_tags.append(tags)
+            if len(pending_tags) >= BULK_WRITE_BATCH_SIZE:
+                await save_paper_tags_many(pending_tags)
+                pending_tags = []
             indexing_status[task_key]["papers_tagged"] = i + 1
 
+        await save_paper_tags_many(pending_tags)
+
         # Step 4: Save daily snapshot
         await save_daily_snapshot_for_date(date)
 
         indexing_status[task_key]["status"] = "completed"
-        indexing_status[task_key]["message"] = f"Successfully indexed {len(papers)} papers for {date}"
+        indexing_status[task_key]["message"] = (
+            f"Successfully indexed {len(papers)} papers for {date} "
+            f"({indexing_status[task_key]['papers_skipped']} unchanged, not re-tagged)"
+        )
 
     except Exception as e:
         indexing_status[task_key]["status"] = "failed"
@@ -1018,6 +1529,7 @@ async def trigger_backfill(days: int = Query(7, ge=1, le=30)):
 
 @app.get("/api/emerging/report")
 async def get_emerging_topics_report(
+    request: Request,
     end_date: Optional[str] = Query(None, description="Analysis end date (defaults to today)"),
     lookback_days: int = Query(14, ge=7, le=30, description="Days to analyze"),
     comparison_days: int = Query(30, ge=14, le=60, description="Days for comparison period")
@@ -1036,16 +1548,24 @@ async def get_emerging_topics_report(
         lookback_days: Number of days to analyze (current period)
         comparison_days: Number of days for comparison (previous period)
     """
-    report = await generate_emerging_topics_report(
-        end_date=end_date,
-        lookback_days=lookback_days,
-        comparison_lookback_days=comparison_days
+    from datetime import date as date_type
+    if not end_date:
+        end_date = date_type.today().strftime("%Y-%m-%d")
+
+    return await conditional_response(
+        request, "emerging_report", [GLOBAL_SCOPE],
+        lambda: generate_emerging_topics_report(
+            end_date=end_date,
+            lookback_days=lookback_days,
+            comparison_lookback_days=comparison_days
+        ),
+        end_date=end_date, lookback_days=lookback_days, comparison_days=comparison_days
     )
-    return report
 
 
 @app.get("/api/emerging/trends")
 async def get_emerging_trends(
+    request: Request,
     end_date: Optional[str] = Query(None, description="Analysis end date"),
     limit: int = Query(15, ge=5, le=30)
 ):
@@ -1058,15 +1578,21 @@ async def get_emerging_trends(
     if not end_date:
         end_date = date_type.today().strftime("%Y-%m-%d")
 
-    signals = await compute_trend_signals(end_date)
-    return {
-        "end_date": end_date,
-        "trends": signals[:limit]
-    }
+    async def compute():
+        signals = await compute_trend_signals(end_date)
+        return {
+            "end_date": end_date,
+            "trends": signals[:limit]
+        }
+
+    return await conditional_response(
+        request, "emerging_trends", [GLOBAL_SCOPE], compute, end_date=end_date, limit=limit
+    )
 
 
 @app.get("/api/emerging/rising")
 async def get_rising_topics(
+    request: Request,
     end_date: Optional[str] = Query(None, description="Analysis end date"),
     min_growth: float = Query(20.0, description="Minimum weekly growth percentage")
 ):
@@ -1080,22 +1606,28 @@ async def get_rising_topics(
     if not end_date:
         end_date = date_type.today().strftime("%Y-%m-%d")
 
-    signals = await compute_trend_signals(end_date)
+    async def compute():
+        signals = await compute_trend_signals(end_date)
 
-    rising = [
-        s for s in signals
-        if s.trend_direction == "rising" and s.weekly_change >= min_growth
-    ]
+        rising = [
+            s for s in signals
+            if s.trend_direction == "rising" and s.weekly_change >= min_growth
+        ]
 
-    return {
-        "end_date": end_date,
-        "min_growth": min_growth,
-        "rising_topics": rising
-    }
+        return {
+            "end_date": end_date,
+            "min_growth": min_growth,
+            "rising_topics": rising
+        }
+
+    return await conditional_response(
+        request, "emerging_rising", [GLOBAL_SCOPE], compute, end_date=end_date, min_growth=min_growth
+    )
 
 
 @app.get("/api/emerging/hot")
 async def get_hot_topics(
+    request: Request,
     start_date: str = Query(..., description="Start date YYYY-MM-DD"),
     end_date: str = Query(..., description="End date YYYY-MM-DD"),
     min_papers: int = Query(3, ge=1)
@@ -1105,13 +1637,19 @@ async def get_hot_topics(
 
     Returns clusters where papers are receiving above-average attention.
     """
-    surges = await detect_upvote_surges(start_date, end_date, min_papers=min_papers)
+    async def compute():
+        surges = await detect_upvote_surges(start_date, end_date, min_papers=min_papers)
 
-    return {
-        "start_date": start_date,
-        "end_date": end_date,
-        "hot_topics": surges
-    }
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "hot_topics": surges
+        }
+
+    return await conditional_response(
+        request, "emerging_hot", [GLOBAL_SCOPE], compute,
+        start_date=start_date, end_date=end_date, min_papers=min_papers
+    )
 
 
 if __name__ == "__main__":
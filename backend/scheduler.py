@@ -13,7 +13,10 @@ from typing import Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from database import init_database, upsert_paper, save_taxonomy, get_taxonomy, save_paper_tags
+from database import (
+    init_database, close_database, upsert_papers_many, save_taxonomy, get_taxonomy,
+    save_paper_tags_many, get_papers_needing_tags, BULK_WRITE_BATCH_SIZE
+)
 from scraper import scrape_daily, is_weekday
 from llm_tagger import generate_taxonomy, tag_paper, tag_paper_heuristic, DEFAULT_CONTRIBUTION_TAGS, DEFAULT_TASK_TAGS, DEFAULT_MODALITY_TAGS
 from aggregation import save_daily_snapshot_for_date
@@ -53,6 +56,7 @@ class PaperScheduler:
             "status": "running",
             "papers_scraped": 0,
             "papers_tagged": 0,
+            "papers_skipped": 0,
             "error": None
         }
 
@@ -69,8 +73,7 @@ class PaperScheduler:
                 return result
 
             # Step 2: Save papers to database
-            for paper in papers:
-                await upsert_paper(paper)
+            await upsert_papers_many(papers)
 
             # Step 3: Get or create taxonomy
             month = date_str[:7]
@@ -90,26 +93,37 @@ class PaperScheduler:
                     )
                 await save_taxonomy(taxonomy)
 
-            # Step 4: Tag papers
-            print("Tagging papers...")
-            for i, paper in enumerate(papers):
+            # Step 4: Tag new or changed papers
+            to_tag = await get_papers_needing_tags(papers, taxonomy)
+            result["papers_skipped"] = len(papers) - len(to_tag)
+            print(f"Tagging papers ({result['papers_skipped']} unchanged, skipped)...")
+            pending_tags = []
+            for i, paper in enumerate(to_tag):
                 if USE_LLM:
                     tags = await tag_paper(paper, taxonomy, provider=LLM_PROVIDER)
                 else:
                     tags = tag_paper_heuristic(paper, taxonomy)
 
-                await save_paper_tags(tags)
+                pending_tags.append(tags)
+                if len(pending_tags) >= BULK_WRITE_BATCH_SIZE:
+                    await save_paper_tags_many(pending_tags)
+                    pending_tags = []
                 result["papers_tagged"] = i + 1
 
                 if (i + 1) % 10 == 0:
-                    print(f"  Tagged {i + 1}/{len(papers)} papers")
+                    print(f"  Tagged {i + 1}/{len(to_tag)} papers")
+
+            await save_paper_tags_many(pending_tags)
 
             # Step 5: Save daily snapshot
             print("Saving daily snapshot...")
             await save_daily_snapshot_for_date(date_str)
 
             result["status"] = "completed"
-            result["message"] = f"Successfully indexed {len(papers)} papers"
+            result["message"] = (
+                f"Successfully indexed {len(papers)} papers "
+                f"({result['papers_skipped']} unchanged, not re-tagged)"
+            )
             print(f"Completed: {result['message']}")
 
         except Exception as e:
@@ -259,11 +273,7 @@ if __name__ == "__main__":
     parser.add_argument("--date", type=str, help="Scrape specific date (YYYY-MM-DD)")
     args = parser.parse_args()
 
-    async def main():
-        await init_database()
-
-        scheduler = get_scheduler()
-
+    async def run(scheduler: PaperScheduler):
         if args.date:
             # Scrape specific date
             result = await scheduler.scrape_and_index_date(args.date)
@@ -290,4 +300,11 @@ if __name__ == "__main__":
         except KeyboardInterrupt:
             scheduler.stop()
 
+    async def main():
+        await init_database()
+        try:
+            await run(get_scheduler())
+        finally:
+            await close_database()
+
     asyncio.run(main())
@@ -3,16 +3,50 @@ Hugging Face Papers Scraper.
 Fetches papers from HF daily and monthly listings and extracts metadata from paper pages.
 """
 
+import asyncio
 import httpx
+import os
 import re
 import json
-from datetime import date, datetime, timedelta
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from bs4 import BeautifulSoup
-from typing import Optional
+from lxml import etree, html as lxml_html
+from pydantic import BaseModel
+from typing import AsyncIterator, Callable, Optional
 from database import Paper, compute_content_hash
+from http_cache import HttpCache, cached_response, default_http_cache
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+except ImportError:  # Optional: connections fall back to HTTP/1.1 keep-alive
+    h2 = None
 
 HF_BASE_URL = "https://huggingface.co"
 
+# HTTP client settings from environment
+SCRAPER_TIMEOUT = float(os.environ.get("SCRAPER_TIMEOUT", "30"))  # Seconds per request
+SCRAPER_CONNECT_TIMEOUT = float(os.environ.get("SCRAPER_CONNECT_TIMEOUT", "10"))
+SCRAPER_MAX_CONNECTIONS = int(os.environ.get("SCRAPER_MAX_CONNECTIONS", "10"))
+SCRAPER_MAX_KEEPALIVE = int(os.environ.get("SCRAPER_MAX_KEEPALIVE", "10"))
+SCRAPER_KEEPALIVE_EXPIRY = float(os.environ.get("SCRAPER_KEEPALIVE_EXPIRY", "30"))  # Idle seconds
+SCRAPER_HTTP2 = os.environ.get("SCRAPER_HTTP2", "1").lower() not in ("0", "false", "no")
+SCRAPER_USER_AGENT = os.environ.get("SCRAPER_USER_AGENT", "HF-Papers-Explorer/1.0")
+
+# Concurrency and adaptive rate limit settings from environment
+SCRAPER_CONCURRENCY = int(os.environ.get("SCRAPER_CONCURRENCY", "8"))  # Requests in flight
+SCRAPER_RATE = float(os.environ.get("SCRAPER_RATE", "4"))  # Starting requests per second
+SCRAPER_MIN_RATE = float(os.environ.get("SCRAPER_MIN_RATE", "0.2"))
+SCRAPER_MAX_RATE = float(os.environ.get("SCRAPER_MAX_RATE", "10"))
+SCRAPER_RATE_STEP = float(os.environ.get("SCRAPER_RATE_STEP", "0.5"))  # Requests/second regained per second of successes
+SCRAPER_MAX_RETRIES = int(os.environ.get("SCRAPER_MAX_RETRIES", "3"))  # Retries after 429/503
+SCRAPER_MAX_RETRY_AFTER = 300.0  # Cap on a server-requested wait, in seconds
+
+# Statuses that mean "slow down" rather than "failed"
+THROTTLE_STATUSES = (429, 503)
+
 
 def is_weekday(d: date) -> bool:
     """Check if a date is a weekday (Monday=0 to Friday=4)."""
@@ -30,279 +64,939 @@ def get_weekdays_in_range(start_date: date, end_date: date) -> list[date]:
     return days
 
 
-async def fetch_month_paper_ids(month: str) -> list[str]:
+# ============= HTTP Session =============
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP date).
+
+    Returns None when the header is missing or unparseable; waits are capped
+    at SCRAPER_MAX_RETRY_AFTER.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - (now or datetime.now(timezone.utc))).total_seconds()
+    return min(max(seconds, 0.0), SCRAPER_MAX_RETRY_AFTER)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate adapts to the server (AIMD).
+
+    Each success raises the rate additively (by about `step` requests/second
+    for every second of successes, up to max_rate); each throttle response
+    halves it (down to min_rate) and pauses all requests for Retry-After, or
+    one request interval when the server gives none. Throttles arriving
+    during that pause count once, so a burst of 429s from requests already
+    in flight does not collapse the rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = SCRAPER_RATE,
+        min_rate: float = SCRAPER_MIN_RATE,
+        max_rate: float = SCRAPER_MAX_RATE,
+        step: float = SCRAPER_RATE_STEP,
+        clock: Callable[[], float] = time.monotonic,
+        sleep=asyncio.sleep,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.throttles = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = 1.0  # Burst of one: requests are spaced 1/rate apart
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:  # First come, first served
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await self._sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await self._sleep((1.0 - self._tokens) / self.rate)
+
+    def on_success(self):
+        """Additive increase."""
+        self.rate = min(self.max_rate, self.rate + self.step / self.rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease plus a pause before the next request."""
+        now = self._clock()
+        self._refill(now)
+        if now >= self._paused_until:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.throttles += 1
+        self._tokens = 0.0
+        wait = retry_after if retry_after is not None else 1.0 / self.rate
+        self._paused_until = max(self._paused_until, now + wait)
+
+
+class ScraperSession:
+    """
+    One pooled httpx client shared by every request of a crawl.
+
+    Connections to huggingface.co are kept alive (and multiplexed over HTTP/2
+    when h2 is installed), so fetching hundreds of paper pages does not pay
+    for a new TCP+TLS handshake each time. Requests are bounded by a
+    semaphore and paced by an AdaptiveRateLimiter; 429/503 responses are
+    retried after the wait the server asks for. With an HttpCache, fresh
+    pages are served from disk and stale ones are revalidated with a
+    conditional request. Use it as an async context manager or call
+    aclose() when done.
+    """
+
+    def __init__(
+        self,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        concurrency: int = SCRAPER_CONCURRENCY,
+        max_retries: int = SCRAPER_MAX_RETRIES,
+        cache: Optional[HttpCache] = None,
+        **client_kwargs
+    ):
+        """
+        Args:
+            limiter: Rate limiter (a new AdaptiveRateLimiter by default)
+            concurrency: Most requests in flight at once
+            max_retries: Retries of a throttled request before giving up
+            cache: On-disk page cache (none by default; see default_http_cache)
+            **client_kwargs: Overrides for httpx.AsyncClient (e.g. transport in tests)
+        """
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.cache = cache
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(concurrency)
+        options = dict(
+            http2=SCRAPER_HTTP2 and h2 is not None,
+            limits=httpx.Limits(
+                max_connections=SCRAPER_MAX_CONNECTIONS,
+                max_keepalive_connections=SCRAPER_MAX_KEEPALIVE,
+                keepalive_expiry=SCRAPER_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(SCRAPER_TIMEOUT, connect=SCRAPER_CONNECT_TIMEOUT),
+            follow_redirects=True,
+            headers={"User-Agent": SCRAPER_USER_AGENT},
+        )
+        options.update(client_kwargs)
+        self.client = httpx.AsyncClient(**options)
+
+    async def get(self, url: str) -> httpx.Response:
+        """
+        GET a URL within the concurrency and rate limits.
+
+        Throttled responses (429/503) slow the limiter down and are retried up
+        to max_retries times. With a cache, a fresh page costs no request and
+        a stale one is sent with its validators; a 304 returns the stored body.
+
+        Raises:
+            httpx.HTTPStatusError: On error statuses, including a throttle
+                that persists after the last retry
+        """
+        cached = await asyncio.to_thread(self.cache.lookup, url) if self.cache else None
+        if cached and self.cache.is_fresh(cached[0]):
+            self.cache.record_hit(*cached)
+            return cached_response(*cached)
+        headers = cached[0].conditional_headers() if cached else {}
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            started = time.monotonic()
+            async with self._semaphore:
+                response = await self.client.get(url, headers=headers)
+            elapsed = time.monotonic() - started
+            if response.status_code in THROTTLE_STATUSES:
+                self.limiter.on_throttle(parse_retry_after(response.headers.get("retry-after")))
+                if attempt < self.max_retries:
+                    continue
+            elif response.status_code == 304 and cached:
+                self.limiter.on_success()
+                entry = await asyncio.to_thread(self.cache.refresh, *cached, response, elapsed)
+                return cached_response(entry, cached[1])
+            elif response.is_success:
+                self.limiter.on_success()
+                if self.cache and response.status_code == 200:
+                    await asyncio.to_thread(self.cache.store, url, response, elapsed)
+            response.raise_for_status()
+            return response
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "ScraperSession":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+# Shared session for the app lifespan (see open_scraper_session)
+_shared_session: Optional[ScraperSession] = None
+
+
+async def open_scraper_session() -> ScraperSession:
+    """Open the app-wide session used when no session is passed (called from the app lifespan)."""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = ScraperSession(cache=default_http_cache())
+    return _shared_session
+
+
+async def close_scraper_session():
+    """Close the app-wide session."""
+    global _shared_session
+    if _shared_session is not None:
+        await _shared_session.aclose()
+        _shared_session = None
+
+
+@asynccontextmanager
+async def session_scope(session: Optional[ScraperSession] = None) -> AsyncIterator[ScraperSession]:
+    """
+    Yield the session to use for a scrape.
+
+    A passed session or the app-wide one is used as-is; otherwise a session
+    is opened for the duration of the block.
+    """
+    if session is not None or _shared_session is not None:
+        yield session or _shared_session
+        return
+    async with ScraperSession(cache=default_http_cache()) as temporary:
+        yield temporary
+
+
+# ============= Listing Extraction =============
+
+ARXIV_ID_PATTERN = re.compile(r'^\d{4}\.\d{4,5}$')
+PAPER_LINK_PATTERN = re.compile(r'^/papers/(\d{4}\.\d{4,5})$')
+
+
+class ListingPaper(BaseModel):
+    """
+    A paper as found on a listing page or in HF's daily papers JSON.
+
+    Fields the listing did not provide are None; they are filled in from
+    the paper's own page.
+    """
+    id: str  # arxiv id
+    title: Optional[str] = None
+    abstract: Optional[str] = None
+    published_date: Optional[str] = None
+    upvotes: Optional[int] = None
+    authors: Optional[list[str]] = None
+
+    def missing_fields(self) -> list[str]:
+        """Names of fields the listing did not provide."""
+        return [
+            name for name in ("title", "abstract", "published_date", "upvotes", "authors")
+            if getattr(self, name) in (None, "")
+        ]
+
+    def to_paper(self, appeared_date: Optional[str] = None, detail: Optional[Paper] = None) -> Optional[Paper]:
+        """
+        Build a Paper from the listing, taking missing fields from `detail`.
+
+        Fields neither provides are left empty. Returns None only when the
+        title is still unknown.
+        """
+        def pick(name, default):
+            value = getattr(self, name)
+            if value in (None, "") and detail is not None:
+                value = getattr(detail, name)
+            return default if value is None else value
+
+        title, abstract = pick("title", ""), pick("abstract", "")
+        if not title:
+            return None
+        return Paper(
+            id=self.id,
+            title=title,
+            abstract=abstract,
+            published_date=pick("published_date", ""),
+            hf_url=f"{HF_BASE_URL}/papers/{self.id}",
+            arxiv_url=f"https://arxiv.org/abs/{self.id}",
+            pdf_url=f"https://arxiv.org/pdf/{self.id}.pdf",
+            upvotes=pick("upvotes", 0),
+            authors=pick("authors", []),
+            content_hash=compute_content_hash(title, abstract),
+            appeared_date=appeared_date
+        )
+
+
+def listing_paper_from_record(record: dict) -> Optional[ListingPaper]:
+    """
+    Read one entry of HF's daily papers data.
+
+    Entries are either {"paper": {...}, "title": ..., ...} as served by
+    /api/daily_papers and embedded in listing pages, or a bare paper object.
+    Returns None for objects that are not papers.
+    """
+    paper = record.get("paper") if isinstance(record.get("paper"), dict) else record
+    paper_id = paper.get("id")
+    if not isinstance(paper_id, str) or not ARXIV_ID_PATTERN.match(paper_id):
+        return None
+
+    def text(key):
+        value = paper.get(key) or record.get(key)
+        return " ".join(value.split()) if isinstance(value, str) else None
+
+    authors = paper.get("authors")
+    if isinstance(authors, list):
+        names = [a.get("name") if isinstance(a, dict) else a for a in authors]
+        authors = [name.strip() for name in names if isinstance(name, str) and name.strip()]
+    else:
+        authors = None
+
+    upvotes = paper.get("upvotes", record.get("upvotes"))
+    published = paper.get("publishedAt")
+
+    return ListingPaper(
+        id=paper_id,
+        title=text("title"),
+        abstract=text("summary") or text("abstract"),
+        # Same form as <time datetime> on paper pages, without milliseconds
+        published_date=published[:19] if isinstance(published, str) else None,
+        upvotes=upvotes if isinstance(upvotes, int) else None,
+        authors=authors
+    )
+
+
+def _find_paper_records(data, found: list[ListingPaper]):
+    """Collect every paper entry in a decoded JSON payload, in document order."""
+    if isinstance(data, dict):
+        paper = listing_paper_from_record(data)
+        if paper is not None:
+            found.append(paper)
+            return
+        children = data.values()
+    elif isinstance(data, list):
+        children = data
+    else:
+        return
+    for item in children:
+        _find_paper_records(item, found)
+
+
+def _merge_listing_paper(current: ListingPaper, other: ListingPaper) -> ListingPaper:
+    """Fill fields missing from `current` with those of `other`."""
+    updates = {name: getattr(other, name) for name in current.missing_fields()}
+    return current.model_copy(update={k: v for k, v in updates.items() if v not in (None, "")})
+
+
+def parse_listing(html: str) -> list[ListingPaper]:
+    """
+    Extract every paper on a daily or monthly listing page.
+
+    Paper links give the listing order. Full records come from the JSON the
+    page embeds for hydration (data-props attributes and JSON script tags);
+    papers with only a link come back with just their id.
+
+    Args:
+        html: Listing page HTML
+
+    Returns:
+        Listing papers in page order
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    paper_ids = []
+    records: dict[str, ListingPaper] = {}
+
+    # Find all paper links - they follow pattern /papers/XXXX.XXXXX
+    for link in soup.find_all('a', href=PAPER_LINK_PATTERN):
+        paper_id = PAPER_LINK_PATTERN.match(link['href']).group(1)
+        if paper_id not in paper_ids:
+            paper_ids.append(paper_id)
+
+    # Hydration data: data-props attributes and JSON script tags
+    payloads = [elem['data-props'] for elem in soup.find_all(attrs={'data-props': True})]
+    for script in soup.find_all('script'):
+        if script.string and 'papers' in script.string.lower():
+            payloads.append(script.string)
+            # IDs in scripts that are not parseable JSON still count
+            for pid in re.findall(r'"(\d{4}\.\d{4,5})"', script.string):
+                if pid not in paper_ids:
+                    paper_ids.append(pid)
+
+    for payload in payloads:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            continue
+        found = []
+        _find_paper_records(data, found)
+        for paper in found:
+            if paper.id not in paper_ids:
+                paper_ids.append(paper.id)
+            existing = records.get(paper.id)
+            records[paper.id] = _merge_listing_paper(existing, paper) if existing else paper
+
+    return [records.get(paper_id) or ListingPaper(id=paper_id) for paper_id in paper_ids]
+
+
+def parse_daily_papers_api(data) -> list[ListingPaper]:
+    """
+    Read a response of HF's /api/daily_papers endpoint.
+
+    Args:
+        data: Decoded JSON (a list of daily paper entries)
+
+    Returns:
+        Listing papers in response order, without duplicates
+    """
+    found = []
+    _find_paper_records(data if isinstance(data, list) else [], found)
+    papers: dict[str, ListingPaper] = {}
+    for paper in found:
+        papers.setdefault(paper.id, paper)
+    return list(papers.values())
+
+
+async def fetch_month_listing(month: str, session: Optional[ScraperSession] = None) -> list[ListingPaper]:
+    """
+    Fetch and parse a monthly listing page.
+
+    Args:
+        month: Month string in format YYYY-MM (e.g., "2025-01")
+        session: Session to fetch with (see session_scope)
+
+    Returns:
+        Listing papers in page order
+    """
+    async with session_scope(session) as session:
+        response = await session.get(f"{HF_BASE_URL}/papers/month/{month}")
+        return parse_listing(response.text)
+
+
+async def fetch_daily_listing(date_str: str, session: Optional[ScraperSession] = None) -> list[ListingPaper]:
+    """
+    Fetch the papers of one day, with as much metadata as the listing has.
+
+    HF's JSON daily papers endpoint is tried first; if it fails or returns
+    nothing, the daily listing page is parsed instead.
+
+    Args:
+        date_str: Date string in format YYYY-MM-DD (e.g., "2025-01-26")
+        session: Session to fetch with (see session_scope)
+
+    Returns:
+        Listing papers in listing order
+    """
+    async with session_scope(session) as session:
+        try:
+            response = await session.get(f"{HF_BASE_URL}/api/daily_papers?date={date_str}")
+            papers = parse_daily_papers_api(response.json())
+            if papers:
+                return papers
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Daily papers API unavailable for {date_str}, using the listing page: {e}")
+
+        response = await session.get(f"{HF_BASE_URL}/papers?date={date_str}")
+        return parse_listing(response.text)
+
+
+async def fetch_month_paper_ids(month: str, session: Optional[ScraperSession] = None) -> list[str]:
     """
     Fetch all paper IDs from a monthly listing page.
     
     Args:
         month: Month string in format YYYY-MM (e.g., "2025-01")
+        session: Session to fetch with (see session_scope)
     
     Returns:
         List of arxiv paper IDs
     """
-    url = f"{HF_BASE_URL}/papers/month/{month}"
-    paper_ids = []
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        # Find all paper links - they follow pattern /papers/XXXX.XXXXX
-        paper_links = soup.find_all('a', href=re.compile(r'^/papers/\d{4}\.\d{4,5}$'))
-        
-        for link in paper_links:
-            href = link.get('href', '')
-            match = re.search(r'/papers/(\d{4}\.\d{4,5})', href)
-            if match:
-                paper_id = match.group(1)
-                if paper_id not in paper_ids:
-                    paper_ids.append(paper_id)
-        
-        # Also try to extract from script tags (HF sometimes uses JSON data)
-        scripts = soup.find_all('script')
-        for script in scripts:
-            if script.string and 'papers' in script.string.lower():
-                # Try to find arxiv IDs in JSON data
-                ids_in_script = re.findall(r'"(\d{4}\.\d{4,5})"', script.string)
-                for pid in ids_in_script:
-                    if pid not in paper_ids:
-                        paper_ids.append(pid)
-    
-    return paper_ids
+    return [paper.id for paper in await fetch_month_listing(month, session=session)]
 
 
-async def fetch_daily_paper_ids(date_str: str) -> list[str]:
+async def fetch_daily_paper_ids(date_str: str, session: Optional[ScraperSession] = None) -> list[str]:
     """
-    Fetch all paper IDs from a daily listing page.
+    Fetch all paper IDs from a daily listing.
 
     Args:
         date_str: Date string in format YYYY-MM-DD (e.g., "2025-01-26")
+        session: Session to fetch with (see session_scope)
 
     Returns:
         List of arxiv paper IDs
     """
-    url = f"{HF_BASE_URL}/papers?date={date_str}"
-    paper_ids = []
+    return [paper.id for paper in await fetch_daily_listing(date_str, session=session)]
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'lxml')
+# ============= Paper Page Parsing =============
 
-        # Find all paper links - they follow pattern /papers/XXXX.XXXXX
-        paper_links = soup.find_all('a', href=re.compile(r'^/papers/\d{4}\.\d{4,5}$'))
+def _paper_from_page(
+    paper_id: str,
+    appeared_date: Optional[str],
+    title: str,
+    abstract: str,
+    published_date: str,
+    upvotes: int,
+    authors: list[str]
+) -> Paper:
+    """Build the Paper for fields extracted from a paper page."""
+    return Paper(
+        id=paper_id,
+        title=title,
+        abstract=abstract,
+        published_date=published_date,
+        hf_url=f"{HF_BASE_URL}/papers/{paper_id}",
+        arxiv_url=f"https://arxiv.org/abs/{paper_id}",
+        pdf_url=f"https://arxiv.org/pdf/{paper_id}.pdf",
+        upvotes=upvotes,
+        authors=authors,
+        # Content hash for change detection
+        content_hash=compute_content_hash(title, abstract),
+        appeared_date=appeared_date
+    )
 
-        for link in paper_links:
-            href = link.get('href', '')
-            match = re.search(r'/papers/(\d{4}\.\d{4,5})', href)
-            if match:
-                paper_id = match.group(1)
-                if paper_id not in paper_ids:
-                    paper_ids.append(paper_id)
 
-        # Also try to extract from script tags (HF sometimes uses JSON data)
-        scripts = soup.find_all('script')
-        for script in scripts:
-            if script.string and 'papers' in script.string.lower():
-                ids_in_script = re.findall(r'"(\d{4}\.\d{4,5})"', script.string)
-                for pid in ids_in_script:
-                    if pid not in paper_ids:
-                        paper_ids.append(pid)
+def parse_paper_page_soup(html: str, paper_id: str, appeared_date: Optional[str] = None) -> Paper:
+    """
+    Extract a paper from its HF page with BeautifulSoup.
 
-    return paper_ids
+    Reference implementation for parse_paper_page, which gives the same
+    result without building a BeautifulSoup tree (see `benchmark.py parsing`).
 
+    Args:
+        html: Paper page HTML
+        paper_id: The arxiv ID (e.g., "2512.24880")
+        appeared_date: Optional date when paper appeared on HF Daily Papers (YYYY-MM-DD)
 
-async def fetch_paper_details(paper_id: str, appeared_date: Optional[str] = None) -> Optional[Paper]:
+    Returns:
+        Paper object with all metadata
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    
+    # Extract title - usually in h1 or main heading
+    title = ""
+    title_elem = soup.find('h1')
+    if title_elem:
+        title = title_elem.get_text(strip=True)
+    
+    # Extract abstract - look for the abstract section
+    abstract = ""
+    # Try multiple selectors for abstract
+    abstract_selectors = [
+        ('p', {'class': re.compile(r'abstract', re.I)}),
+        ('div', {'class': re.compile(r'abstract', re.I)}),
+        ('section', {'id': 'abstract'}),
+    ]
+    
+    for tag, attrs in abstract_selectors:
+        elem = soup.find(tag, attrs)
+        if elem:
+            abstract = elem.get_text(strip=True)
+            break
+    
+    # If no abstract found, try to find it in meta tags
+    if not abstract:
+        meta_desc = soup.find('meta', {'name': 'description'})
+        if meta_desc:
+            abstract = meta_desc.get('content', '')
+    
+    # Try to find abstract in the page content
+    if not abstract:
+        # Look for text that looks like an abstract (long paragraph after title)
+        main_content = soup.find('main') or soup.find('article') or soup.body
+        if main_content:
+            paragraphs = main_content.find_all('p')
+            for p in paragraphs:
+                text = p.get_text(strip=True)
+                # Abstract is usually a substantial paragraph
+                if len(text) > 200 and not text.startswith('http'):
+                    abstract = text
+                    break
+    
+    # Extract upvotes - look for upvote count
+    upvotes = 0
+    upvote_elem = soup.find(string=re.compile(r'^\d+$'))
+    if upvote_elem:
+        parent = upvote_elem.find_parent()
+        if parent and ('upvote' in str(parent).lower() or 'like' in str(parent).lower()):
+            try:
+                upvotes = int(upvote_elem.strip())
+            except ValueError:
+                pass
+    
+    # Try to find upvotes in various places
+    for elem in soup.find_all(['span', 'div', 'button']):
+        classes = elem.get('class', [])
+        text = elem.get_text(strip=True)
+        if any('upvote' in c.lower() or 'like' in c.lower() for c in classes if isinstance(c, str)):
+            try:
+                upvotes = int(re.search(r'\d+', text).group())
+                break
+            except (ValueError, AttributeError):
+                pass
+    
+    # Extract authors
+    authors = []
+    # Look for author links or spans
+    author_section = soup.find(class_=re.compile(r'author', re.I))
+    if author_section:
+        author_links = author_section.find_all('a')
+        authors = [a.get_text(strip=True) for a in author_links if a.get_text(strip=True)]
+    
+    if not authors:
+        # Try meta tags
+        meta_authors = soup.find_all('meta', {'name': 'author'})
+        authors = [m.get('content', '') for m in meta_authors if m.get('content')]
+    
+    # Extract published date
+    published_date = ""
+    date_elem = soup.find('time')
+    if date_elem:
+        published_date = date_elem.get('datetime', '') or date_elem.get_text(strip=True)
+    
+    return _paper_from_page(paper_id, appeared_date, title, abstract, published_date, upvotes, authors)
+
+
+def _class_contains(word: str) -> str:
+    """XPath test for a case-insensitive substring of the class attribute."""
+    letters = "".join(dict.fromkeys(word))
+    return f"contains(translate(@class, '{letters.upper()}', '{letters}'), '{word}')"
+
+
+# Compiled once; each mirrors one lookup of parse_paper_page_soup. Written as
+# (nodes)[test][1] so that libxml2 stops at the first match in document order.
+_ABSTRACT_XPATHS = [
+    etree.XPath(f"(//p)[{_class_contains('abstract')}][1]"),
+    etree.XPath(f"(//div)[{_class_contains('abstract')}][1]"),
+    etree.XPath("(//section)[@id='abstract'][1]"),
+]
+_META_DESCRIPTION_XPATH = etree.XPath("(//meta)[@name='description'][1]")
+_AUTHOR_SECTION_XPATH = etree.XPath(f"(//*)[{_class_contains('author')}][1]")
+_META_AUTHORS_XPATH = etree.XPath("//meta[@name='author']/@content")
+# First text or comment node matching `^\d+$`: digits, optionally followed by a final newline
+_FIRST_NUMBER_NODE_XPATH = etree.XPath(
+    "(//text() | //comment())[translate(., '0123456789', '') = ''"
+    " or (string-length(.) > 1 and substring(., string-length(.)) = '\n'"
+    " and translate(substring(., 1, string-length(.) - 1), '0123456789', '') = '')][1]"
+)
+_UPVOTE_ELEMENTS = f"(//span | //div | //button)[{_class_contains('upvote')} or {_class_contains('like')}]"
+_UPVOTE_ELEMENTS_XPATH = etree.XPath(_UPVOTE_ELEMENTS)
+# Digits in the string value are necessary, not sufficient: get_text() skips script/style text
+_FIRST_NUMBERED_UPVOTE_XPATH = etree.XPath(f"{_UPVOTE_ELEMENTS}[translate(., '0123456789', '') != .][1]")
+
+# Tags whose contents BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = {"script", "style", "template"}
+
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def _strings(elem) -> list[str]:
+    """Text nodes under an element in document order, as get_text() sees them."""
+    strings = [elem.text] if elem.text else []
+    for child in elem:
+        # Skips comments, processing instructions and script/style/template contents
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            strings.extend(_strings(child))
+        if child.tail:
+            strings.append(child.tail)
+    return strings
+
+
+def _text(elem) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)."""
+    return "".join(s.strip() for s in _strings(elem) if s.strip())
+
+
+def _first(xpath, root):
+    """First match of a compiled XPath, like soup.find()."""
+    matches = xpath(root)
+    return matches[0] if matches else None
+
+
+def parse_paper_page(html: str, paper_id: str, appeared_date: Optional[str] = None) -> Paper:
+    """
+    Extract a paper from its HF page with lxml and compiled XPath.
+
+    Returns the same Paper as parse_paper_page_soup, but only the nodes
+    each field needs are visited; BeautifulSoup builds a second tree of
+    Python objects over the whole page, and its upvote lookup serializes
+    and scans many elements.
+
+    Args:
+        html: Paper page HTML
+        paper_id: The arxiv ID (e.g., "2512.24880")
+        appeared_date: Optional date when paper appeared on HF Daily Papers (YYYY-MM-DD)
+
+    Returns:
+        Paper object with all metadata
+    """
+    try:
+        root = lxml_html.document_fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+    except etree.ParserError:  # Empty document
+        return _paper_from_page(paper_id, appeared_date, "", "", "", 0, [])
+
+    # Title: first h1
+    title_elem = root.find('.//h1')
+    title = _text(title_elem) if title_elem is not None else ""
+
+    # Abstract: first element found by the selectors in order, then the meta description
+    abstract = ""
+    for xpath in _ABSTRACT_XPATHS:
+        elem = _first(xpath, root)
+        if elem is not None:
+            abstract = _text(elem)
+            break
+
+    if not abstract:
+        meta_desc = _first(_META_DESCRIPTION_XPATH, root)
+        if meta_desc is not None:
+            abstract = meta_desc.get('content', '')
+
+    if not abstract:
+        # A substantial paragraph in the main content
+        main_content = next(
+            (elem for elem in (root.find('.//main'), root.find('.//article'), root.find('body'))
+             if elem is not None),
+            None
+        )
+        if main_content is not None:
+            for p in main_content.iterdescendants('p'):
+                text = _text(p)
+                if len(text) > 200 and not text.startswith('http'):
+                    abstract = text
+                    break
+
+    # Upvotes: the first number on the page when its parent mentions upvotes or
+    # likes, overridden by the first upvote/like-classed element with a number
+    upvotes = 0
+    number = _first(_FIRST_NUMBER_NODE_XPATH, root)
+    if number is not None:
+        if isinstance(number, str):
+            string = str(number)
+            parent = number.getparent().getparent() if number.is_tail else number.getparent()
+        else:  # Comment
+            string, parent = number.text or "", number.getparent()
+        if re.search(r'^\d+$', string) and parent is not None:
+            markup = etree.tostring(parent, encoding=str, method="html", with_tail=False).lower()
+            if 'upvote' in markup or 'like' in markup:
+                upvotes = int(string.strip())
+
+    numbered = _first(_FIRST_NUMBERED_UPVOTE_XPATH, root)
+    if numbered is not None:
+        match = re.search(r'\d+', _text(numbered))
+        if match is None:  # Its digits were script/style text; check every candidate
+            match = next(filter(None, (re.search(r'\d+', _text(e)) for e in _UPVOTE_ELEMENTS_XPATH(root))), None)
+        if match:
+            upvotes = int(match.group())
+
+    # Authors: links in the first author-classed element, else meta tags
+    authors = []
+    author_section = _first(_AUTHOR_SECTION_XPATH, root)
+    if author_section is not None:
+        authors = [text for text in (_text(a) for a in author_section.iterdescendants('a')) if text]
+    if not authors:
+        authors = [str(content) for content in _META_AUTHORS_XPATH(root) if content]
+
+    # Published date: first <time>
+    published_date = ""
+    date_elem = root.find('.//time')
+    if date_elem is not None:
+        published_date = date_elem.get('datetime', '') or _text(date_elem)
+
+    return _paper_from_page(paper_id, appeared_date, title, abstract, published_date, upvotes, authors)
+
+
+async def fetch_paper_details(
+    paper_id: str,
+    appeared_date: Optional[str] = None,
+    session: Optional[ScraperSession] = None
+) -> Optional[Paper]:
     """
     Fetch detailed information for a single paper from its HF page.
 
     Args:
         paper_id: The arxiv ID (e.g., "2512.24880")
         appeared_date: Optional date when paper appeared on HF Daily Papers (YYYY-MM-DD)
+        session: Session to fetch with (see session_scope)
 
     Returns:
         Paper object with all metadata, or None if fetch fails
     """
-    url = f"{HF_BASE_URL}/papers/{paper_id}"
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with session_scope(session) as session:
         try:
-            response = await client.get(url, follow_redirects=True)
-            response.raise_for_status()
+            response = await session.get(f"{HF_BASE_URL}/papers/{paper_id}")
         except httpx.HTTPError as e:
             print(f"Failed to fetch paper {paper_id}: {e}")
             return None
-        
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        # Extract title - usually in h1 or main heading
-        title = ""
-        title_elem = soup.find('h1')
-        if title_elem:
-            title = title_elem.get_text(strip=True)
-        
-        # Extract abstract - look for the abstract section
-        abstract = ""
-        # Try multiple selectors for abstract
-        abstract_selectors = [
-            ('p', {'class': re.compile(r'abstract', re.I)}),
-            ('div', {'class': re.compile(r'abstract', re.I)}),
-            ('section', {'id': 'abstract'}),
-        ]
-        
-        for tag, attrs in abstract_selectors:
-            elem = soup.find(tag, attrs)
-            if elem:
-                abstract = elem.get_text(strip=True)
-                break
-        
-        # If no abstract found, try to find it in meta tags
-        if not abstract:
-            meta_desc = soup.find('meta', {'name': 'description'})
-            if meta_desc:
-                abstract = meta_desc.get('content', '')
-        
-        # Try to find abstract in the page content
-        if not abstract:
-            # Look for text that looks like an abstract (long paragraph after title)
-            main_content = soup.find('main') or soup.find('article') or soup.body
-            if main_content:
-                paragraphs = main_content.find_all('p')
-                for p in paragraphs:
-                    text = p.get_text(strip=True)
-                    # Abstract is usually a substantial paragraph
-                    if len(text) > 200 and not text.startswith('http'):
-                        abstract = text
-                        break
-        
-        # Extract upvotes - look for upvote count
-        upvotes = 0
-        upvote_elem = soup.find(string=re.compile(r'^\d+$'))
-        if upvote_elem:
-            parent = upvote_elem.find_parent()
-            if parent and ('upvote' in str(parent).lower() or 'like' in str(parent).lower()):
-                try:
-                    upvotes = int(upvote_elem.strip())
-                except ValueError:
-                    pass
-        
-        # Try to find upvotes in various places
-        for elem in soup.find_all(['span', 'div', 'button']):
-            classes = elem.get('class', [])
-            text = elem.get_text(strip=True)
-            if any('upvote' in c.lower() or 'like' in c.lower() for c in classes if isinstance(c, str)):
-                try:
-                    upvotes = int(re.search(r'\d+', text).group())
-                    break
-                except (ValueError, AttributeError):
-                    pass
-        
-        # Extract authors
-        authors = []
-        # Look for author links or spans
-        author_section = soup.find(class_=re.compile(r'author', re.I))
-        if author_section:
-            author_links = author_section.find_all('a')
-            authors = [a.get_text(strip=True) for a in author_links if a.get_text(strip=True)]
-        
-        if not authors:
-# Try meta tags
-            meta_authors = soup.find_all('meta', {'name': 'author'})
-            authors = [m.get('content', '') for m in meta_authors if m.get('content')]
-        
-        # Extract published date
-        published_date = ""
-        date_elem = soup.find('time')
-        if date_elem:
-            published_date = date_elem.get('datetime', '') or date_elem.get_text(strip=True)
-        
-        # Build URLs
-        hf_url = url
-        arxiv_url = f"https://arxiv.org/abs/{paper_id}"
-        pdf_url = f"https://arxiv.org/pdf/{paper_id}.pdf"
-        
-        # Compute content hash for change detection
-        content_hash = compute_content_hash(title, abstract)
-        
-        return Paper(
-            id=paper_id,
-            title=title,
-            abstract=abstract,
-            published_date=published_date,
-            hf_url=hf_url,
-            arxiv_url=arxiv_url,
-            pdf_url=pdf_url,
-            upvotes=upvotes,
-            authors=authors,
-            content_hash=content_hash,
-            appeared_date=appeared_date
-        )
 
+    return parse_paper_page(response.text, paper_id, appeared_date)
+
+
+async def fetch_papers_concurrently(
+    paper_ids: list[str],
+    session: ScraperSession,
+    appeared_date: Optional[str] = None
+) -> AsyncIterator[tuple[str, Optional[Paper]]]:
+    """
+    Fetch paper detail pages concurrently, yielding results as they finish.
+
+    Up to session.concurrency pages are fetched at once, paced by the
+    session's rate limiter. Closing the iterator early cancels the fetches
+    still running.
+
+    Args:
+        paper_ids: Arxiv IDs to fetch
+        session: Session to fetch with
+        appeared_date: Optional date when the papers appeared on HF Daily Papers
+
+    Yields:
+        (paper_id, paper) in completion order; paper is None if the fetch failed
+    """
+    results: asyncio.Queue = asyncio.Queue()
+    pending = iter(paper_ids)
+
+    async def worker():
+        for paper_id in pending:
+            try:
+                paper = await fetch_paper_details(paper_id, appeared_date, session=session)
+            except Exception as e:
+                print(f"Failed to parse paper {paper_id}: {e}")
+                paper = None
+            await results.put((paper_id, paper))
 
-async def scrape_month(month: str, progress_callback=None) -> list[Paper]:
+    workers = [asyncio.create_task(worker()) for _ in range(min(session.concurrency, len(paper_ids)))]
+    try:
+        for _ in range(len(paper_ids)):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def fetch_listing_papers(
+    listing: list[ListingPaper],
+    session: ScraperSession,
+    appeared_date: Optional[str] = None,
+    progress_callback=None
+) -> list[Paper]:
+    """
+    Turn listing entries into Papers, fetching paper pages only where needed.
+
+    Entries with every field are used as-is. The rest are fetched
+    concurrently and only their missing fields are taken from the paper
+    page; fields neither source has are left empty. An entry is dropped
+    (and logged) only when neither the listing nor the page gives a title.
+
+    Args:
+        listing: Listing papers (see fetch_daily_listing / fetch_month_listing)
+        session: Session to fetch with
+        appeared_date: Optional date when the papers appeared on HF Daily Papers
+        progress_callback: Optional callback(completed, total, paper_id) called as each paper finishes
+
+    Returns:
+        List of Paper objects in listing order
+    """
+    papers: dict[str, Optional[Paper]] = {}
+    entries = {entry.id: entry for entry in listing}
+    incomplete = [paper_id for paper_id, entry in entries.items() if entry.missing_fields()]
+
+    def done(paper_id: str, paper: Optional[Paper]):
+        if paper is None:
+            print(f"Dropping paper {paper_id}: no title in the listing or on its page")
+        papers[paper_id] = paper
+        if progress_callback:
+            progress_callback(len(papers), len(entries), paper_id)
+
+    for paper_id, entry in entries.items():
+        if not entry.missing_fields():
+            done(paper_id, entry.to_paper(appeared_date))
+
+    if incomplete:
+        print(f"Fetching {len(incomplete)} paper pages for fields missing from the listing")
+    async for paper_id, detail in fetch_papers_concurrently(incomplete, session, appeared_date):
+        done(paper_id, entries[paper_id].to_paper(appeared_date, detail))
+        print(f"Fetched paper {len(papers)}/{len(entries)}: {paper_id}")
+
+    return [papers[paper_id] for paper_id in entries if papers.get(paper_id)]
+
+
+async def scrape_month(
+    month: str,
+    progress_callback=None,
+    session: Optional[ScraperSession] = None
+) -> list[Paper]:
     """
     Scrape all papers for a given month.
     
     Args:
         month: Month string in format YYYY-MM
-        progress_callback: Optional callback(current, total, paper_id) for progress updates
+        progress_callback: Optional callback(completed, total, paper_id) called as each paper finishes
+        session: Session shared by every request of the crawl (see session_scope)
     
     Returns:
-        List of Paper objects
+        List of Paper objects in listing order
     """
-    print(f"Fetching paper list for month {month}...")
-    paper_ids = await fetch_month_paper_ids(month)
-    print(f"Found {len(paper_ids)} papers")
-    
-    papers = []
-    for i, paper_id in enumerate(paper_ids):
-        if progress_callback:
-            progress_callback(i + 1, len(paper_ids), paper_id)
-        
-        print(f"Fetching paper {i + 1}/{len(paper_ids)}: {paper_id}")
-        paper = await fetch_paper_details(paper_id)
-        if paper:
-            papers.append(paper)
-    
-    return papers
+    async with session_scope(session) as session:
+        print(f"Fetching paper list for month {month}...")
+        listing = await fetch_month_listing(month, session=session)
+        print(f"Found {len(listing)} papers")
+        papers = await fetch_listing_papers(listing, session, progress_callback=progress_callback)
+        if session.cache:
+            print(session.cache.summary())
+        return papers
 
 
-async def scrape_daily(date_str: str, progress_callback=None) -> list[Paper]:
+async def scrape_daily(
+    date_str: str,
+    progress_callback=None,
+    session: Optional[ScraperSession] = None
+) -> list[Paper]:
     """
     Scrape all papers for a specific date from HF Daily Papers.
 
     Args:
         date_str: Date string in format YYYY-MM-DD
-        progress_callback: Optional callback(current, total, paper_id)
+        progress_callback: Optional callback(completed, total, paper_id) called as each paper finishes
+        session: Session shared by every request of the crawl (see session_scope)
 
     Returns:
-        List of Paper objects
+        List of Paper objects in listing order
     """
-    print(f"Fetching paper list for date {date_str}...")
-    paper_ids = await fetch_daily_paper_ids(date_str)
-    print(f"Found {len(paper_ids)} papers")
-
-    papers = []
-    for i, paper_id in enumerate(paper_ids):
-        if progress_callback:
-            progress_callback(i + 1, len(paper_ids), paper_id)
-
-        print(f"Fetching paper {i + 1}/{len(paper_ids)}: {paper_id}")
-        paper = await fetch_paper_details(paper_id, appeared_date=date_str)
-        if paper:
-            papers.append(paper)
-
-    return papers
+    async with session_scope(session) as session:
+        print(f"Fetching paper list for date {date_str}...")
+        listing = await fetch_daily_listing(date_str, session=session)
+        print(f"Found {len(listing)} papers")
+        papers = await fetch_listing_papers(listing, session, date_str, progress_callback)
+        if session.cache:
+            print(session.cache.summary())
+        return papers
 
 
 async def scrape_date_range(
     start_date: str,
     end_date: str,
     weekdays_only: bool = True,
-    progress_callback=None
+    progress_callback=None,
+    session: Optional[ScraperSession] = None
 ) -> list[Paper]:
     """
     Scrape papers for a range of dates.
@@ -312,6 +1006,7 @@ async def scrape_date_range(
         end_date: End date in format YYYY-MM-DD
         weekdays_only: If True, only scrape Monday-Friday (default True)
         progress_callback: Optional callback(date, current, total)
+        session: Session shared by every request of the crawl (see session_scope)
 
     Returns:
         List of Paper objects (may contain duplicates across days)
@@ -331,22 +1026,23 @@ async def scrape_date_range(
     all_papers = []
     seen_ids = set()
 
-    for i, d in enumerate(dates):
-        date_str = d.strftime("%Y-%m-%d")
-        print(f"\n=== Scraping {date_str} ({i + 1}/{len(dates)}) ===")
+    async with session_scope(session) as session:
+        for i, d in enumerate(dates):
+            date_str = d.strftime("%Y-%m-%d")
+            print(f"\n=== Scraping {date_str} ({i + 1}/{len(dates)}) ===")
 
-        if progress_callback:
-            progress_callback(date_str, i + 1, len(dates))
+            if progress_callback:
+                progress_callback(date_str, i + 1, len(dates))
 
-        papers = await scrape_daily(date_str)
+            papers = await scrape_daily(date_str, session=session)
 
-        # Deduplicate (same paper may appear on multiple days)
-        for paper in papers:
-            if paper.id not in seen_ids:
-                all_papers.append(paper)
-                seen_ids.add(paper.id)
-            else:
-                print(f"  Skipping duplicate: {paper.id}")
+            # Deduplicate (same paper may appear on multiple days)
+            for paper in papers:
+                if paper.id not in seen_ids:
+                    all_papers.append(paper)
+                    seen_ids.add(paper.id)
+                else:
+                    print(f"  Skipping duplicate: {paper.id}")
 
     print(f"\nTotal unique papers scraped: {len(all_papers)}")
     return all_papers
@@ -0,0 +1,100 @@
+"""
+Response serialization for the HF Papers Explorer API.
+
+Responses are encoded with orjson, or with MessagePack when the client asks
+for it in the Accept header and msgpack is installed. Pydantic models are
+dumped by pydantic-core while encoding, so handlers that already built
+trusted models skip FastAPI's jsonable_encoder and response_model passes.
+"""
+
+from contextvars import ContextVar
+from typing import Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic_core import to_jsonable_python
+
+try:
+    import msgpack
+except ImportError:  # Optional: MessagePack responses are disabled without it
+    msgpack = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+MEDIA_TYPES = {
+    "json": JSON_MEDIA_TYPE,
+    "msgpack": MSGPACK_MEDIA_TYPE,
+}
+
+# Format chosen for the current request (see negotiate_format)
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def _quality(params: list[str]) -> float:
+    for param in params:
+        name, _, value = param.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def format_for_accept(accept: Optional[str]) -> str:
+    """
+    Pick "json" or "msgpack" for an Accept header.
+
+    MessagePack is chosen only when it is installed and the client ranks it
+    above an explicit application/json; wildcards and ties get JSON.
+    """
+    if not accept or msgpack is None:
+        return "json"
+    json_q = msgpack_q = 0.0
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        media_type = media_type.strip().lower()
+        if media_type == JSON_MEDIA_TYPE:
+            json_q = max(json_q, _quality(params))
+        elif media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, _quality(params))
+    return "msgpack" if msgpack_q > json_q else "json"
+
+
+async def negotiate_format(request: Request):
+    """
+    App-wide dependency recording the response format for this request.
+
+    Must stay async so it runs in the request's own context, where the
+    response class reads it back.
+    """
+    response_format.set(format_for_accept(request.headers.get("accept")))
+
+
+def encode(content, fmt: str = "json") -> bytes:
+    """Encode content (builtins, pydantic models, datetimes, ...) as JSON or MessagePack."""
+    if fmt == "msgpack":
+        return msgpack.packb(content, default=to_jsonable_python)
+    return orjson.dumps(content, default=to_jsonable_python, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastResponse(Response):
+    """
+    Response encoded in the negotiated format (orjson JSON by default).
+
+    Used as the app's default response class; handlers can also return it
+    directly with pydantic models as content to skip response_model validation.
+    """
+    media_type = JSON_MEDIA_TYPE
+
+    def __init__(self, content=None, status_code: int = 200, headers=None, media_type=None, background=None, format: Optional[str] = None):
+        self.format = format or response_format.get()
+        headers = {**(headers or {}), "Vary": "Accept"}
+        super().__init__(content, status_code, headers, media_type or MEDIA_TYPES[self.format], background)
+
+    def render(self, content) -> bytes:
+        return encode(content, self.format)
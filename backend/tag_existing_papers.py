@@ -5,10 +5,10 @@ This is useful after downloading papers day-by-day.
 """
 
 import asyncio
-import aiosqlite
 from database import (
-    DATABASE_PATH, init_database, get_all_papers, get_paper_tags,
-    save_paper_tags, save_taxonomy, get_taxonomy, Taxonomy
+    init_database, close_database, read_connection, get_all_papers, get_papers_needing_tags,
+    save_paper_tags_many, save_taxonomy, get_taxonomy, Taxonomy,
+    BULK_WRITE_BATCH_SIZE
 )
 from llm_tagger import (
     tag_paper_heuristic, tag_paper,
@@ -18,7 +18,10 @@ from llm_tagger import (
 
 async def tag_all_existing_papers(month: str = "2026-01", use_llm: bool = False, provider: str = None):
     """
-    Tag all papers in the database that don't have tags yet.
+    Tag all papers in the database that don't have current tags yet.
+
+    Papers whose tags were made from their present content and taxonomy
+    version are skipped.
 
     Args:
         month: Month string for taxonomy (YYYY-MM format)
@@ -44,20 +47,18 @@ async def tag_all_existing_papers(month: str = "2026-01", use_llm: bool = False,
     papers = await get_all_papers()
     print(f"Found {len(papers)} papers in database")
 
-    # Count papers without tags
-    untagged = []
-    for paper in papers:
-        existing_tags = await get_paper_tags(paper.id)
-        if not existing_tags:
-            untagged.append(paper)
+    # Skip papers whose tags are still current
+    untagged = await get_papers_needing_tags(papers, taxonomy)
+    skipped = len(papers) - len(untagged)
 
-    print(f"Papers without tags: {len(untagged)}")
+    print(f"Papers without current tags: {len(untagged)} ({skipped} unchanged, skipped)")
 
     if not untagged:
         print("All papers are already tagged!")
         return
 
-    # Tag untagged papers
+    # Tag untagged papers (flushed to the database in batches)
+    pending_tags = []
     for i, paper in enumerate(untagged):
         print(f"Tagging {i + 1}/{len(untagged)}: {paper.id} - {paper.title[:50]}...")
 
@@ -66,12 +67,17 @@ async def tag_all_existing_papers(month: str = "2026-01", use_llm: bool = False,
         else:
             tags = tag_paper_heuristic(paper, taxonomy)
 
-        await save_paper_tags(tags)
+        pending_tags.append(tags)
+        if len(pending_tags) >= BULK_WRITE_BATCH_SIZE:
+            await save_paper_tags_many(pending_tags)
+            pending_tags = []
+
+    await save_paper_tags_many(pending_tags)
 
-    print(f"\nDone! Tagged {len(untagged)} papers.")
+    print(f"\nDone! Tagged {len(untagged)} papers, skipped {skipped} unchanged.")
 
     # Verify
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with read_connection() as db:
         async with db.execute("SELECT COUNT(*) FROM paper_tags") as cursor:
             total_tagged = (await cursor.fetchone())[0]
             print(f"Total papers with tags: {total_tagged}")
@@ -79,7 +85,7 @@ async def tag_all_existing_papers(month: str = "2026-01", use_llm: bool = False,
 
 async def retag_all_papers(month: str = "2026-01", use_llm: bool = False, provider: str = None):
     """
-    Re-tag ALL papers (overwriting existing tags).
+    Re-tag ALL papers (overwriting existing tags, even unchanged ones).
 
     Args:
         month: Month string for taxonomy (YYYY-MM format)
@@ -106,6 +112,8 @@ async def retag_all_papers(month: str = "2026-01", use_llm: bool = False, provid
     print(f"Found {len(papers)} papers in database")
     print("Re-tagging ALL papers...")
 
+    # Flushed to the database in batches, as in tag_all_existing_papers
+    pending_tags = []
     for i, paper in enumerate(papers):
         print(f"Tagging {i + 1}/{len(papers)}: {paper.id} - {paper.title[:50]}...")
 
@@ -114,7 +122,12 @@ async def retag_all_papers(month: str = "2026-01", use_llm: bool = False, provid
         else:
             tags = tag_paper_heuristic(paper, taxonomy)
 
-        await save_paper_tags(tags)
+        pending_tags.append(tags)
+        if len(pending_tags) >= BULK_WRITE_BATCH_SIZE:
+            await save_paper_tags_many(pending_tags)
+            pending_tags = []
+
+    await save_paper_tags_many(pending_tags)
 
     print(f"\nDone! Tagged {len(papers)} papers.")
 
@@ -130,12 +143,15 @@ async def main():
         if arg.startswith("--provider="):
             provider = arg.split("=")[1]
 
-    if retag:
-        print("Re-tagging ALL papers (overwriting existing tags)...")
-        await retag_all_papers(use_llm=use_llm, provider=provider)
-    else:
-        print("Tagging papers that don't have tags yet...")
-        await tag_all_existing_papers(use_llm=use_llm, provider=provider)
+    try:
+        if retag:
+            print("Re-tagging ALL papers (overwriting existing tags)...")
+            await retag_all_papers(use_llm=use_llm, provider=provider)
+        else:
+            print("Tagging papers that don't have tags yet...")
+            await tag_all_existing_papers(use_llm=use_llm, provider=provider)
+    finally:
+        await close_database()
 
 
 if __name__ == "__main__":
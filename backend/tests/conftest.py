@@ -36,14 +36,26 @@ async def setup_test_database(monkeypatch):
     import database
     monkeypatch.setattr(database, "DATABASE_PATH", TEST_DATABASE_PATH)
 
+    # Scraper sessions must not read or fill the on-disk page cache
+    import http_cache
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_ENABLED", False)
+
     # Initialize fresh database
     await database.init_database()
 
     yield
 
-    # Clean up test database
-    if TEST_DATABASE_PATH.exists():
-        TEST_DATABASE_PATH.unlink()
+    # Close pooled connections before removing the files
+    await database.close_database()
+
+    # Clean up test database (and its WAL side files)
+    for path in (
+        TEST_DATABASE_PATH,
+        TEST_DATABASE_PATH.with_name(TEST_DATABASE_PATH.name + "-wal"),
+        TEST_DATABASE_PATH.with_name(TEST_DATABASE_PATH.name + "-shm"),
+    ):
+        if path.exists():
+            path.unlink()
 
 
 @pytest.fixture
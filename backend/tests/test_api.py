@@ -2,6 +2,12 @@
 Tests for FastAPI endpoints.
 """
 
+import asyncio
+import csv
+import io
+import json
+from collections import defaultdict
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 from unittest.mock import AsyncMock, patch
@@ -10,12 +16,16 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from main import app
+from main import app, response_cache, build_cluster_graph, build_cluster_facets, first_page_cards, slugify
+from benchmark import synthetic_papers_with_tags
+from database import Paper, PaperTags
 
 
 @pytest.fixture
 async def client():
     """Create async test client."""
+    # Each test starts from a fresh database, so drop responses cached by earlier tests
+    response_cache.clear()
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -35,6 +45,556 @@ class TestHealthEndpoint:
         assert "service" in data
 
 
+class TestMonthEndpoints:
+    """Tests for /api/months/{month}/* endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_month_summary(self, client, populated_database):
+        """Summary should count papers and list clusters."""
+        response = await client.get("/api/months/2024-01/summary")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totalPapers"] == len(populated_database["papers"])
+        assert sum(c["paperCount"] for c in data["clusters"]) == data["totalPapers"]
+        assert data["taxonomy"]["contribution_tags"] == populated_database["taxonomy"].contribution_tags
+
+    @pytest.mark.asyncio
+    async def test_month_summary_empty(self, client):
+        """Summary for an unindexed month should be empty."""
+        response = await client.get("/api/months/1999-01/summary")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totalPapers"] == 0
+        assert data["clusters"] == []
+
+    @pytest.mark.asyncio
+    async def test_month_clusters(self, client, populated_database):
+        """Clusters should be sorted by paper count with top tags."""
+        response = await client.get("/api/months/2024-01/clusters")
+
+        assert response.status_code == 200
+        clusters = response.json()
+        assert len(clusters) == 5
+        counts = [c["paperCount"] for c in clusters]
+        assert counts == sorted(counts, reverse=True)
+        llm = next(c for c in clusters if c["name"] == "LLM / Foundation Models")
+        assert llm["clusterId"] == "llm-foundation-models"
+        assert llm["topModalities"] == ["text"]
+
+    @pytest.mark.asyncio
+    async def test_month_papers_task_filter(self, client, populated_database):
+        """Task filter should only return papers with that task tag."""
+        response = await client.get("/api/months/2024-01/papers", params={"task": "reasoning"})
+
+        assert response.status_code == 200
+        cards = response.json()
+        assert len(cards) == 10
+        assert all("reasoning" in c["taskTags"] for c in cards)
+
+    @pytest.mark.asyncio
+    async def test_month_papers_modality_filter(self, client, populated_database):
+        """Modality filter should only return papers with that modality."""
+        response = await client.get("/api/months/2024-01/papers", params={"modality": "image"})
+
+        assert response.status_code == 200
+        cards = response.json()
+        assert cards
+        assert all("image" in c["modality"] for c in cards)
+
+
+class TestPaperListingPagination:
+    """Tests for SQL-paginated paper listings."""
+
+    @pytest.mark.asyncio
+    async def test_month_papers_cursor_pagination(self, client, populated_database):
+        """X-Next-Cursor should page through the month without overlap."""
+        first = await client.get("/api/months/2024-01/papers", params={"limit": 15})
+        assert first.status_code == 200
+        cursor = first.headers["x-next-cursor"]
+
+        second = await client.get("/api/months/2024-01/papers", params={"limit": 15, "cursor": cursor})
+        assert second.status_code == 200
+        assert "x-next-cursor" not in second.headers
+
+        ids = [c["paperId"] for c in first.json() + second.json()]
+        assert len(ids) == 20
+        assert len(set(ids)) == 20
+
+    @pytest.mark.asyncio
+    async def test_month_papers_offset_and_cluster(self, client, populated_database):
+        """Offset pagination and cluster slugs should still work."""
+        response = await client.get(
+            "/api/months/2024-01/papers",
+            params={"cluster": "computer-vision", "limit": 2, "offset": 1}
+        )
+
+        assert response.status_code == 200
+        cards = response.json()
+        assert len(cards) == 2
+        assert all(c["primaryTag"] == "Computer Vision" for c in cards)
+
+    @pytest.mark.asyncio
+    async def test_month_papers_unknown_cluster(self, client, populated_database):
+        """Unknown cluster slugs should return no papers."""
+        response = await client.get("/api/months/2024-01/papers", params={"cluster": "nope"})
+        assert response.json() == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client, populated_database):
+        """A cursor from another sort order should be rejected."""
+        first = await client.get("/api/months/2024-01/papers", params={"limit": 5})
+        response = await client.get(
+            "/api/months/2024-01/papers",
+            params={"limit": 5, "sort_by": "date", "cursor": first.headers["x-next-cursor"]}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_cluster_papers(self, client, populated_database):
+        """Cluster endpoint should return that cluster sorted by confidence."""
+        response = await client.get(
+            "/api/clusters/efficient-ai/papers",
+            params={"month": "2024-01", "sort_by": "confidence"}
+        )
+
+        assert response.status_code == 200
+        cards = response.json()
+        assert len(cards) == 4
+        assert all(c["primaryTag"] == "Efficient AI" for c in cards)
+
+
+class TestResponseCache:
+    """Tests for cached month and cluster responses."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_is_a_hit(self, client, populated_database):
+        """The second identical request should be served from the cache."""
+        first = await client.get("/api/months/2024-01/summary")
+        second = await client.get("/api/months/2024-01/summary")
+
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == first.json()
+
+    @pytest.mark.asyncio
+    async def test_hit_keeps_cursor_header(self, client, populated_database):
+        """Cached listings should still carry X-Next-Cursor."""
+        first = await client.get("/api/months/2024-01/papers", params={"limit": 5})
+        second = await client.get("/api/months/2024-01/papers", params={"limit": 5})
+
+        assert second.headers["x-cache"] == "HIT"
+        assert second.headers["x-next-cursor"] == first.headers["x-next-cursor"]
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_month(self, client, populated_database):
+        """A tag write should serve the old body once, then the refreshed one."""
+        from database import save_paper_tags
+        await client.get("/api/months/2024-01/clusters")
+
+        tags = populated_database["tags"][0]
+        await save_paper_tags(tags.model_copy(update={"primary_contribution_tag": "Brand New Cluster"}))
+
+        stale = await client.get("/api/months/2024-01/clusters")
+        assert stale.headers["x-cache"] == "STALE"
+        assert "Brand New Cluster" not in {c["name"] for c in stale.json()}
+
+        await asyncio.sleep(0.05)  # Let the background refresh finish
+        fresh = await client.get("/api/months/2024-01/clusters")
+        assert fresh.headers["x-cache"] == "HIT"
+        assert "Brand New Cluster" in {c["name"] for c in fresh.json()}
+
+    @pytest.mark.asyncio
+    async def test_other_month_not_invalidated(self, client, populated_database):
+        """Writes to one month should not touch another month's entries."""
+        from database import save_taxonomy
+        await client.get("/api/months/1999-01/summary")
+
+        await save_taxonomy(populated_database["taxonomy"])
+
+        response = await client.get("/api/months/1999-01/summary")
+        assert response.headers["x-cache"] == "HIT"
+
+
+class TestMonthsEndpoint:
+    """Tests for /api/months."""
+
+    @pytest.mark.asyncio
+    async def test_lists_indexed_months(self, client, populated_database):
+        """Only months with papers are listed, with their counts."""
+        response = await client.get("/api/months")
+
+        assert response.status_code == 200
+        months = response.json()["months"]
+        assert [(m["month"], m["paperCount"], m["taggedCount"]) for m in months] == [("2024-01", 20, 20)]
+        assert months[0]["lastUpdated"]
+
+    @pytest.mark.asyncio
+    async def test_empty_database(self, client):
+        response = await client.get("/api/months")
+        assert response.json() == {"months": []}
+
+    @pytest.mark.asyncio
+    async def test_served_from_cache_until_a_write(self, client, populated_database, sample_paper):
+        """The index should be cached and rebuilt after indexers write."""
+        from database import upsert_paper
+        await client.get("/api/months")
+        assert (await client.get("/api/months")).headers["x-cache"] == "HIT"
+
+        await upsert_paper(sample_paper.model_copy(update={"id": "2402.00001", "appeared_date": "2024-02-03"}))
+        assert (await client.get("/api/months")).headers["x-cache"] == "STALE"
+
+        await asyncio.sleep(0.05)  # Let the background refresh finish
+        fresh = await client.get("/api/months")
+        assert [m["month"] for m in fresh.json()["months"]] == ["2024-02", "2024-01"]
+
+
+class TestConditionalRequests:
+    """Tests for ETag / If-None-Match handling."""
+
+    @pytest.mark.asyncio
+    async def test_summary_not_modified(self, client, populated_database):
+        """A matching If-None-Match should get an empty 304 with the same ETag."""
+        first = await client.get("/api/months/2024-01/summary")
+        etag = first.headers["etag"]
+
+        second = await client.get("/api/months/2024-01/summary", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+
+    @pytest.mark.asyncio
+    async def test_etag_depends_on_params(self, client, populated_database):
+        """Different query parameters should not share an ETag."""
+        first = await client.get("/api/months/2024-01/papers", params={"limit": 5})
+        second = await client.get("/api/months/2024-01/papers", params={"limit": 6})
+        assert first.headers["etag"] != second.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_write_changes_etag(self, client, populated_database):
+        """A write to the month should make the old ETag stop matching."""
+        from database import save_taxonomy
+        first = await client.get("/api/months/2024-01/summary")
+
+        await save_taxonomy(populated_database["taxonomy"])
+
+        response = await client.get(
+            "/api/months/2024-01/summary", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert response.status_code == 200
+
+        # The stale body keeps its old ETag; the refreshed one gets the new ETag
+        await asyncio.sleep(0.05)
+        refreshed = await client.get("/api/months/2024-01/summary")
+        assert refreshed.headers["etag"] != first.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_flow_not_modified_skips_computation(self, client, populated_database):
+        """A 304 should be answered before the aggregation runs."""
+        params = {"start_date": "2024-01-01", "end_date": "2024-01-14"}
+        first = await client.get("/api/flow", params=params)
+        assert first.status_code == 200
+
+        with patch("main.compute_flow_data", new_callable=AsyncMock) as compute:
+            response = await client.get(
+                "/api/flow", params=params, headers={"If-None-Match": f'W/{first.headers["etag"]}'}
+            )
+
+        assert response.status_code == 304
+        compute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_emerging_report_not_modified(self, client, populated_database):
+        """The emerging report should honour If-None-Match, including the * form."""
+        params = {"end_date": "2024-01-14"}
+        first = await client.get("/api/emerging/report", params=params)
+        assert first.headers["etag"]
+
+        response = await client.get("/api/emerging/report", params=params, headers={"If-None-Match": "*"})
+        assert response.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_snapshot_changes_global_etag(self, client, populated_database):
+        """Upvote snapshots should invalidate endpoints that read across months."""
+        from database import record_upvote_snapshot
+        params = {"start_date": "2024-01-01", "end_date": "2024-01-14"}
+        first = await client.get("/api/emerging/hot", params=params)
+
+        await record_upvote_snapshot(populated_database["papers"][0].id, "2024-01-15", 999)
+
+        response = await client.get("/api/emerging/hot", params=params, headers={"If-None-Match": first.headers["etag"]})
+        assert response.status_code == 200
+
+
+def _pairwise_shared_counts(papers_with_tags: list[dict]) -> dict[tuple[str, str], int]:
+    """The original pairwise link computation, kept as a reference for sharedCount."""
+    paper_ids = defaultdict(set)
+    cluster_tasks = defaultdict(set)
+    task_to_papers = defaultdict(set)
+    paper_to_clusters = defaultdict(set)
+    for item in papers_with_tags:
+        tags, paper = item["tags"], item["paper"]
+        paper_ids[tags.primary_contribution_tag].add(paper.id)
+        paper_to_clusters[paper.id].update([tags.primary_contribution_tag, *tags.secondary_contribution_tags])
+        for task in tags.task_tags:
+            cluster_tasks[tags.primary_contribution_tag].add(task)
+            task_to_papers[task].add(paper.id)
+
+    counts = {}
+    names = list(paper_ids)
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            shared = {p for p in paper_ids[first] if second in paper_to_clusters[p]}
+            shared |= {p for p in paper_ids[second] if first in paper_to_clusters[p]}
+            common_tasks = cluster_tasks[first] & cluster_tasks[second]
+            for task in common_tasks:
+                shared |= paper_ids[first] & task_to_papers[task]
+            if shared or common_tasks:
+                counts[(slugify(first), slugify(second))] = len(shared) + len(common_tasks)
+    return counts
+
+
+def _item(paper_id: str, primary: str, secondary: list[str], tasks: list[str]) -> dict:
+    return {
+        "paper": Paper(id=paper_id, title="", abstract="", published_date="", hf_url=""),
+        "tags": PaperTags(
+            paper_id=paper_id, month="2024-01", primary_contribution_tag=primary,
+            secondary_contribution_tags=secondary, task_tags=tasks,
+        ),
+    }
+
+
+class TestClusterGraph:
+    """Tests for build_cluster_graph and the cluster-graph endpoint."""
+
+    @pytest.mark.parametrize("papers,clusters,seed", [(40, 6, 1), (300, 20, 2), (1000, 50, 3)])
+    def test_matches_pairwise_counts(self, papers, clusters, seed):
+        """Link strengths should equal the pairwise computation."""
+        items = synthetic_papers_with_tags(papers, clusters, seed=seed)
+        graph = build_cluster_graph(items)
+
+        assert {(l.source, l.target): l.sharedCount for l in graph.links} == _pairwise_shared_counts(items)
+        assert sum(n.paperCount for n in graph.nodes) == papers
+
+    def test_link_strength(self):
+        """Secondary tags, task overlap and common tasks should all add to the strength."""
+        graph = build_cluster_graph([
+            _item("a1", "A", ["B"], ["qa"]),
+            _item("a2", "A", [], ["summarization"]),
+            _item("b1", "B", ["A"], ["qa"]),
+            _item("c1", "C", ["Unknown"], ["retrieval"]),
+        ])
+
+        links = {(l.source, l.target): l for l in graph.links}
+        # a1 (secondary B), b1 (secondary A), plus the common task "qa"
+        assert links[("a", "b")].sharedCount == 3
+        assert set(links[("a", "b")].sharedPaperIds) == {"a1", "b1"}
+        assert ("a", "c") not in links and ("b", "c") not in links
+        assert [n.id for n in graph.nodes] == ["a", "b", "c"]
+
+    def test_shared_paper_ids_are_capped(self):
+        """Links should list at most ten shared papers."""
+        items = [_item(f"a{i}", "A", ["B"], []) for i in range(15)] + [_item("b", "B", [], [])]
+        link = build_cluster_graph(items).links[0]
+        assert link.sharedCount == 15
+        assert len(link.sharedPaperIds) == 10
+
+    def test_untagged_papers_are_skipped(self):
+        """Papers without tags should not break facets, confidence sorting or the graph."""
+        untagged = {"paper": Paper(id="u1", title="", abstract="", published_date="", hf_url=""), "tags": None}
+        items = [_item("a1", "A", [], ["qa"]), untagged]
+
+        assert list(build_cluster_facets(items)) == ["A"]
+        cards, _ = first_page_cards(items, "confidence", limit=10)
+        assert {c.paperId for c in cards} == {"a1", "u1"}
+        assert [n.id for n in build_cluster_graph(items).nodes] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_cluster_graph_endpoint(self, client, populated_database):
+        """The endpoint should return one node per cluster."""
+        response = await client.get("/api/months/2024-01/cluster-graph")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["nodes"]) == 5
+        assert sum(n["paperCount"] for n in data["nodes"]) == len(populated_database["papers"])
+
+
+class TestMonthBundle:
+    """Tests for /api/months/{month}/bundle."""
+
+    @pytest.mark.asyncio
+    async def test_bundle_matches_individual_endpoints(self, client, populated_database):
+        """Each section should equal the response of its own endpoint."""
+        bundle = (await client.get("/api/months/2024-01/bundle", params={"limit": 15})).json()
+
+        summary = (await client.get("/api/months/2024-01/summary")).json()
+        clusters = (await client.get("/api/months/2024-01/clusters")).json()
+        graph = (await client.get("/api/months/2024-01/cluster-graph")).json()
+        papers = await client.get("/api/months/2024-01/papers", params={"limit": 15})
+
+        assert bundle["summary"] == summary
+        assert bundle["clusters"] == clusters
+        assert bundle["graph"] == graph
+        assert bundle["papers"] == papers.json()
+        assert bundle["nextCursor"] == papers.headers["x-next-cursor"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort_by", ["upvotes", "date", "confidence"])
+    async def test_bundle_papers_order_and_cursor(self, client, populated_database, sort_by):
+        """The papers section should page exactly like /papers for every sort order."""
+        bundle = (await client.get(
+            "/api/months/2024-01/bundle", params={"include": "papers", "sort_by": sort_by, "limit": 7}
+        )).json()
+        listing = await client.get("/api/months/2024-01/papers", params={"sort_by": sort_by, "limit": 7})
+        assert [c["paperId"] for c in bundle["papers"]] == [c["paperId"] for c in listing.json()]
+
+        following = await client.get(
+            "/api/months/2024-01/papers", params={"sort_by": sort_by, "limit": 7, "cursor": bundle["nextCursor"]}
+        )
+        assert following.status_code == 200
+        seen = {c["paperId"] for c in bundle["papers"]}
+        assert following.json() and not seen & {c["paperId"] for c in following.json()}
+
+    @pytest.mark.asyncio
+    async def test_bundle_selected_sections(self, client, populated_database):
+        """Only the requested sections should be filled in."""
+        response = await client.get("/api/months/2024-01/bundle", params={"include": "graph, summary"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["summary"]["totalPapers"] == len(populated_database["papers"])
+        assert data["graph"]["nodes"]
+        assert data["clusters"] is None
+        assert data["papers"] is None
+
+    @pytest.mark.asyncio
+    async def test_bundle_loads_month_once(self, client, populated_database):
+        """All sections should come from a single month load."""
+        import main
+        with patch("main.get_papers_with_tags_for_month", wraps=main.get_papers_with_tags_for_month) as load:
+            response = await client.get("/api/months/2024-01/bundle")
+
+        assert response.status_code == 200
+        assert load.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_bundle_unknown_section(self, client):
+        """Unknown section names should be rejected."""
+        response = await client.get("/api/months/2024-01/bundle", params={"include": "summary,nope"})
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_bundle_empty_month(self, client):
+        """An unindexed month should produce empty sections."""
+        data = (await client.get("/api/months/1999-01/bundle")).json()
+
+        assert data["summary"]["totalPapers"] == 0
+        assert data["graph"] == {"nodes": [], "links": []}
+        assert data["papers"] == []
+        assert data["nextCursor"] is None
+
+
+class TestSearchEndpoint:
+    """Tests for /api/search endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_search_requires_query(self, client):
+        """Should require a query."""
+        response = await client.get("/api/search")
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_search_returns_ranked_cards(self, client, populated_database):
+        """Should return paper cards with highlights."""
+        response = await client.get("/api/search", params={"q": "quantization", "month": "2024-01"})
+
+        assert response.status_code == 200
+        results = response.json()
+        assert len(results) == 4
+        assert all(r["paper"]["primaryTag"] == "Efficient AI" for r in results)
+        assert all("<mark>" in r["titleHighlight"] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_month_papers_search_uses_index(self, client, populated_database):
+        """The month listing search filter should match words in titles/abstracts."""
+        response = await client.get("/api/months/2024-01/papers", params={"search": "quantization"})
+
+        assert response.status_code == 200
+        assert len(response.json()) == 4
+
+    @pytest.mark.asyncio
+    async def test_month_papers_search_without_words(self, client, populated_database):
+        """Punctuation-only searches return no papers rather than the whole month."""
+        response = await client.get("/api/months/2024-01/papers", params={"search": "!!!"})
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+class TestExportEndpoint:
+    """Tests for /api/export."""
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson(self, client, populated_database):
+        """NDJSON export should have one JSON object per paper in the range."""
+        response = await client.get("/api/export", params={"start_date": "2024-01-01", "end_date": "2024-01-31"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "attachment" in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == len(populated_database["papers"])
+        assert all(row["primary_contribution_tag"] for row in rows)
+        dates = [row["appeared_date"] for row in rows]
+        assert dates == sorted(dates, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self, client, populated_database):
+        """CSV export should have a header and one row per paper, lists joined."""
+        response = await client.get(
+            "/api/export", params={"start_date": "2024-01-01", "end_date": "2024-01-31", "format": "csv"}
+        )
+
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == len(populated_database["papers"])
+        paper = next(p for p in populated_database["papers"] if p.id == rows[0]["id"])
+        assert rows[0]["authors"] == "; ".join(paper.authors)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stream", ["stream_ndjson", "stream_csv"])
+    async def test_export_flushes_per_chunk(self, populated_database, stream):
+        """Each chunk of rows read from the database should be sent as its own piece."""
+        import main
+        from database import iter_papers_with_tags_by_date_range
+        chunks = iter_papers_with_tags_by_date_range("2024-01-01", "2024-01-31", chunk_size=4)
+
+        pieces = [piece async for piece in getattr(main, stream)(chunks)]
+
+        assert len(pieces) == -(-len(populated_database["papers"]) // 4)
+
+    @pytest.mark.asyncio
+    async def test_export_empty_range_csv(self, client):
+        """An empty range should still return the CSV header."""
+        response = await client.get(
+            "/api/export", params={"start_date": "1999-01-01", "end_date": "1999-01-31", "format": "csv"}
+        )
+        assert response.text.strip() == ",".join(__import__("main").EXPORT_COLUMNS)
+
+    @pytest.mark.asyncio
+    async def test_export_rejects_bad_params(self, client):
+        """Unknown formats and malformed dates should be rejected."""
+        response = await client.get(
+            "/api/export", params={"start_date": "2024-01-01", "end_date": "2024-01-31", "format": "xml"}
+        )
+        assert response.status_code == 422
+        response = await client.get("/api/export", params={"start_date": "2024-01-01\"", "end_date": "2024-01-31"})
+        assert response.status_code == 422
+
+
 class TestFlowEndpoint:
     """Tests for /api/flow endpoint."""
 
@@ -368,6 +928,66 @@ class TestReindexDailyEndpoint:
         assert data["status"] in ["started", "already_running"]
 
 
+class TestRunIndexing:
+    """Tests for the month indexing pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_papers_tagged_for_another_month_are_retagged(self, sample_papers):
+        """Indexing a month should re-tag papers whose current tags belong to another month."""
+        from main import run_indexing, indexing_status
+        from database import get_paper_tags, get_papers_with_tags_for_month
+
+        async def index(month: str) -> int:
+            indexing_status[month] = {"status": "running", "papers_skipped": 0, "message": ""}
+            with patch("main.scrape_month", AsyncMock(return_value=sample_papers)):
+                await run_indexing(month, use_llm=False)
+            return indexing_status[month]["papers_skipped"]
+
+        await index("2024-01")
+        assert await index("2024-01") == len(sample_papers)  # Tags are current for 2024-01
+
+        assert await index("2024-02") == 0
+        assert (await get_paper_tags(sample_papers[0].id)).month == "2024-02"
+        assert len(await get_papers_with_tags_for_month("2024-02")) == len(sample_papers)
+        assert await index("2024-02") == len(sample_papers)
+
+
+class TestPaperBatchEndpoint:
+    """Tests for POST /api/papers/batch."""
+
+    @pytest.mark.asyncio
+    async def test_cards_in_requested_order(self, client, populated_database):
+        """Cards keep the request order; duplicates collapse and unknown ids are reported."""
+        response = await client.post("/api/papers/batch", json={
+            "ids": ["2401.00009", "2401.00001", "nope", "2401.00009"]
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["paperId"] for p in data["papers"]] == ["2401.00009", "2401.00001"]
+        assert data["papers"][0]["primaryTag"] == "Efficient AI"
+        assert data["missing"] == ["nope"]
+
+    @pytest.mark.asyncio
+    async def test_details_match_single_lookup(self, client, populated_database):
+        """The detail view should match /api/papers/{id} for each paper."""
+        ids = ["2401.00004", "2401.00000"]
+        response = await client.post("/api/papers/batch", json={"ids": ids, "view": "detail"})
+
+        singles = [(await client.get(f"/api/papers/{paper_id}")).json() for paper_id in ids]
+        assert response.json()["papers"] == singles
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body", [
+        {"ids": []},
+        {"ids": [f"2401.{i:05d}" for i in range(501)]},
+        {"ids": ["2401.00000"], "view": "full"},
+    ])
+    async def test_rejects_invalid_requests(self, client, body):
+        response = await client.post("/api/papers/batch", json=body)
+        assert response.status_code == 422
+
+
 class TestUpvoteHistoryEndpoint:
     """Tests for /api/papers/{paper_id}/upvote-history endpoint."""
 
@@ -438,3 +1058,59 @@ class TestDailyPapersEndpoint:
         assert response.status_code == 200
         data = response.json()
         assert len(data["papers"]) <= 5
+
+    @pytest.mark.asyncio
+    async def test_daily_papers_sorted_by_upvotes(self, client, populated_database):
+        """Should return the day's papers with the most upvoted first."""
+        response = await client.get("/api/daily/2024-01-01")
+
+        data = response.json()
+        assert data["total_papers"] == len(data["papers"]) > 0
+        upvotes = [p["upvotes"] for p in data["papers"]]
+        assert upvotes == sorted(upvotes, reverse=True)
+        assert {p["paperId"] for p in data["papers"]} == {"2401.00000", "2401.00014"}
+
+    @pytest.mark.asyncio
+    async def test_daily_papers_are_cards(self, client, populated_database):
+        """Papers should be full cards with their tags joined in."""
+        response = await client.get("/api/daily/2024-01-01")
+
+        card = response.json()["papers"][0]
+        assert card["paperId"] == "2401.00014"
+        assert card["primaryTag"] == "Efficient AI"
+        assert card["taskTags"] == ["generation", "classification"]
+        assert card["modality"] == ["image", "text"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("params,expected", [
+        ({"cluster": "efficient-ai"}, ["2401.00014"]),
+        ({"cluster": "LLM / Foundation Models"}, ["2401.00000"]),
+        ({"cluster": "computer-vision"}, []),
+        ({"modality": "image"}, ["2401.00014"]),
+        ({"task": "generation"}, ["2401.00014", "2401.00000"]),
+        ({"task": "reasoning"}, []),
+    ])
+    async def test_daily_papers_filters(self, client, populated_database, params, expected):
+        """Cluster (name or slug), task and modality filters should apply in the query."""
+        response = await client.get("/api/daily/2024-01-01", params=params)
+
+        data = response.json()
+        assert [p["paperId"] for p in data["papers"]] == expected
+        assert data["total_papers"] == 2
+
+    @pytest.mark.asyncio
+    async def test_daily_papers_cursor(self, client, populated_database):
+        """Pages should follow nextCursor without repeating papers."""
+        first = (await client.get("/api/daily/2024-01-01", params={"limit": 1})).json()
+        assert first["nextCursor"]
+
+        second = (await client.get(
+            "/api/daily/2024-01-01", params={"limit": 1, "cursor": first["nextCursor"]}
+        )).json()
+        assert [p["paperId"] for p in first["papers"] + second["papers"]] == ["2401.00014", "2401.00000"]
+        assert second["nextCursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_daily_papers_invalid_cursor(self, client, populated_database):
+        response = await client.get("/api/daily/2024-01-01", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
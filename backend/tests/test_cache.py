@@ -0,0 +1,179 @@
+"""
+Tests for the in-process response cache.
+"""
+
+import asyncio
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache import ResponseCache, CacheEntry, make_cache_key
+
+
+def _entry(body: bytes, generation: int = 0) -> CacheEntry:
+    return CacheEntry(body, {}, generation, 0.0)
+
+
+class _Counter:
+    """Compute function that counts calls and returns a body per call."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("compute failed")
+        return f"body{self.calls}".encode(), {"X-Call": str(self.calls)}
+
+
+class TestCacheKey:
+    """Tests for make_cache_key."""
+
+    def test_normalizes_params(self):
+        """None values are dropped and argument order does not matter."""
+        assert make_cache_key("papers", month="2024-01", task=None, sort_by="upvotes") == \
+            make_cache_key("papers", sort_by="upvotes ", month="2024-01")
+
+    def test_distinguishes_endpoints_and_values(self):
+        """Different endpoints or values should not share entries."""
+        assert make_cache_key("a", month="2024-01") != make_cache_key("b", month="2024-01")
+        assert make_cache_key("a", limit=10) != make_cache_key("a", limit=20)
+
+
+class TestEviction:
+    """Tests for LRU and byte-size limits."""
+
+    def test_evicts_least_recently_used(self):
+        """Going over max_entries should drop the least recently used entry."""
+        cache = ResponseCache(max_entries=2)
+        cache.put(("a",), _entry(b"a"))
+        cache.put(("b",), _entry(b"b"))
+        cache.get(("a",))
+        cache.put(("c",), _entry(b"c"))
+
+        assert cache.get(("a",)) is not None
+        assert cache.get(("b",)) is None
+        assert len(cache) == 2
+
+    def test_evicts_by_total_bytes(self):
+        """Going over max_bytes should evict until the total fits."""
+        cache = ResponseCache(max_bytes=25)
+        cache.put(("a",), _entry(b"x" * 10))
+        cache.put(("b",), _entry(b"x" * 10))
+        cache.put(("c",), _entry(b"x" * 10))
+
+        assert cache.get(("a",)) is None
+        assert cache.total_bytes == 20
+
+    def test_skips_oversized_entries(self):
+        """An entry larger than max_bytes should not be stored."""
+        cache = ResponseCache(max_bytes=5)
+        cache.put(("a",), _entry(b"x" * 10))
+        assert len(cache) == 0
+        assert cache.total_bytes == 0
+
+    def test_replacing_entry_updates_size(self):
+        """Re-putting a key should not double count its bytes."""
+        cache = ResponseCache()
+        cache.put(("a",), _entry(b"x" * 10))
+        cache.put(("a",), _entry(b"x" * 4))
+        assert cache.total_bytes == 4
+
+
+class TestGetOrCompute:
+    """Tests for generation checks and stale-while-revalidate."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self):
+        """The first call computes, the next one is served from the cache."""
+        cache = ResponseCache()
+        compute = _Counter()
+
+        entry, status = await cache.get_or_compute(("k",), 0, compute)
+        assert (entry.body, status) == (b"body1", "MISS")
+
+        entry, status = await cache.get_or_compute(("k",), 0, compute)
+        assert (entry.body, status) == (b"body1", "HIT")
+        assert entry.headers == {"X-Call": "1"}
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_new_generation_serves_stale_and_refreshes(self):
+        """A bumped generation should serve the old body once and rebuild in the background."""
+        cache = ResponseCache()
+        compute = _Counter()
+        await cache.get_or_compute(("k",), 0, compute)
+
+        entry, status = await cache.get_or_compute(("k",), 1, compute)
+        assert (entry.body, status) == (b"body1", "STALE")
+
+        await asyncio.sleep(0.01)  # Let the refresh run
+        entry, status = await cache.get_or_compute(("k",), 1, compute)
+        assert (entry.body, status) == (b"body2", "HIT")
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self):
+        """Concurrent misses and stale hits should share one compute call."""
+        cache = ResponseCache()
+        compute = _Counter(delay=0.01)
+
+        results = await asyncio.gather(*[cache.get_or_compute(("k",), 0, compute) for _ in range(5)])
+        assert {entry.body for entry, _ in results} == {b"body1"}
+        assert compute.calls == 1
+
+        for _ in range(5):
+            await cache.get_or_compute(("k",), 1, compute)
+        await asyncio.sleep(0.02)
+        assert compute.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_write_during_rebuild_starts_new_rebuild(self):
+        """A request at a newer generation should not join a rebuild for an older one."""
+        cache = ResponseCache()
+        slow = _Counter(delay=0.05)
+        old_rebuild = asyncio.create_task(cache.get_or_compute(("k",), 0, slow))
+        await asyncio.sleep(0)  # Rebuild for generation 0 is now running
+
+        fresh = _Counter()
+        entry, status = await cache.get_or_compute(("k",), 1, fresh)
+        assert (entry.body, entry.generation, status) == (b"body1", 1, "MISS")
+        assert fresh.calls == 1
+
+        assert (await old_rebuild)[0].generation == 0
+        entry, status = await cache.get_or_compute(("k",), 1, fresh)
+        assert (entry.generation, status) == (1, "HIT")  # The older rebuild did not overwrite it
+        assert fresh.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entries(self):
+        """Entries past max_age are revalidated; past max_stale they are rebuilt inline."""
+        compute = _Counter()
+
+        cache = ResponseCache(max_age=0.0, max_stale=60)
+        await cache.get_or_compute(("k",), 0, compute)
+        assert (await cache.get_or_compute(("k",), 0, compute))[1] == "STALE"
+
+        cache = ResponseCache(max_age=0.0, max_stale=0.0)
+        await cache.get_or_compute(("k",), 0, compute)
+        entry, status = await cache.get_or_compute(("k",), 0, compute)
+        assert status == "MISS"
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_drops_entry(self):
+        """A failing background refresh should leave no stale entry behind."""
+        cache = ResponseCache()
+        await cache.get_or_compute(("k",), 0, _Counter())
+
+        failing = _Counter(fail=True)
+        assert (await cache.get_or_compute(("k",), 1, failing))[1] == "STALE"
+        await asyncio.sleep(0.01)
+
+        assert cache.get(("k",)) is None
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute(("k",), 1, failing)
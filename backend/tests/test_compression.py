@@ -0,0 +1,209 @@
+"""
+Tests for response compression.
+"""
+
+import gzip
+import json
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import compression
+from cache import ResponseCache
+from compression import (
+    CompressionMiddleware, choose_encoding, compress, encoded_etag, precompress, strip_etag_encoding
+)
+from main import app, response_cache
+
+
+LARGE = {"papers": [{"paperId": f"2401.{i:05d}", "title": "Efficient attention"} for i in range(200)]}
+
+
+async def _large(request):
+    return JSONResponse(LARGE, headers={"ETag": '"abc"'})
+
+
+async def _small(request):
+    return JSONResponse({"ok": True})
+
+
+async def _text(request):
+    return PlainTextResponse("x" * 4096, media_type="image/svg")
+
+
+async def _stream(request):
+    async def lines():
+        for i in range(50):
+            yield f'{{"row": {i}}}\n'.encode()
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+stub_app = CompressionMiddleware(
+    Starlette(routes=[Route("/large", _large), Route("/small", _small), Route("/image", _text), Route("/stream", _stream)]),
+    minimum_size=1024,
+)
+
+
+@pytest.fixture
+async def stub_client():
+    """Client for a minimal app wrapped in the middleware."""
+    async with AsyncClient(transport=ASGITransport(app=stub_app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+async def client():
+    """Create async test client with an empty response cache."""
+    response_cache.clear()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+class TestNegotiation:
+    """Tests for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize("accept_encoding,expected", [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate", "gzip"),
+        ("*", "gzip"),
+        ("br", None),
+        ("gzip;q=0", None),
+    ])
+    def test_gzip_only(self, monkeypatch, accept_encoding, expected):
+        monkeypatch.setattr(compression, "brotli", None)
+        assert choose_encoding(accept_encoding) == expected
+
+    @pytest.mark.parametrize("accept_encoding,expected", [
+        ("gzip, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("*", "br"),
+        ("br;q=0, *", "gzip"),
+    ])
+    def test_prefers_brotli_when_installed(self, monkeypatch, accept_encoding, expected):
+        # Negotiation only needs to know brotli is importable
+        monkeypatch.setattr(compression, "brotli", object())
+        assert choose_encoding(accept_encoding) == expected
+
+
+class TestHelpers:
+    """Tests for compress, precompress and ETag variants."""
+
+    def test_gzip_round_trip(self):
+        body = json.dumps(LARGE).encode()
+        assert gzip.decompress(compress(body, "gzip")) == body
+        assert gzip.decompress(compress(body, "gzip", precompressed=True)) == body
+
+    def test_brotli_round_trip(self):
+        brotli = pytest.importorskip("brotli")
+        body = json.dumps(LARGE).encode()
+        assert brotli.decompress(compress(body, "br")) == body
+
+    def test_precompress_threshold(self):
+        """Small bodies are not worth compressing; large ones get every supported encoding."""
+        assert precompress(b"{}") == {}
+        encoded = precompress(json.dumps(LARGE).encode())
+        assert set(encoded) == set(compression.supported_encodings())
+
+    def test_etag_variants(self):
+        assert encoded_etag('"abc"', "gzip") == '"abc-gzip"'
+        assert strip_etag_encoding('"abc-gzip"') == '"abc"'
+        assert strip_etag_encoding('"abc-br"') == '"abc"'
+        assert strip_etag_encoding('"abc"') == '"abc"'
+
+
+class TestMiddleware:
+    """Tests for CompressionMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_compresses_large_responses(self, stub_client):
+        response = await stub_client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == '"abc-gzip"'
+        assert int(response.headers["content-length"]) < len(json.dumps(LARGE))
+        assert response.json() == LARGE
+
+    @pytest.mark.asyncio
+    async def test_skips_small_and_unaccepted(self, stub_client):
+        """Bodies under the threshold and clients without gzip stay uncompressed."""
+        small = await stub_client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+        assert small.headers["vary"] == "Accept-Encoding"
+
+        identity = await stub_client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["etag"] == '"abc"'
+
+    @pytest.mark.asyncio
+    async def test_skips_other_content_types(self, stub_client):
+        response = await stub_client.get("/image", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_compresses_streams(self, stub_client):
+        """Streamed responses are compressed chunk by chunk without a Content-Length."""
+        response = await stub_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert [json.loads(line)["row"] for line in response.text.splitlines()] == list(range(50))
+
+
+class TestPrecompressedCache:
+    """Tests for compressed variants kept in the response cache."""
+
+    @pytest.mark.asyncio
+    async def test_entries_count_encoded_bytes(self):
+        cache = ResponseCache(precompress=lambda body: {"gzip": b"z" * 3})
+
+        async def compute():
+            return b"x" * 10, {}
+
+        entry, _ = await cache.get_or_compute(("k",), 0, compute)
+        assert entry.encoded == {"gzip": b"zzz"}
+        assert cache.total_bytes == 13
+
+    @pytest.mark.asyncio
+    async def test_month_compressed_once(self, client, populated_database, monkeypatch):
+        """A cached month is compressed when built, not on every request."""
+        calls = []
+
+        def counting(body):
+            calls.append(len(body))
+            return compression.precompress(body)
+
+        monkeypatch.setattr(compression, "COMPRESSION_MIN_SIZE", 0)
+        monkeypatch.setattr(response_cache, "precompress", counting)
+        headers = {"Accept-Encoding": "gzip"}
+
+        first = await client.get("/api/months/2024-01/papers", headers=headers)
+        second = await client.get("/api/months/2024-01/papers", headers=headers)
+        plain = await client.get("/api/months/2024-01/papers", headers={"Accept-Encoding": "identity"})
+
+        assert len(calls) == 1
+        assert first.headers["content-encoding"] == second.headers["content-encoding"] == "gzip"
+        assert second.headers["x-cache"] == "HIT"
+        assert first.json() == plain.json()
+        assert "content-encoding" not in plain.headers
+        assert first.headers["etag"] == encoded_etag(plain.headers["etag"], "gzip")
+
+    @pytest.mark.asyncio
+    async def test_encoded_etag_revalidates(self, client, populated_database, monkeypatch):
+        """If-None-Match with a compressed variant's ETag still gets a 304."""
+        monkeypatch.setattr(compression, "COMPRESSION_MIN_SIZE", 0)
+        headers = {"Accept-Encoding": "gzip"}
+        first = await client.get("/api/months/2024-01/summary", headers=headers)
+        etag = first.headers["etag"]
+        assert etag.endswith('-gzip"')
+
+        second = await client.get("/api/months/2024-01/summary", headers={**headers, "If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
@@ -15,12 +15,25 @@ from database import (
     upsert_paper, get_paper, get_all_papers,
     save_taxonomy, get_taxonomy,
     save_paper_tags, get_paper_tags, get_all_paper_tags_for_month,
+    get_papers_needing_tags,
     get_papers_with_tags_for_month,
     get_papers_by_date, get_papers_by_date_range,
-    get_papers_with_tags_by_date_range,
+    get_papers_with_tags_by_date_range, iter_papers_with_tags_by_date_range,
     record_upvote_snapshot, get_upvote_history,
+    upsert_papers_many, save_paper_tags_many, record_upvote_snapshots_many,
+    backfill_tag_assignments, get_tag_counts_for_month, get_cluster_facets_for_month,
+    count_papers_for_month,
+    search_papers, build_fts_query, rebuild_search_index,
+    PaperQuery, build_paper_query, query_papers_with_tags, get_cluster_names_for_month,
+    encode_cursor, decode_cursor,
+    query_paper_cards, count_papers_by_date, CARD_SNIPPET_LENGTH,
+    get_paper_cards_by_ids, get_papers_with_tags_by_ids,
     save_daily_snapshot, get_daily_snapshot, get_daily_snapshots_range,
-    compute_content_hash,
+    compute_content_hash, get_data_versions, GLOBAL_SCOPE, get_month_index,
+    ConnectionManager, get_connection_manager,
+    row_to_paper, row_to_paper_tags, joined_row_to_tags,
+    Migration, run_migrations, get_schema_version, SCHEMA_VERSION,
+    read_connection, write_connection,
 )
 
 
@@ -125,6 +138,65 @@ class TestPaperCRUD:
             assert paper.id in ids
 
 
+class TestBulkWrites:
+    """Tests for executemany-based bulk write helpers."""
+
+    @pytest.mark.asyncio
+    async def test_upsert_papers_many(self, sample_papers):
+        """Should insert all papers and update existing ones."""
+        await upsert_papers_many(sample_papers)
+
+        sample_papers[0].upvotes = 999
+        await upsert_papers_many(sample_papers[:1])
+
+        all_papers = await get_all_papers()
+        assert len(all_papers) == len(sample_papers)
+        assert (await get_paper(sample_papers[0].id)).upvotes == 999
+
+    @pytest.mark.asyncio
+    async def test_upsert_papers_many_keeps_first_appeared_date(self, sample_paper):
+        """Bulk upserts should preserve the original appeared_date like upsert_paper."""
+        await upsert_papers_many([sample_paper])
+
+        later = sample_paper.model_copy(update={"appeared_date": "2024-02-01"})
+        await upsert_papers_many([later])
+
+        assert (await get_paper(sample_paper.id)).appeared_date == "2024-01-15"
+
+    @pytest.mark.asyncio
+    async def test_save_paper_tags_many(self, sample_papers, sample_paper_tags):
+        """Should save tags for every paper in one call."""
+        await upsert_papers_many(sample_papers)
+        await save_paper_tags_many(sample_paper_tags)
+
+        tags = await get_all_paper_tags_for_month("2024-01")
+        assert len(tags) == len(sample_paper_tags)
+
+    @pytest.mark.asyncio
+    async def test_record_upvote_snapshots_many(self, sample_paper):
+        """Should record and overwrite snapshots in bulk."""
+        await upsert_paper(sample_paper)
+        await record_upvote_snapshots_many([
+            UpvoteSnapshot(paper_id=sample_paper.id, date="2024-01-15", upvotes=100),
+            UpvoteSnapshot(paper_id=sample_paper.id, date="2024-01-16", upvotes=150),
+        ])
+        await record_upvote_snapshots_many([
+            UpvoteSnapshot(paper_id=sample_paper.id, date="2024-01-16", upvotes=175),
+        ])
+
+        history = await get_upvote_history(sample_paper.id)
+        assert [(h.date, h.upvotes) for h in history] == [("2024-01-15", 100), ("2024-01-16", 175)]
+
+    @pytest.mark.asyncio
+    async def test_empty_batches_are_noops(self):
+        """Empty lists should not fail."""
+        await upsert_papers_many([])
+        await save_paper_tags_many([])
+        await record_upvote_snapshots_many([])
+
+        assert await get_all_papers() == []
+
+
 class TestTaxonomyCRUD:
     """Tests for taxonomy CRUD operations."""
 
@@ -201,6 +273,186 @@ class TestPaperTagsCRUD:
             assert t.month == "2024-01"
 
 
+class TestDataVersions:
+    """Tests for the change counters used by response caches and ETags."""
+
+    @pytest.mark.asyncio
+    async def test_taxonomy_save_bumps_month(self, sample_taxonomy):
+        """Saving a taxonomy should bump its month and the global scope only."""
+        await save_taxonomy(sample_taxonomy)
+
+        versions = await get_data_versions(["2024-01", "2024-02", GLOBAL_SCOPE])
+        assert versions == {"2024-01": 1, "2024-02": 0, GLOBAL_SCOPE: 1}
+
+    @pytest.mark.asyncio
+    async def test_paper_upsert_bumps_appeared_and_tagged_months(self, sample_paper):
+        """Upserting a paper should bump the month it appeared in and the month it is tagged under."""
+        await upsert_paper(sample_paper)
+        await save_paper_tags(PaperTags(
+            paper_id=sample_paper.id, month="2024-02", primary_contribution_tag="Efficient AI"
+        ))
+        before = await get_data_versions(["2024-01", "2024-02"])
+
+        await upsert_paper(sample_paper.model_copy(update={"upvotes": 500}))
+
+        after = await get_data_versions(["2024-01", "2024-02"])
+        assert after == {month: version + 1 for month, version in before.items()}
+
+    @pytest.mark.asyncio
+    async def test_retagging_bumps_old_and_new_month(self, sample_paper):
+        """Moving a paper's tags to another month should invalidate both months."""
+        await upsert_paper(sample_paper)
+        await save_paper_tags(PaperTags(
+            paper_id=sample_paper.id, month="2024-01", primary_contribution_tag="Efficient AI"
+        ))
+        before = await get_data_versions(["2024-01", "2024-03"])
+
+        await save_paper_tags(PaperTags(
+            paper_id=sample_paper.id, month="2024-03", primary_contribution_tag="Efficient AI"
+        ))
+
+        after = await get_data_versions(["2024-01", "2024-03"])
+        assert after == {month: version + 1 for month, version in before.items()}
+
+    @pytest.mark.asyncio
+    async def test_snapshots_bump_global_scope(self, sample_paper):
+        """Upvote and daily snapshots should bump the global scope without touching months."""
+        await upsert_paper(sample_paper)
+        before = await get_data_versions(["2024-01", GLOBAL_SCOPE])
+
+        await record_upvote_snapshot(sample_paper.id, "2024-01-16", 10)
+        await save_daily_snapshot(DailySnapshot(
+            date="2024-01-16", total_papers=1, cluster_counts={}, top_paper_ids=[], new_paper_ids=[]
+        ))
+
+        after = await get_data_versions(["2024-01", GLOBAL_SCOPE])
+        assert after == {"2024-01": before["2024-01"], GLOBAL_SCOPE: before[GLOBAL_SCOPE] + 2}
+
+
+class TestMonthIndex:
+    """Tests for get_month_index."""
+
+    @pytest.mark.asyncio
+    async def test_counts_papers_and_tags(self, populated_database, sample_paper):
+        """Tagged papers count once per month; untagged ones only towards paper_count."""
+        await upsert_paper(sample_paper.model_copy(update={"id": "2402.00001", "appeared_date": "2024-02-03"}))
+
+        index = await get_month_index()
+
+        assert [(m["month"], m["paper_count"], m["tagged_count"]) for m in index] == [
+            ("2024-02", 1, 0),
+            ("2024-01", 20, 20),
+        ]
+        assert all(m["last_updated"] for m in index)
+
+    @pytest.mark.asyncio
+    async def test_tagged_month_differs_from_appeared(self, sample_paper):
+        """A paper tagged under another month belongs to both months."""
+        await upsert_paper(sample_paper)
+        await save_paper_tags(PaperTags(
+            paper_id=sample_paper.id, month="2023-12", primary_contribution_tag="Efficient AI"
+        ))
+
+        index = {m["month"]: m for m in await get_month_index()}
+
+        assert (index["2024-01"]["paper_count"], index["2024-01"]["tagged_count"]) == (1, 0)
+        assert (index["2023-12"]["paper_count"], index["2023-12"]["tagged_count"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_last_updated_follows_writes(self, sample_paper):
+        """Each write to a month should move its last_updated time forward."""
+        await upsert_paper(sample_paper)
+        before = (await get_month_index())[0]["last_updated"]
+
+        await save_paper_tags(PaperTags(
+            paper_id=sample_paper.id, month="2024-01", primary_contribution_tag="Efficient AI"
+        ))
+
+        assert (await get_month_index())[0]["last_updated"] > before
+
+
+class TestTagProvenance:
+    """Tests for skipping papers whose tags are still current."""
+
+    @pytest.fixture
+    async def tagged_papers(self, sample_papers, sample_taxonomy):
+        """Save papers with heuristic tags that record their provenance."""
+        from llm_tagger import tag_paper_heuristic
+
+        await save_taxonomy(sample_taxonomy)
+        taxonomy = await get_taxonomy(sample_taxonomy.month)
+        await upsert_papers_many(sample_papers)
+        await save_paper_tags_many([tag_paper_heuristic(p, taxonomy) for p in sample_papers])
+        return sample_papers
+
+    @pytest.mark.asyncio
+    async def test_provenance_round_trip(self, tagged_papers):
+        """Tags should keep the content hash and taxonomy version they were made from."""
+        tags = await get_paper_tags(tagged_papers[0].id)
+
+        assert tags.content_hash == tagged_papers[0].content_hash
+        assert tags.taxonomy_version == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_papers_are_skipped(self, tagged_papers, sample_paper, sample_taxonomy):
+        """Only papers that are untagged should need tagging."""
+        await upsert_paper(sample_paper)
+
+        needing = await get_papers_needing_tags(tagged_papers + [sample_paper], sample_taxonomy)
+
+        assert [p.id for p in needing] == [sample_paper.id]
+
+    @pytest.mark.asyncio
+    async def test_changed_content_needs_tags(self, tagged_papers, sample_taxonomy):
+        """A paper whose content hash changed should be re-tagged."""
+        changed = tagged_papers[0].model_copy(update={"content_hash": "new-hash"})
+
+        needing = await get_papers_needing_tags([changed] + tagged_papers[1:], sample_taxonomy)
+
+        assert [p.id for p in needing] == [changed.id]
+
+    @pytest.mark.asyncio
+    async def test_new_taxonomy_version_needs_tags(self, tagged_papers, sample_taxonomy):
+        """Saving the month's taxonomy again should make its tags stale."""
+        await save_taxonomy(sample_taxonomy)
+
+        needing = await get_papers_needing_tags(tagged_papers, await get_taxonomy(sample_taxonomy.month))
+
+        assert len(needing) == len(tagged_papers)
+
+    @pytest.mark.asyncio
+    async def test_tags_for_another_month_need_tags(self, tagged_papers, sample_taxonomy):
+        """Papers tagged under another month should be re-tagged for the month being indexed."""
+        other_month = sample_taxonomy.model_copy(update={"month": "2024-02"})
+
+        needing = await get_papers_needing_tags(tagged_papers, other_month)
+
+        assert needing == tagged_papers
+
+    @pytest.mark.asyncio
+    async def test_tags_without_provenance_need_tags(self, populated_database):
+        """Tags that recorded no content hash (e.g. failed tagging) are retried."""
+        papers = populated_database["papers"]
+        assert await get_papers_needing_tags(papers, populated_database["taxonomy"]) == papers
+
+    @pytest.mark.asyncio
+    async def test_legacy_tags_are_backfilled(self, tagged_papers, sample_taxonomy):
+        """Upgrading a database should treat existing tags as current."""
+        async with write_connection() as db:
+            await db.execute("ALTER TABLE paper_tags DROP COLUMN content_hash")
+            await db.execute("ALTER TABLE paper_tags DROP COLUMN taxonomy_version")
+            await db.execute(
+                "UPDATE paper_tags SET rationale = 'Tagging failed' WHERE paper_id = ?",
+                (tagged_papers[0].id,)
+            )
+            await db.execute("PRAGMA user_version = 3")
+
+        await init_database()
+
+        needing = await get_papers_needing_tags(tagged_papers, sample_taxonomy)
+        assert [p.id for p in needing] == [tagged_papers[0].id]
+
+
 class TestPapersWithTags:
     """Tests for combined papers with tags queries."""
 
@@ -229,6 +481,315 @@ class TestPapersWithTags:
                 assert "2024-01-01" <= paper.appeared_date <= "2024-01-07"
 
 
+class TestTagAssignments:
+    """Tests for the normalized paper_tag_assignments table."""
+
+    async def _assignments(self, paper_id):
+        async with read_connection() as db:
+            async with db.execute(
+                "SELECT kind, tag FROM paper_tag_assignments WHERE paper_id = ? ORDER BY kind, tag",
+                (paper_id,)
+            ) as cursor:
+                return [(row[0], row[1]) async for row in cursor]
+
+    @pytest.mark.asyncio
+    async def test_save_paper_tags_syncs_assignments(self, sample_paper):
+        """Saving tags should write one row per kind/tag and replace stale rows."""
+        await upsert_paper(sample_paper)
+        tags = PaperTags(
+            paper_id=sample_paper.id,
+            month="2024-01",
+            primary_contribution_tag="LLM",
+            secondary_contribution_tags=["Safety"],
+            task_tags=["generation", "reasoning"],
+            modality_tags=["text"]
+        )
+        await save_paper_tags(tags)
+
+        assert await self._assignments(sample_paper.id) == [
+            ("modality", "text"),
+            ("primary", "LLM"),
+            ("secondary", "Safety"),
+            ("task", "generation"),
+            ("task", "reasoning"),
+        ]
+
+        tags.task_tags = ["retrieval"]
+        await save_paper_tags_many([tags])
+
+        assert ("task", "generation") not in await self._assignments(sample_paper.id)
+        assert ("task", "retrieval") in await self._assignments(sample_paper.id)
+
+    @pytest.mark.asyncio
+    async def test_backfill_from_json_columns(self, populated_database):
+        """Backfill should rebuild assignments for rows written before the table existed."""
+        async with write_connection() as db:
+            await db.execute("DELETE FROM paper_tag_assignments")
+            inserted = await backfill_tag_assignments(db)
+
+        assert inserted > 0
+        tags = populated_database["tags"][0]
+        rows = await self._assignments(tags.paper_id)
+        assert ("primary", tags.primary_contribution_tag) in rows
+        for task in tags.task_tags:
+            assert ("task", task) in rows
+
+        # Second run is a no-op
+        async with write_connection() as db:
+            assert await backfill_tag_assignments(db) == 0
+
+    @pytest.mark.asyncio
+    async def test_filter_month_by_task_and_modality(self, populated_database):
+        """Task and modality filters should match the JSON tag lists."""
+        results = await get_papers_with_tags_for_month("2024-01", task="reasoning", modality="image")
+        expected = {
+            t.paper_id for t in populated_database["tags"]
+            if "reasoning" in t.task_tags and "image" in t.modality_tags
+        }
+
+        assert {item["paper"].id for item in results} == expected
+
+    @pytest.mark.asyncio
+    async def test_tag_counts_for_month(self, populated_database):
+        """Facet counts should count papers per tag."""
+        counts = await get_tag_counts_for_month("2024-01", "task")
+
+        assert counts["reasoning"] == 10
+        assert counts["generation"] == 10
+        with pytest.raises(ValueError):
+            await get_tag_counts_for_month("2024-01", "bogus")
+
+    @pytest.mark.asyncio
+    async def test_cluster_facets_for_month(self, populated_database):
+        """Cluster facets should mirror the primary tags of the month."""
+        facets = await get_cluster_facets_for_month("2024-01")
+
+        assert sum(f["paper_count"] for f in facets.values()) == await count_papers_for_month("2024-01")
+        assert facets["LLM / Foundation Models"]["modality_tags"] == {"text": 4}
+
+
+class TestPaperQueryBuilder:
+    """Tests for SQL-side filtering, sorting and keyset pagination."""
+
+    @pytest.mark.asyncio
+    async def test_filters_and_sorts_in_sql(self, populated_database):
+        """Filters should combine and results come back in sort order."""
+        items, next_cursor = await query_papers_with_tags(PaperQuery(
+            month="2024-01", clusters=["Computer Vision"], modality="image", sort_by="upvotes"
+        ))
+
+        assert next_cursor is None
+        assert len(items) == 4
+        assert all(item["tags"].primary_contribution_tag == "Computer Vision" for item in items)
+        upvotes = [item["paper"].upvotes for item in items]
+        assert upvotes == sorted(upvotes, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_keyset_pagination_walks_all_rows(self, populated_database):
+        """Following cursors should visit every paper exactly once, in order."""
+        for sort_by in ("upvotes", "date", "confidence"):
+            seen = []
+            cursor = None
+            while True:
+                items, cursor = await query_papers_with_tags(PaperQuery(
+                    month="2024-01", sort_by=sort_by, limit=6, cursor=cursor
+                ))
+                seen.extend(item["paper"].id for item in items)
+                if cursor is None:
+                    break
+
+            full, _ = await query_papers_with_tags(PaperQuery(month="2024-01", sort_by=sort_by, limit=100))
+            assert seen == [item["paper"].id for item in full]
+            assert len(seen) == 20
+
+    @pytest.mark.asyncio
+    async def test_empty_cluster_list_matches_nothing(self, populated_database):
+        """An explicit empty cluster list should not match any paper."""
+        items, _ = await query_papers_with_tags(PaperQuery(month="2024-01", clusters=[]))
+        assert items == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("search", ["!!!", "--"])
+    async def test_search_without_words_matches_nothing(self, populated_database, search):
+        """A search with no word tokens should not fall back to the unfiltered month."""
+        items, _ = await query_papers_with_tags(PaperQuery(month="2024-01", search=search))
+        assert items == []
+        assert await get_papers_with_tags_for_month("2024-01", search=search) == []
+
+    def test_rejects_unknown_sort(self):
+        """Unknown sort orders should raise ValueError."""
+        with pytest.raises(ValueError):
+            build_paper_query(PaperQuery(month="2024-01", sort_by="title"))
+
+    def test_cursor_round_trip(self):
+        """Cursors should decode to their sort key and id, for the same sort only."""
+        cursor = encode_cursor("upvotes", 150, "2401.00001")
+
+        assert decode_cursor(cursor, "upvotes") == (150, "2401.00001")
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "date")
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor", "upvotes")
+
+    @pytest.mark.asyncio
+    async def test_cluster_names_for_month(self, populated_database):
+        """Should list the distinct primary tags of a month."""
+        names = await get_cluster_names_for_month("2024-01")
+        assert sorted(names) == sorted(populated_database["taxonomy"].contribution_tags[:5])
+
+
+class TestPaperCards:
+    """Tests for the narrow card projection."""
+
+    @pytest.mark.asyncio
+    async def test_snippet_and_authors_cut_in_sql(self, sample_paper):
+        """Long abstracts should be truncated and only the first authors returned."""
+        paper = sample_paper.model_copy(update={
+            "abstract": "x" * (CARD_SNIPPET_LENGTH + 50),
+            "authors": ["A", "B", "C", "D", "E"],
+        })
+        await upsert_paper(paper)
+
+        cards, next_cursor = await query_paper_cards(PaperQuery(appeared_date=paper.appeared_date))
+
+        assert next_cursor is None
+        assert len(cards) == 1
+        card = cards[0]
+        assert card["abstract_snippet"] == "x" * CARD_SNIPPET_LENGTH + "..."
+        assert card["authors_short"] == ["A", "B", "C"]
+        assert "created_at" not in card
+
+    @pytest.mark.asyncio
+    async def test_short_abstract_is_not_truncated(self, sample_paper):
+        """Abstracts within the snippet length should come back unchanged."""
+        await upsert_paper(sample_paper)
+
+        cards, _ = await query_paper_cards(PaperQuery(appeared_date=sample_paper.appeared_date))
+
+        assert cards[0]["abstract_snippet"] == sample_paper.abstract
+        assert cards[0]["authors_short"] == sample_paper.authors
+
+    @pytest.mark.asyncio
+    async def test_untagged_papers_listed_by_date(self, sample_paper):
+        """Date listings should include papers that have no tags yet."""
+        await upsert_paper(sample_paper)
+
+        cards, _ = await query_paper_cards(PaperQuery(appeared_date=sample_paper.appeared_date))
+
+        assert cards[0]["has_tags"] is False
+        assert cards[0]["primary_contribution_tag"] == "OTHER"
+        assert await count_papers_by_date(sample_paper.appeared_date) == 1
+
+    @pytest.mark.asyncio
+    async def test_month_cards_match_full_rows(self, populated_database):
+        """Card listings should return the same papers in the same order."""
+        cards, _ = await query_paper_cards(PaperQuery(month="2024-01"))
+        items, _ = await query_papers_with_tags(PaperQuery(month="2024-01"))
+
+        assert [c["id"] for c in cards] == [i["paper"].id for i in items]
+        assert all(c["has_tags"] for c in cards)
+
+    def test_requires_month_or_date(self):
+        """A query without a month or appeared date should be rejected."""
+        with pytest.raises(ValueError):
+            build_paper_query(PaperQuery())
+
+
+class TestFullTextSearch:
+    """Tests for the FTS5 search index."""
+
+    def test_build_fts_query_quotes_terms(self):
+        """User input should become quoted prefix terms."""
+        assert build_fts_query('Vision-Language "models" OR') == '"vision"* "language"* "models"* "or"*'
+        assert build_fts_query("  ?! ") is None
+
+    @pytest.mark.asyncio
+    async def test_search_ranks_title_matches_first(self, sample_papers):
+        """Title matches should outrank abstract-only matches."""
+        await upsert_papers_many(sample_papers)
+        title_hit = sample_papers[0].model_copy(update={
+            "id": "2401.99999", "title": "Quantization for everyone", "abstract": "Nothing relevant."
+        })
+        await upsert_paper(title_hit)
+
+        results = await search_papers("quantization")
+
+        assert results[0]["paper"].id == "2401.99999"
+        assert "<mark>" in results[0]["title_highlight"]
+        assert {r["paper"].id for r in results} >= {p.id for p in sample_papers if "quantization" in p.abstract}
+
+    @pytest.mark.asyncio
+    async def test_search_prefix_and_snippet(self, sample_paper):
+        """Partial words should match and produce an abstract snippet."""
+        await upsert_paper(sample_paper)
+
+        results = await search_papers("reinforce")
+
+        assert [r["paper"].id for r in results] == [sample_paper.id]
+        assert "<mark>reinforcement</mark>" in results[0]["snippet"]
+
+    @pytest.mark.asyncio
+    async def test_search_tracks_updates_and_deletes(self, sample_paper):
+        """Triggers should keep the index in sync with papers."""
+        await upsert_paper(sample_paper)
+        sample_paper.title = "Completely different heading"
+        sample_paper.abstract = "Unrelated text."
+        await upsert_paper(sample_paper)
+
+        assert await search_papers("safety") == []
+        assert len(await search_papers("heading")) == 1
+
+        async with write_connection() as db:
+            await db.execute("DELETE FROM papers WHERE id = ?", (sample_paper.id,))
+        assert await search_papers("heading") == []
+
+    @pytest.mark.asyncio
+    async def test_search_scopes(self, populated_database):
+        """Month and date-range scopes should restrict results."""
+        assert len(await search_papers("paper", month="2024-01")) == 20
+        assert await search_papers("paper", month="2023-12") == []
+
+        ranged = await search_papers("paper", start_date="2024-01-01", end_date="2024-01-02")
+        assert ranged
+        assert all("2024-01-01" <= r["paper"].appeared_date <= "2024-01-02" for r in ranged)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_search_index(self, populated_database):
+        """Rebuilding should keep existing documents searchable."""
+        await rebuild_search_index()
+
+        assert len(await search_papers("quantization")) == 4
+
+
+class TestPapersByIds:
+    """Tests for batch lookups by id."""
+
+    @pytest.mark.asyncio
+    async def test_cards_in_requested_order(self, populated_database):
+        """Cards come back in the order asked for, skipping unknown ids."""
+        ids = ["2401.00007", "missing", "2401.00002", "2401.00011"]
+
+        cards = await get_paper_cards_by_ids(ids)
+
+        assert [c["id"] for c in cards] == ["2401.00007", "2401.00002", "2401.00011"]
+        assert cards[0]["primary_contribution_tag"] == "Multimodal AI"
+
+    @pytest.mark.asyncio
+    async def test_full_papers_with_tags(self, populated_database, sample_paper):
+        """Full lookups include untagged papers with tags set to None."""
+        await upsert_paper(sample_paper.model_copy(update={"id": "2402.00001"}))
+
+        items = await get_papers_with_tags_by_ids(["2402.00001", "2401.00003"])
+
+        assert [i["paper"].id for i in items] == ["2402.00001", "2401.00003"]
+        assert items[0]["tags"] is None
+        assert items[1]["tags"].primary_contribution_tag == "AI Safety / Alignment"
+
+    @pytest.mark.asyncio
+    async def test_empty_list(self, populated_database):
+        assert await get_paper_cards_by_ids([]) == []
+
+
 class TestPapersByDate:
     """Tests for date-based paper queries."""
 
@@ -250,6 +811,31 @@ class TestPapersByDate:
                 assert "2024-01-01" <= paper.appeared_date <= "2024-01-07"
 
 
+class TestStreamingRange:
+    """Tests for chunked date-range reads."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_match_full_read(self, populated_database):
+        """Chunks should hold at most chunk_size rows and add up to the full result."""
+        chunks = [
+            chunk async for chunk in
+            iter_papers_with_tags_by_date_range("2024-01-01", "2024-01-31", chunk_size=3)
+        ]
+        full = await get_papers_with_tags_by_date_range("2024-01-01", "2024-01-31")
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 3 for chunk in chunks)
+        assert [item["paper"].id for chunk in chunks for item in chunk] == [item["paper"].id for item in full]
+
+    @pytest.mark.asyncio
+    async def test_does_not_hold_pooled_reader(self, populated_database):
+        """Streaming should leave every pooled reader free for other requests."""
+        manager = get_connection_manager()
+        await manager.open()
+        async for _ in iter_papers_with_tags_by_date_range("2024-01-01", "2024-01-31", chunk_size=1):
+            assert manager._reader_pool.qsize() == manager.readers
+
+
 class TestUpvoteHistory:
     """Tests for upvote history tracking."""
 
@@ -325,6 +911,178 @@ class TestDailySnapshots:
         assert dates == sorted(dates)
 
 
+class TestRowMapping:
+    """Tests for the shared row-to-model mappers."""
+
+    @pytest.mark.asyncio
+    async def test_trusted_and_validated_rows_match(self, populated_database):
+        """Skipping validation should build the same models as validating."""
+        async with read_connection() as db:
+            async with db.execute(
+                "SELECT p.*, pt.primary_contribution_tag, pt.secondary_contribution_tags_json,"
+                " pt.task_tags_json, pt.modality_tags_json, pt.research_question,"
+                " pt.confidence, pt.rationale, pt.month"
+                " FROM papers p LEFT JOIN paper_tags pt ON p.id = pt.paper_id"
+            ) as cursor:
+                rows = await cursor.fetchall()
+            async with db.execute("SELECT * FROM paper_tags") as cursor:
+                tag_rows = await cursor.fetchall()
+
+        for row in rows:
+            assert row_to_paper(row) == row_to_paper(row, validate=True)
+            assert joined_row_to_tags(row) == joined_row_to_tags(row, validate=True)
+        for row in tag_rows:
+            assert row_to_paper_tags(row) == row_to_paper_tags(row, validate=True)
+
+    @pytest.mark.asyncio
+    async def test_trusted_models_behave_like_validated(self, sample_paper):
+        """Trusted models should support dumping, copying and assignment."""
+        await upsert_paper(sample_paper)
+        paper = await get_paper(sample_paper.id)
+
+        assert paper.model_dump(exclude={"created_at", "updated_at"}) == \
+            sample_paper.model_dump(exclude={"created_at", "updated_at"})
+        assert paper.model_copy(update={"upvotes": 1}).upvotes == 1
+        paper.upvotes = 2
+        assert paper.upvotes == 2
+
+    @pytest.mark.asyncio
+    async def test_validating_mode_rejects_bad_rows(self, sample_paper, monkeypatch):
+        """Opting into validation should surface rows that break the model."""
+        import database
+        from pydantic import ValidationError
+
+        await upsert_paper(sample_paper)
+        async with write_connection() as db:
+            await db.execute("UPDATE papers SET upvotes = 'many' WHERE id = ?", (sample_paper.id,))
+
+        assert (await get_paper(sample_paper.id)).upvotes == "many"
+        monkeypatch.setattr(database, "VALIDATE_ROWS", True)
+        with pytest.raises(ValidationError):
+            await get_paper(sample_paper.id)
+
+
+class TestMigrations:
+    """Tests for the PRAGMA user_version migration runner."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_database_is_current(self):
+        """init_database should leave the schema at the latest version."""
+        assert await get_schema_version() == SCHEMA_VERSION
+        assert await run_migrations() == []
+
+    @pytest.mark.asyncio
+    async def test_upgrades_legacy_database_in_batches(self, populated_database):
+        """A pre-migration database should be upgraded and backfilled chunk by chunk."""
+        async with write_connection() as db:
+            await db.execute("DROP TABLE paper_tag_assignments")
+            for trigger in ("papers_fts_insert", "papers_fts_delete", "papers_fts_update"):
+                await db.execute(f"DROP TRIGGER {trigger}")
+            await db.execute("DROP TABLE papers_fts")
+            await db.execute("ALTER TABLE paper_tags DROP COLUMN content_hash")
+            await db.execute("ALTER TABLE paper_tags DROP COLUMN taxonomy_version")
+            await db.execute("PRAGMA user_version = 0")
+
+        applied = await run_migrations(batch_size=3)
+
+        assert applied == list(range(1, SCHEMA_VERSION + 1))
+        assert await get_schema_version() == SCHEMA_VERSION
+        counts = await get_tag_counts_for_month("2024-01", "primary")
+        assert sum(counts.values()) == len(populated_database["papers"])
+        assert len(await search_papers("quantization")) > 0
+
+    @pytest.mark.asyncio
+    async def test_backfill_commits_per_chunk(self, monkeypatch):
+        """Backfills should run one transaction per chunk until no rows are left."""
+        import database
+
+        calls = []
+
+        async def schema(db):
+            await db.execute("CREATE TABLE IF NOT EXISTS numbers (n TEXT PRIMARY KEY, doubled TEXT)")
+            await db.executemany("INSERT OR IGNORE INTO numbers (n) VALUES (?)", [(f"{i:02d}",) for i in range(10)])
+
+        async def backfill(db, after, batch_size):
+            calls.append(after)
+            async with db.execute(
+                "SELECT n FROM numbers WHERE n > ? ORDER BY n LIMIT ?", (after, batch_size)
+            ) as cursor:
+                keys = [row[0] for row in await cursor.fetchall()]
+            if not keys:
+                return None
+            await db.executemany("UPDATE numbers SET doubled = n || n WHERE n = ?", [(k,) for k in keys])
+            return keys[-1]
+
+        monkeypatch.setattr(database, "MIGRATIONS", database.MIGRATIONS + [
+            Migration(SCHEMA_VERSION + 1, "Test backfill", schema, backfill)
+        ])
+        monkeypatch.setattr(database, "SCHEMA_VERSION", SCHEMA_VERSION + 1)
+
+        assert await run_migrations(batch_size=4) == [SCHEMA_VERSION + 1]
+        assert calls == ["", "03", "07", "09"]
+        async with read_connection() as db:
+            async with db.execute("SELECT COUNT(*) FROM numbers WHERE doubled IS NULL") as cursor:
+                assert (await cursor.fetchone())[0] == 0
+
+        # Already current: nothing runs
+        assert await run_migrations(batch_size=4) == []
+        assert len(calls) == 4
+
+
+class TestConnectionManager:
+    """Tests for pooled reader/writer connections."""
+
+    @pytest.mark.asyncio
+    async def test_uses_wal_journal_mode(self):
+        """Pooled connections should run in WAL mode."""
+        async with read_connection() as db:
+            async with db.execute("PRAGMA journal_mode") as cursor:
+                row = await cursor.fetchone()
+
+        assert row[0].lower() == "wal"
+
+    @pytest.mark.asyncio
+    async def test_applies_configured_pragmas(self, tmp_path):
+        """Custom pragmas should be applied to every connection."""
+        manager = ConnectionManager(tmp_path / "pragmas.db", readers=2, pragmas={"busy_timeout": 1234})
+        try:
+            async with manager.read() as db:
+                async with db.execute("PRAGMA busy_timeout") as cursor:
+                    row = await cursor.fetchone()
+        finally:
+            await manager.close()
+
+        assert row[0] == 1234
+
+    @pytest.mark.asyncio
+    async def test_reuses_connections(self):
+        """Readers should come back from the pool instead of reconnecting."""
+        manager = get_connection_manager()
+
+        async with manager.read() as first:
+            pass
+        seen = set()
+        for _ in range(manager.readers + 1):
+            async with manager.read() as conn:
+                seen.add(id(conn))
+
+        assert id(first) in seen
+        assert len(seen) <= manager.readers
+
+    @pytest.mark.asyncio
+    async def test_write_rolls_back_on_error(self, sample_paper):
+        """A failing write block should not leave partial changes behind."""
+        with pytest.raises(RuntimeError):
+            async with write_connection() as db:
+                await db.execute(
+                    "INSERT INTO papers (id, title, abstract, hf_url) VALUES (?, ?, ?, ?)",
+                    (sample_paper.id, sample_paper.title, sample_paper.abstract, sample_paper.hf_url)
+                )
+                raise RuntimeError("boom")
+
+        assert await get_paper(sample_paper.id) is None
+
+
 class TestModels:
     """Tests for Pydantic model validation."""
 
@@ -0,0 +1,161 @@
+"""
+Tests for the scraper's on-disk HTTP cache.
+"""
+
+import httpx
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from http_cache import HttpCache, url_class
+from scraper import AdaptiveRateLimiter, ScraperSession
+
+
+PAPER_URL = "https://huggingface.co/papers/2401.00001"
+LISTING_URL = "https://huggingface.co/papers?date=2024-01-15"
+TTLS = {"paper": 7 * 24 * 3600, "listing": 3600}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _ConditionalSite:
+    """MockTransport handler with versioned pages that answers 304 to matching validators."""
+
+    def __init__(self):
+        self.version = 1
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = f'"v{self.version}"'
+        last_modified = "Mon, 15 Jan 2024 12:00:00 GMT"
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            text=f"<h1>{request.url.path} v{self.version}</h1>",
+            headers={"ETag": etag, "Last-Modified": last_modified, "Content-Type": "text/html; charset=utf-8"},
+        )
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return HttpCache(tmp_path / "http_cache", ttls=TTLS, clock=clock)
+
+
+@pytest.fixture
+def site():
+    return _ConditionalSite()
+
+
+@pytest.fixture
+async def session(cache, site):
+    limiter = AdaptiveRateLimiter(rate=1000, max_rate=1000)
+    async with ScraperSession(limiter=limiter, cache=cache, transport=httpx.MockTransport(site)) as session:
+        yield session
+
+
+class TestHttpCache:
+    """Tests for storage and freshness."""
+
+    @pytest.mark.parametrize("url,expected", [
+        (PAPER_URL, "paper"),
+        (LISTING_URL, "listing"),
+        ("https://huggingface.co/papers/month/2024-01", "listing"),
+        ("https://huggingface.co/api/daily_papers?date=2024-01-15", "listing"),
+    ])
+    def test_url_class(self, url, expected):
+        assert url_class(url) == expected
+
+    def test_round_trip_and_content_addressing(self, cache):
+        """Identical bodies under different URLs are stored once."""
+        response = httpx.Response(200, text="same", headers={"ETag": '"a"'})
+        cache.store(PAPER_URL, response, fetch_seconds=0.5)
+        cache.store(LISTING_URL, response, fetch_seconds=0.5)
+
+        entry, body = cache.lookup(PAPER_URL)
+        assert (body, entry.etag, entry.fetch_seconds) == (b"same", '"a"', 0.5)
+        assert entry.conditional_headers() == {"If-None-Match": '"a"'}
+        assert len(list((cache.directory / "bodies").rglob("*"))) == 2  # One prefix dir, one body
+        assert cache.misses == 2
+
+    def test_ttl_depends_on_url_class(self, cache, clock):
+        """Listings go stale within hours; paper pages stay fresh for days."""
+        for url in (PAPER_URL, LISTING_URL):
+            cache.store(url, httpx.Response(200, text=url), fetch_seconds=0.1)
+        clock.now += 2 * 3600
+
+        assert cache.is_fresh(cache.lookup(PAPER_URL)[0])
+        assert not cache.is_fresh(cache.lookup(LISTING_URL)[0])
+
+    def test_unreadable_entry_is_a_miss(self, cache):
+        cache.store(PAPER_URL, httpx.Response(200, text="x"), fetch_seconds=0.1)
+        cache._entry_path(PAPER_URL).write_text("{not json")
+        assert cache.lookup(PAPER_URL) is None
+        assert cache.lookup(LISTING_URL) is None
+
+
+class TestCachedSession:
+    """Tests for ScraperSession requests through the cache."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_skips_the_request(self, session, site, cache):
+        first = await session.get(PAPER_URL)
+        second = await session.get(PAPER_URL)
+
+        assert len(site.requests) == 1
+        assert second.text == first.text
+        assert second.headers["content-type"].startswith("text/html")
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.bytes_saved == len(first.content)
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_revalidated(self, session, site, cache, clock):
+        """A stale entry is sent with its validators; a 304 reuses the body and restarts the TTL."""
+        first = await session.get(LISTING_URL)
+        clock.now += 2 * 3600
+
+        second = await session.get(LISTING_URL)
+        assert site.requests[-1].headers["if-none-match"] == '"v1"'
+        assert site.requests[-1].headers["if-modified-since"] == "Mon, 15 Jan 2024 12:00:00 GMT"
+        assert second.status_code == 200
+        assert second.text == first.text
+        assert cache.revalidated == 1
+
+        await session.get(LISTING_URL)  # Fresh again after the 304
+        assert len(site.requests) == 2
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_page_is_replaced(self, session, site, cache, clock):
+        await session.get(LISTING_URL)
+        site.version = 2
+        clock.now += 2 * 3600
+
+        response = await session.get(LISTING_URL)
+        assert "v2" in response.text
+        assert cache.misses == 2
+        assert cache.lookup(LISTING_URL)[0].etag == '"v2"'
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, cache):
+        limiter = AdaptiveRateLimiter(rate=1000, max_rate=1000)
+        transport = httpx.MockTransport(lambda request: httpx.Response(404))
+        async with ScraperSession(limiter=limiter, cache=cache, transport=transport) as session:
+            with pytest.raises(httpx.HTTPStatusError):
+                await session.get(PAPER_URL)
+        assert cache.lookup(PAPER_URL) is None
+        assert cache.stats()["misses"] == 0
@@ -0,0 +1,117 @@
+"""
+Query-plan regression tests for the read queries in database.py.
+
+Every query shape from benchmark.query_cases() is run against a synthetic
+database with statement tracing on; each traced SELECT is then passed
+through EXPLAIN QUERY PLAN. A full table SCAN or a TEMP B-TREE sort fails
+the test unless it is listed in ALLOWED_PLAN_STEPS for that case.
+"""
+
+import inspect
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database
+from database import get_connection_manager, read_connection
+from benchmark import seed_synthetic_database, query_cases
+
+
+MONTH_SORT = {"USE TEMP B-TREE FOR ORDER BY"}  # Sorting one month's rows by a papers column
+AGGREGATE = {"USE TEMP B-TREE FOR GROUP BY", "USE TEMP B-TREE FOR ORDER BY"}  # Ordered by counts
+
+# Plan steps that are expected for a case, and why
+ALLOWED_PLAN_STEPS = {
+    "get_all_papers": {"SCAN papers USING INDEX idx_papers_upvotes"},  # Returns every paper
+    "get_papers_with_tags_for_month": MONTH_SORT,
+    "get_papers_with_tags_for_month[filters]": MONTH_SORT,
+    "get_tag_counts_for_month": AGGREGATE,
+    "get_cluster_facets_for_month": AGGREGATE,
+    "search_papers": {"USE TEMP B-TREE FOR ORDER BY"},  # Ranked by bm25
+    "search_papers[range]": {"USE TEMP B-TREE FOR ORDER BY"},
+    **{f"query_papers_with_tags[month,{s}]": MONTH_SORT for s in database.PAPER_SORT_KEYS},
+    **{f"query_paper_cards[month,{s},filters]": MONTH_SORT for s in database.PAPER_SORT_KEYS},
+    # One day's rows; only the upvotes order comes from the index
+    "query_paper_cards[date,date]": {"USE TEMP B-TREE FOR ORDER BY"},
+    "query_paper_cards[date,confidence]": {"USE TEMP B-TREE FOR ORDER BY"},
+    "get_cluster_names_for_date": {"USE TEMP B-TREE FOR DISTINCT"},  # Tags of one day's papers
+    # Restores the requested id order over one batch of rows
+    "get_paper_cards_by_ids": {"USE TEMP B-TREE FOR ORDER BY"},
+    "get_papers_with_tags_by_ids": {"USE TEMP B-TREE FOR ORDER BY"},
+    # Whole-database summary, cached per write generation by /api/months
+    "get_month_index": {
+        "UNION USING TEMP B-TREE", "SCAN paper_tags", "SCAN mp", "USE TEMP B-TREE FOR GROUP BY",
+    },
+}
+
+# Public coroutines in database.py that are not data queries
+NOT_QUERIES = {"get_schema_version"}
+
+
+def _is_flagged(detail: str) -> bool:
+    """Plan steps this suite looks for: full scans and temporary sort trees."""
+    if "VIRTUAL TABLE" in detail:
+        return False  # FTS5 MATCH and json_each are index lookups of their own
+    return detail.startswith("SCAN ") or "TEMP B-TREE" in detail
+
+
+async def _traced_selects(fn, args, kwargs) -> list[str]:
+    """Run a query function and return the SELECT statements it executed."""
+    statements = []
+    manager = get_connection_manager()
+    await manager.set_trace_callback(statements.append)
+    try:
+        await fn(*args, **kwargs)
+    finally:
+        await manager.set_trace_callback(None)
+    return [
+        sql for sql in statements
+        if sql.lstrip().upper().startswith(("SELECT", "WITH"))
+        and "'papers_fts_" not in sql  # FTS5 reading its own shadow tables
+    ]
+
+
+async def _plan(sql: str) -> list[str]:
+    async with read_connection() as db:
+        async with db.execute("EXPLAIN QUERY PLAN " + sql) as cursor:
+            return [row['detail'] for row in await cursor.fetchall()]
+
+
+class TestQueryPlans:
+    """Tests for index usage of every read query."""
+
+    @pytest.mark.asyncio
+    async def test_no_unexpected_scans_or_sorts(self):
+        """No query should scan a table or build a temp b-tree unless allowed."""
+        await seed_synthetic_database(1200, months=3)
+
+        failures = []
+        for label, fn, args, kwargs in query_cases():
+            selects = await _traced_selects(fn, args, kwargs)
+            assert selects, f"{label} executed no SELECT"
+            allowed = ALLOWED_PLAN_STEPS.get(label, set())
+            for sql in selects:
+                for detail in await _plan(sql):
+                    if _is_flagged(detail) and detail not in allowed:
+                        failures.append(f"{label}: {detail}\n    {' '.join(sql.split())[:200]}")
+
+        assert not failures, "Unexpected query plan steps:\n" + "\n".join(failures)
+
+    def test_every_query_has_a_case(self):
+        """New public read functions must be added to benchmark.query_cases()."""
+        covered = {fn.__name__ for _, fn, _, _ in query_cases()}
+        public_queries = {
+            name for name, fn in inspect.getmembers(database, inspect.iscoroutinefunction)
+            if name.startswith(("get_", "count_", "query_", "search_"))
+            and fn.__module__ == "database"
+            and name not in NOT_QUERIES
+        }
+        assert public_queries - covered == set()
+
+    def test_allowed_steps_refer_to_cases(self):
+        """The allowlist should not keep entries for cases that no longer exist."""
+        labels = {label for label, _, _, _ in query_cases()}
+        assert set(ALLOWED_PLAN_STEPS) - labels == set()
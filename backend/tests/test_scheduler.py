@@ -115,11 +115,11 @@ class TestPaperSchedulerScrapeAndIndex:
         test_papers = sample_papers[:2]
 
         with patch("scheduler.scrape_daily", new_callable=AsyncMock) as mock_scrape, \
-             patch("scheduler.upsert_paper", new_callable=AsyncMock), \
+             patch("scheduler.upsert_papers_many", new_callable=AsyncMock), \
              patch("scheduler.get_taxonomy", new_callable=AsyncMock) as mock_get_tax, \
              patch("scheduler.save_taxonomy", new_callable=AsyncMock), \
              patch("scheduler.tag_paper_heuristic") as mock_tag, \
-             patch("scheduler.save_paper_tags", new_callable=AsyncMock), \
+             patch("scheduler.save_paper_tags_many", new_callable=AsyncMock), \
              patch("scheduler.save_daily_snapshot_for_date", new_callable=AsyncMock):
 
             mock_scrape.return_value = test_papers
@@ -133,6 +133,34 @@ class TestPaperSchedulerScrapeAndIndex:
             assert result["papers_tagged"] == 2
 
 
+    @pytest.mark.asyncio
+    async def test_scrape_skips_unchanged_papers(self, sample_papers, sample_taxonomy):
+        """Should not re-tag papers whose tags are still current."""
+        from database import save_taxonomy, get_taxonomy, upsert_papers_many, save_paper_tags_many
+        from llm_tagger import tag_paper_heuristic
+
+        scheduler = PaperScheduler()
+        test_papers = sample_papers[:3]
+
+        await save_taxonomy(sample_taxonomy)
+        taxonomy = await get_taxonomy(sample_taxonomy.month)
+        await upsert_papers_many(test_papers)
+        await save_paper_tags_many([tag_paper_heuristic(p, taxonomy) for p in test_papers[:2]])
+
+        with patch("scheduler.scrape_daily", new_callable=AsyncMock) as mock_scrape, \
+             patch("scheduler.tag_paper_heuristic", wraps=tag_paper_heuristic) as mock_tag, \
+             patch("scheduler.save_daily_snapshot_for_date", new_callable=AsyncMock):
+
+            mock_scrape.return_value = test_papers
+
+            result = await scheduler.scrape_and_index_date("2024-01-15")
+
+            assert result["status"] == "completed"
+            assert result["papers_skipped"] == 2
+            assert result["papers_tagged"] == 1
+            assert mock_tag.call_count == 1
+
+
 class TestPaperSchedulerDailyJob:
     """Tests for PaperScheduler.daily_job method."""
 
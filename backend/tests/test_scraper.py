@@ -0,0 +1,475 @@
+"""
+Tests for the HF papers scraper.
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import scraper
+from database import compute_content_hash
+from scraper import (
+    AdaptiveRateLimiter, ListingPaper, ScraperSession, parse_listing, parse_retry_after,
+    parse_paper_page, parse_paper_page_soup,
+    scrape_month, scrape_daily, scrape_date_range, fetch_paper_details, fetch_papers_concurrently
+)
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hf"
+
+# Saved huggingface.co responses served by the stub server, by request path
+STUB_ROUTES = {
+    "/api/daily_papers?date=2024-01-15": "api_daily_papers_2024-01-15.json",
+    "/papers?date=2024-01-16": "papers_2024-01-16.html",
+    "/papers/month/2024-01": "papers_month_2024-01.html",
+    "/papers/2401.00003": "paper_2401.00003.html",
+}
+
+
+LISTING_HTML = """
+<html><body>
+  <a href="/papers/2401.00001">First</a>
+  <a href="/papers/2401.00002">Second</a>
+</body></html>
+"""
+
+DETAIL_HTML = """
+<html><body>
+  <h1>Paper {paper_id}</h1>
+  <p class="abstract">Abstract of {paper_id}.</p>
+  <time datetime="2024-01-15">Jan 15</time>
+</body></html>
+"""
+
+
+class _Site:
+    """MockTransport handler serving listing and detail pages and recording requests."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path.startswith("/papers/month/") or (path == "/papers" and "date" in request.url.params):
+            return httpx.Response(200, text=LISTING_HTML)
+        if path.startswith("/papers/"):
+            paper_id = path.rsplit("/", 1)[-1]
+            return httpx.Response(200, text=DETAIL_HTML.format(paper_id=paper_id))
+        return httpx.Response(404)
+
+
+class _FakeClock:
+    """Clock and sleep for the rate limiter that advance instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def _session(handler, **kwargs) -> ScraperSession:
+    """Session on a mock transport with a limiter that never waits for real."""
+    clock = _FakeClock()
+    limiter = AdaptiveRateLimiter(rate=1000, max_rate=1000, clock=clock, sleep=clock.sleep)
+    return ScraperSession(limiter=limiter, transport=httpx.MockTransport(handler), **kwargs)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Serves the fixture files and records requested paths on the server."""
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        name = STUB_ROUTES.get(self.path)
+        if name is None:
+            self.send_error(404)
+            return
+        body = (FIXTURES / name).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json" if name.endswith(".json") else "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def hf_stub(monkeypatch):
+    """Local HTTP server standing in for huggingface.co; yields the requested paths."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.paths = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    monkeypatch.setattr(scraper, "HF_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    try:
+        yield server.paths
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+async def stub_session():
+    """Real session (no mock transport) with a limiter that does not hold tests up."""
+    async with ScraperSession(limiter=AdaptiveRateLimiter(rate=1000, max_rate=1000), trust_env=False) as session:
+        yield session
+
+
+@pytest.fixture
+def site():
+    return _Site()
+
+
+@pytest.fixture
+def counted_sessions(site, monkeypatch):
+    """Make sessions opened by the scraper use the mock site, and count them."""
+    opened = []
+
+    class CountingSession(ScraperSession):
+        def __init__(self, **client_kwargs):
+            super().__init__(
+                limiter=AdaptiveRateLimiter(rate=1000, max_rate=1000),
+                transport=httpx.MockTransport(site), **client_kwargs
+            )
+            opened.append(self)
+
+    monkeypatch.setattr(scraper, "ScraperSession", CountingSession)
+    monkeypatch.setattr(scraper, "_shared_session", None)
+    return opened
+
+
+class TestScraperSession:
+    """Tests for sharing one pooled client across a crawl."""
+
+    @pytest.mark.asyncio
+    async def test_passed_session_is_used_and_left_open(self, site):
+        """Every request of the crawl goes through the caller's session, which stays open."""
+        async with _session(site) as session:
+            papers = await scrape_month("2024-01", session=session)
+            assert not session.client.is_closed
+
+        assert [p.id for p in papers] == ["2401.00001", "2401.00002"]
+        assert papers[0].title == "Paper 2401.00001"
+        assert len(site.requests) == 3
+        assert session.client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_one_session_per_crawl(self, counted_sessions, site):
+        """Without a session, a crawl opens one for all of its requests and closes it."""
+        papers = await scrape_date_range("2024-01-15", "2024-01-16")
+
+        assert [p.id for p in papers] == ["2401.00001", "2401.00002"]
+        assert len(counted_sessions) == 1
+        assert counted_sessions[0].client.is_closed
+        # Per day: the JSON endpoint (404 here), the listing page and two paper pages
+        assert len(site.requests) == 8
+
+    @pytest.mark.asyncio
+    async def test_shared_session_preferred(self, counted_sessions, site):
+        """An open app-wide session is used instead of opening a new one."""
+        shared = await scraper.open_scraper_session()
+        try:
+            await fetch_paper_details("2401.00001")
+            await fetch_paper_details("2401.00002")
+            assert counted_sessions == [shared]
+            assert not shared.client.is_closed
+        finally:
+            await scraper.close_scraper_session()
+        assert shared.client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_client_settings(self, site):
+        """Sessions follow redirects and identify themselves."""
+        async with _session(site) as session:
+            assert session.client.follow_redirects
+            assert session.client.headers["user-agent"] == scraper.SCRAPER_USER_AGENT
+            assert session.client.timeout.connect == scraper.SCRAPER_CONNECT_TIMEOUT
+
+    @pytest.mark.asyncio
+    async def test_failed_detail_returns_none(self, site):
+        """HTTP errors on a paper page are reported as a missing paper."""
+        async with _session(lambda request: httpx.Response(500)) as session:
+            assert await fetch_paper_details("2401.00001", session=session) is None
+
+
+class TestRetryAfter:
+    """Tests for parse_retry_after."""
+
+    @pytest.mark.parametrize("value,expected", [
+        (None, None),
+        ("", None),
+        ("120", 120.0),
+        ("100000", scraper.SCRAPER_MAX_RETRY_AFTER),
+        ("Mon, 15 Jan 2024 12:00:30 GMT", 30.0),
+        ("Mon, 15 Jan 2024 11:00:00 GMT", 0.0),
+        ("soon", None),
+    ])
+    def test_parse(self, value, expected):
+        now = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+        assert parse_retry_after(value, now=now) == expected
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for the AIMD token bucket."""
+
+    def _limiter(self, **kwargs) -> tuple[AdaptiveRateLimiter, _FakeClock]:
+        clock = _FakeClock()
+        return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs), clock
+
+    @pytest.mark.asyncio
+    async def test_spaces_requests_by_rate(self):
+        limiter, clock = self._limiter(rate=2)
+        for _ in range(3):
+            await limiter.acquire()
+        assert clock.now == pytest.approx(1.0)
+
+    def test_additive_increase_is_capped(self):
+        limiter, _ = self._limiter(rate=1, step=0.5, max_rate=1.6)
+        limiter.on_success()
+        assert limiter.rate == 1.5
+        limiter.on_success()
+        assert limiter.rate == 1.6
+
+    @pytest.mark.asyncio
+    async def test_throttle_halves_rate_and_pauses(self):
+        """A throttle halves the rate and holds requests for Retry-After."""
+        limiter, clock = self._limiter(rate=4, min_rate=0.5)
+        await limiter.acquire()
+
+        limiter.on_throttle(retry_after=10)
+        limiter.on_throttle(retry_after=5)  # In-flight request throttled during the pause
+        assert (limiter.rate, limiter.throttles) == (2, 1)
+
+        await limiter.acquire()
+        assert clock.now == pytest.approx(10.0)
+
+    def test_rate_has_a_floor(self):
+        limiter, clock = self._limiter(rate=1, min_rate=0.4)
+        for _ in range(3):
+            limiter.on_throttle()
+            clock.now += 10
+        assert limiter.rate == 0.4
+
+
+class TestConcurrentFetching:
+    """Tests for throttled retries and bounded concurrent fetching."""
+
+    @pytest.mark.asyncio
+    async def test_retries_after_throttle(self, site):
+        """A 429 slows the limiter down and the request is retried."""
+        statuses = iter([429, 200])
+
+        def handler(request):
+            status = next(statuses)
+            if status == 429:
+                return httpx.Response(429, headers={"Retry-After": "2"})
+            return site(request)
+
+        async with _session(handler) as session:
+            paper = await fetch_paper_details("2401.00001", session=session)
+
+        assert paper.id == "2401.00001"
+        assert session.limiter.throttles == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(429)
+
+        async with _session(handler, max_retries=2) as session:
+            with pytest.raises(httpx.HTTPStatusError):
+                await session.get("https://huggingface.co/papers/month/2024-01")
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self, site):
+        """No more than `concurrency` requests should be in flight."""
+        in_flight, peak = 0, 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return site(request)
+
+        paper_ids = [f"2401.{i:05d}" for i in range(12)]
+        async with _session(handler, concurrency=3) as session:
+            results = [r async for r in fetch_papers_concurrently(paper_ids, session)]
+
+        assert sorted(paper_id for paper_id, _ in results) == paper_ids
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_streams_in_completion_order(self, site):
+        """Results stream as they finish; scrape_* still return listing order."""
+        delays = {"2401.00001": 0.03, "2401.00002": 0.0}
+
+        async def handler(request):
+            await asyncio.sleep(delays.get(request.url.path.rsplit("/", 1)[-1], 0.0))
+            return site(request)
+
+        async with _session(handler) as session:
+            streamed = [paper_id async for paper_id, _ in fetch_papers_concurrently(list(delays), session)]
+            papers = await scrape_daily("2024-01-15", session=session)
+
+        assert streamed == ["2401.00002", "2401.00001"]
+        assert [p.id for p in papers] == ["2401.00001", "2401.00002"]
+        assert papers[0].appeared_date == "2024-01-15"
+
+    @pytest.mark.asyncio
+    async def test_closing_early_cancels_fetches(self, site):
+        """Breaking out of the stream should not leave fetches running."""
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return site(request)
+
+        paper_ids = [f"2401.{i:05d}" for i in range(20)]
+        async with _session(handler, concurrency=2) as session:
+            stream = fetch_papers_concurrently(paper_ids, session)
+            async for _ in stream:
+                break
+            await stream.aclose()
+            requested = len(site.requests)
+            await asyncio.sleep(0.05)
+
+        assert requested < len(paper_ids)
+        assert len(site.requests) == requested
+
+
+class TestListingExtraction:
+    """Tests for taking paper metadata from listings instead of paper pages."""
+
+    @pytest.mark.asyncio
+    async def test_daily_from_json_endpoint(self, hf_stub, stub_session):
+        """A day listed by the JSON endpoint takes one request."""
+        papers = await scrape_daily("2024-01-15", session=stub_session)
+
+        assert hf_stub == ["/api/daily_papers?date=2024-01-15"]
+        assert [p.id for p in papers] == ["2401.00001", "2401.00002"]
+        paper = papers[0]
+        assert paper.title == "Efficient Attention for Long Sequences"
+        assert paper.abstract == "We propose a linear-time attention mechanism. It scales to 1M tokens."
+        assert paper.authors == ["Ada Lovelace", "Alan Turing"]
+        assert paper.upvotes == 42
+        assert paper.published_date == "2024-01-14T17:59:12"
+        assert paper.appeared_date == "2024-01-15"
+        assert paper.arxiv_url == "https://arxiv.org/abs/2401.00001"
+        assert paper.content_hash == compute_content_hash(paper.title, paper.abstract)
+
+    @pytest.mark.asyncio
+    async def test_daily_page_fallback(self, hf_stub, stub_session):
+        """Without the JSON endpoint the page's embedded data is used; link-only papers get their page fetched."""
+        papers = await scrape_daily("2024-01-16", session=stub_session)
+
+        assert hf_stub == [
+            "/api/daily_papers?date=2024-01-16", "/papers?date=2024-01-16", "/papers/2401.00003"
+        ]
+        assert [p.id for p in papers] == ["2401.00004", "2401.00001", "2401.00003"]
+        assert papers[1].upvotes == 45
+        assert papers[2].title == "Retrieval-Augmented Agents"
+        assert all(p.appeared_date == "2024-01-16" for p in papers)
+
+    @pytest.mark.asyncio
+    async def test_month_fetches_only_missing_fields(self, hf_stub, stub_session):
+        """Only the paper missing its abstract costs a page fetch, and only that field is taken from it."""
+        papers = await scrape_month("2024-01", session=stub_session)
+
+        assert hf_stub == ["/papers/month/2024-01", "/papers/2401.00003"]
+        assert [p.id for p in papers] == ["2401.00001", "2401.00002", "2401.00003"]
+        filled = papers[2]
+        assert filled.abstract == "Agents that retrieve documents before acting outperform agents that do not."
+        assert filled.upvotes == 3  # From the listing; the paper page shows none
+        assert filled.published_date == "2024-01-20T08:00:00"
+
+    def test_links_only_listing(self):
+        """Pages without embedded data still yield their papers, with every field missing."""
+        listing = parse_listing(LISTING_HTML)
+        assert [p.id for p in listing] == ["2401.00001", "2401.00002"]
+        assert listing[0].missing_fields() == ["title", "abstract", "published_date", "upvotes", "authors"]
+
+    def test_to_paper_without_detail(self):
+        """A failed page fetch keeps entries that have a title; missing fields are left empty."""
+        paper = ListingPaper(id="2401.00001", title="T").to_paper()
+        assert (paper.abstract, paper.upvotes, paper.authors) == ("", 0, [])
+        assert ListingPaper(id="2401.00001", abstract="A").to_paper() is None
+
+    @pytest.mark.asyncio
+    async def test_page_without_abstract_is_kept(self, capsys):
+        """A fetched page with a title but no abstract still gives a paper; one with no title is dropped and logged."""
+        def handler(request):
+            path = request.url.path
+            if path.startswith("/papers/month/"):
+                return httpx.Response(200, text=LISTING_HTML)
+            if path == "/papers/2401.00001":
+                return httpx.Response(200, text="<html><body><h1>Untitled abstract</h1></body></html>")
+            return httpx.Response(200, text="<html><body><p>No heading</p></body></html>")
+
+        async with _session(handler) as session:
+            papers = await scrape_month("2024-01", session=session)
+
+        assert [(p.id, p.title, p.abstract) for p in papers] == [("2401.00001", "Untitled abstract", "")]
+        assert "Dropping paper 2401.00002" in capsys.readouterr().out
+
+
+# Markup where BeautifulSoup's matching rules are easy to get subtly wrong
+LONG_TEXT = "x" * 201
+TRICKY_PAGES = [
+    "",
+    "<section id='abstract'> Sec <i>tion</i> </section>",
+    "<p class='Abstract'></p><div class='abstract'>div</div>",
+    "<div class='likes'><!--7--></div><span>3</span>",
+    "<div data-x='upvote'><b>x</b>12</div>",
+    "<div>12</div><span class='upvote'>34</span>",
+    "<div>5\n</div><div class='x'>like</div>",
+    "<p>\n<b>1\n2</b></p><span data-upvote=''>7</span>",
+    "<div class='upvote'>no digits</div><button class='LikeButton'>x 17 y 18</button>",
+    "<h1>A<script>1</script><style>b</style><!--c-->B <em>C</em></h1>",
+    "<template>T<b>U</b></template><h1><template>X<b>Y</b></template>Z</h1>",
+    "<meta name='author' content='M1'><meta name='author' content=''><meta name='author' content='M2'>",
+    "<div class='authors'><a> </a><a>Ann <b>Lee</b></a></div>",
+    "<a class='author-link'>Self</a><meta name='author' content='M'>",
+    f"<body><p>http{LONG_TEXT}</p><p>{LONG_TEXT}</p></body>",
+    f"<main></main><article><p>{LONG_TEXT}</p></article>",
+    "<time datetime=''> Jan 6 </time>",
+    '<?xml version="1.0" encoding="utf-8"?><html><body><h1>Caf\u00e9</h1></body></html>',
+]
+
+
+class TestPaperPageParsing:
+    """Tests for the lxml paper page parser against the BeautifulSoup reference."""
+
+    @pytest.mark.parametrize("path", sorted(FIXTURES.glob("paper_*.html")), ids=lambda p: p.name)
+    def test_recorded_pages_match_reference(self, path):
+        html = path.read_text()
+        paper_id = path.stem.split("_", 1)[1]
+        assert parse_paper_page(html, paper_id, "2024-01-15") == parse_paper_page_soup(html, paper_id, "2024-01-15")
+
+    @pytest.mark.parametrize("html", TRICKY_PAGES)
+    def test_tricky_markup_matches_reference(self, html):
+        assert parse_paper_page(html, "2401.00001") == parse_paper_page_soup(html, "2401.00001")
+
+    def test_recorded_page_fields(self):
+        paper = parse_paper_page((FIXTURES / "paper_2401.00001.html").read_text(), "2401.00001")
+        assert paper.upvotes == 128  # Not the notification count that comes first
+        assert paper.authors == ["Ada Lovelace", "Alan Turing", "Grace Hopper", "Edsger Dijkstra", "Barbara Liskov"]
+        assert paper.published_date == "2024-01-14T17:59:12"
+        assert paper.title.startswith("Efficient Attention")
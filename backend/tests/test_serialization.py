@@ -0,0 +1,121 @@
+"""
+Tests for response serialization and content negotiation.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serialization
+from serialization import encode, format_for_accept, FastResponse
+from main import app, response_cache, PaperCard
+
+
+def _card(paper_id: str = "2401.00001") -> PaperCard:
+    return PaperCard(
+        paperId=paper_id, title="Title", abstractSnippet="Snippet", publishedDate="2024-01-15",
+        upvotes=3, authorsShort=["A"], primaryTag="Efficient AI", secondaryTags=[], taskTags=["qa"],
+        modality=["text"], hfUrl="h", pdfUrl="p", arxivUrl="a", researchQuestion="", confidence=0.5,
+        rationale="",
+    )
+
+
+@pytest.fixture
+async def client():
+    """Create async test client with an empty response cache."""
+    response_cache.clear()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+class TestEncode:
+    """Tests for encode()."""
+
+    def test_encodes_models_like_model_dump(self):
+        """Pydantic models should encode to the same JSON as model_dump."""
+        card = _card()
+        assert json.loads(encode([card])) == [card.model_dump()]
+
+    def test_encodes_datetimes_and_int_keys(self):
+        """Datetimes become ISO strings and non-string keys are allowed."""
+        data = json.loads(encode({"at": datetime(2024, 1, 15, 12, 0), 1: "one"}))
+        assert data == {"at": "2024-01-15T12:00:00", "1": "one"}
+
+    def test_msgpack_round_trip(self):
+        """MessagePack output should decode to the JSON-equivalent structure."""
+        msgpack = pytest.importorskip("msgpack")
+        card = _card()
+        assert msgpack.unpackb(encode({"papers": [card]}, "msgpack")) == {"papers": [card.model_dump()]}
+
+
+class TestNegotiation:
+    """Tests for Accept header negotiation."""
+
+    @pytest.fixture(autouse=True)
+    def msgpack_available(self, monkeypatch):
+        # Negotiation only needs to know msgpack is importable
+        if serialization.msgpack is None:
+            monkeypatch.setattr(serialization, "msgpack", object())
+
+    @pytest.mark.parametrize("accept,expected", [
+        (None, "json"),
+        ("*/*", "json"),
+        ("application/json", "json"),
+        ("application/msgpack", "msgpack"),
+        ("application/x-msgpack", "msgpack"),
+        ("application/msgpack, */*;q=0.8", "msgpack"),
+        ("application/json;q=0.5, application/msgpack", "msgpack"),
+        ("application/json, application/msgpack", "json"),
+        ("application/msgpack;q=0", "json"),
+    ])
+    def test_format_for_accept(self, accept, expected):
+        assert format_for_accept(accept) == expected
+
+    def test_json_without_msgpack(self, monkeypatch):
+        """Without msgpack installed every client gets JSON."""
+        monkeypatch.setattr(serialization, "msgpack", None)
+        assert format_for_accept("application/msgpack") == "json"
+
+
+class TestFastResponse:
+    """Tests for the default response class."""
+
+    def test_defaults_to_json(self):
+        response = FastResponse({"cards": [_card()]})
+        assert response.media_type == "application/json"
+        assert response.headers["vary"] == "Accept"
+        assert json.loads(response.body)["cards"][0]["paperId"] == "2401.00001"
+
+    @pytest.mark.asyncio
+    async def test_endpoints_serve_json(self, client, populated_database):
+        """Default, cached and conditional endpoints should all answer with JSON."""
+        for url, params in [
+            ("/api/months/2024-01/papers", {}),
+            ("/api/search", {"q": "alignment"}),
+            ("/api/flow", {"start_date": "2024-01-01", "end_date": "2024-01-14"}),
+            ("/api/taxonomy/curated", {}),
+        ]:
+            response = await client.get(url, params=params)
+            assert response.status_code == 200, url
+            assert response.headers["content-type"].startswith("application/json"), url
+            assert response.json() is not None
+
+    @pytest.mark.asyncio
+    async def test_msgpack_responses(self, client, populated_database):
+        """Clients asking for MessagePack should get the same data in that format."""
+        msgpack = pytest.importorskip("msgpack")
+        headers = {"Accept": "application/msgpack"}
+
+        as_json = await client.get("/api/months/2024-01/summary")
+        as_msgpack = await client.get("/api/months/2024-01/summary", headers=headers)
+
+        assert as_msgpack.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+        assert as_msgpack.headers["etag"] != as_json.headers["etag"]
@@ -1,11 +1,11 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { Search, Calendar, RefreshCw, X, Grid3X3, GitBranch, TrendingUp } from 'lucide-react';
-import type { MonthSummary, ClusterInfo, PaperCard as PaperCardType, ClusterGraphData, ClusterNode, FlowData } from './api';
+import type { MonthSummary, ClusterInfo, PaperCard as PaperCardType, ClusterGraphData, ClusterNode, FlowData, MonthInfo } from './api';
 import {
-  fetchMonthSummary,
-  fetchMonthPapers,
+  fetchMonthBundle,
+  fetchMonthPapersPage,
+  fetchAvailableMonths,
   fetchClusterPapers,
-  fetchClusterGraph,
   triggerReindex,
   fetchIndexStatus,
   fetchFlowData,
@@ -40,6 +40,9 @@ function App() {
   const [summary, setSummary] = useState<MonthSummary | null>(null);
   const [allPapers, setAllPapers] = useState<PaperCardType[]>([]);
   const [filteredPapers, setFilteredPapers] = useState<PaperCardType[]>([]);
+  const [papersCursor, setPapersCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  const currentMonth = useRef(selectedMonth);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
@@ -66,10 +69,24 @@ function App() {
   const [isIndexing, setIsIndexing] = useState(false);
   const [indexStatus, setIndexStatus] = useState<string>('');
 
-  const months = getRecentMonths(12);
+  // Indexed months with paper counts; recent months stay selectable so they can be indexed
+  const [monthIndex, setMonthIndex] = useState<MonthInfo[]>([]);
+  const indexedMonths = new Map(monthIndex.map((m) => [m.month, m]));
+  const months = Array.from(new Set([...getRecentMonths(12), ...indexedMonths.keys()])).sort().reverse();
+
+  function loadMonthIndex() {
+    fetchAvailableMonths()
+      .then((index) => setMonthIndex(index.months))
+      .catch((err) => console.error('Failed to load months:', err));
+  }
+
+  useEffect(() => {
+    loadMonthIndex();
+  }, []);
 
   // Load month data
   useEffect(() => {
+    currentMonth.current = selectedMonth;
     loadMonthData();
   }, [selectedMonth]);
 
@@ -83,16 +100,16 @@ function App() {
       const lastDay = new Date(year, month, 0).getDate();
       const endDate = `${selectedMonth}-${String(lastDay).padStart(2, '0')}`;
 
-      const [summaryData, papersData, graphDataResult, flowDataResult] = await Promise.all([
-        fetchMonthSummary(selectedMonth),
-        fetchMonthPapers(selectedMonth, { sortBy, limit: 200 }),
-        fetchClusterGraph(selectedMonth),
+      const [bundle, flowDataResult] = await Promise.all([
+        fetchMonthBundle(selectedMonth, { include: ['summary', 'graph', 'papers'], sortBy, limit: 200 }),
         fetchFlowData(startDate, endDate).catch(() => null), // Flow data is optional
       ]);
-      setSummary(summaryData);
+      const papersData = bundle.papers ?? [];
+      setSummary(bundle.summary);
       setAllPapers(papersData);
       setFilteredPapers(papersData);
-      setGraphData(graphDataResult);
+      setPapersCursor(bundle.nextCursor);
+      setGraphData(bundle.graph);
       setFlowData(flowDataResult);
     } catch (err) {
       console.error('Failed to load data:', err);
@@ -100,6 +117,7 @@ function App() {
       setSummary(null);
       setAllPapers([]);
       setFilteredPapers([]);
+      setPapersCursor(null);
       setGraphData(null);
       setFlowData(null);
     } finally {
@@ -107,6 +125,23 @@ function App() {
     }
   }
 
+  // Load the next page of the month's papers after the last one shown
+  async function loadMorePapers() {
+    if (!papersCursor) return;
+    const month = selectedMonth;
+    setIsLoadingMore(true);
+    try {
+      const page = await fetchMonthPapersPage(month, { sortBy, limit: 200, cursor: papersCursor });
+      if (month !== currentMonth.current) return; // Month changed while loading
+      setAllPapers((papers) => [...papers, ...page.papers]);
+      setPapersCursor(page.nextCursor);
+    } catch (err) {
+      console.error('Failed to load more papers:', err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  }
+
   // Search filtering
   useEffect(() => {
     if (!searchQuery.trim()) {
@@ -175,6 +210,7 @@ function App() {
         if (status.status === 'completed') {
           setIsIndexing(false);
           loadMonthData();
+          loadMonthIndex();
         } else if (status.status === 'failed') {
           setIsIndexing(false);
           setError(status.message);
@@ -257,7 +293,7 @@ function App() {
                 >
                   {months.map((m) => (
                     <option key={m} value={m} className="bg-gray-800">
-                      {m}
+                      {indexedMonths.has(m) ? `${m} (${indexedMonths.get(m)!.paperCount})` : `${m} (not indexed)`}
                     </option>
                   ))}
                 </select>
@@ -447,10 +483,21 @@ function App() {
               <div className="mt-12">
                 <h3 className="text-lg font-semibold mb-4">All Papers</h3>
                 <PaperCarousel
-                  papers={filteredPapers.slice(0, 20)}
+                  papers={filteredPapers}
                   onPaperClick={setSelectedPaper}
                   onTagClick={handleTagClick}
                 />
+                {papersCursor && (
+                  <div className="mt-4 text-center">
+                    <button
+                      onClick={loadMorePapers}
+                      disabled={isLoadingMore}
+                      className="text-sm text-gray-400 hover:text-white disabled:opacity-50"
+                    >
+                      {isLoadingMore ? 'Loading...' : `Load more papers (${allPapers.length} of ${summary.totalPapers})`}
+                    </button>
+                  </div>
+                )}
               </div>
             )}
           </>
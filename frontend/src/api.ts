@@ -67,6 +67,7 @@ export interface IndexStatus {
   month: string;
   papers_scraped: number;
   papers_tagged: number;
+  papers_skipped: number;
   message: string;
 }
 
@@ -166,6 +167,73 @@ export async function fetchMonthPapers(
   return res.json();
 }
 
+export interface PaperPage {
+  papers: PaperCard[];
+  nextCursor: string | null;
+}
+
+// Keyset-paginated month listing for infinite scroll; pass the previous
+// page's nextCursor to continue where it left off.
+export async function fetchMonthPapersPage(
+  month: string,
+  options?: {
+    cluster?: string;
+    task?: string;
+    modality?: string;
+    search?: string;
+    sortBy?: 'upvotes' | 'date' | 'confidence';
+    limit?: number;
+    cursor?: string | null;
+  }
+): Promise<PaperPage> {
+  const params = new URLSearchParams();
+  if (options?.cluster) params.set('cluster', options.cluster);
+  if (options?.task) params.set('task', options.task);
+  if (options?.modality) params.set('modality', options.modality);
+  if (options?.search) params.set('search', options.search);
+  if (options?.sortBy) params.set('sort_by', options.sortBy);
+  if (options?.limit) params.set('limit', options.limit.toString());
+  if (options?.cursor) params.set('cursor', options.cursor);
+
+  const res = await fetch(`${API_BASE}/api/months/${month}/papers?${params}`);
+  if (!res.ok) throw new Error('Failed to fetch papers');
+  return {
+    papers: await res.json(),
+    nextCursor: res.headers.get('X-Next-Cursor'),
+  };
+}
+
+export type MonthBundleSection = 'summary' | 'clusters' | 'graph' | 'papers';
+
+// Sections that were not requested come back as null
+export interface MonthBundle {
+  month: string;
+  summary: MonthSummary | null;
+  clusters: ClusterInfo[] | null;
+  graph: ClusterGraphData | null;
+  papers: PaperCard[] | null;
+  nextCursor: string | null;
+}
+
+// Several month payloads from a single backend load and one round trip
+export async function fetchMonthBundle(
+  month: string,
+  options?: {
+    include?: MonthBundleSection[];
+    sortBy?: 'upvotes' | 'date' | 'confidence';
+    limit?: number;
+  }
+): Promise<MonthBundle> {
+  const params = new URLSearchParams();
+  if (options?.include) params.set('include', options.include.join(','));
+  if (options?.sortBy) params.set('sort_by', options.sortBy);
+  if (options?.limit) params.set('limit', options.limit.toString());
+
+  const res = await fetch(`${API_BASE}/api/months/${month}/bundle?${params}`);
+  if (!res.ok) throw new Error('Failed to fetch month bundle');
+  return res.json();
+}
+
 export async function fetchClusters(month: string): Promise<ClusterInfo[]> {
   const res = await fetch(`${API_BASE}/api/months/${month}/clusters`);
   if (!res.ok) throw new Error('Failed to fetch clusters');
@@ -196,7 +264,31 @@ export async function fetchPaperDetail(paperId: string): Promise<PaperDetail> {
   return res.json();
 }
 
-export async function fetchAvailableMonths(): Promise<{ months: string[] }> {
+// Resolve id lists (paperIds, sharedPaperIds, top_papers, ...) in one request
+export async function fetchPapersBatch(ids: string[]): Promise<{ papers: PaperCard[]; missing: string[] }>;
+export async function fetchPapersBatch(
+  ids: string[],
+  view: 'detail'
+): Promise<{ papers: PaperDetail[]; missing: string[] }>;
+export async function fetchPapersBatch(ids: string[], view: 'card' | 'detail' = 'card') {
+  const res = await fetch(`${API_BASE}/api/papers/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ ids, view }),
+  });
+  if (!res.ok) throw new Error('Failed to fetch papers');
+  return res.json();
+}
+
+// Months that have papers, newest first
+export interface MonthInfo {
+  month: string;
+  paperCount: number;
+  taggedCount: number;
+  lastUpdated: string | null;
+}
+
+export async function fetchAvailableMonths(): Promise<{ months: MonthInfo[] }> {
   const res = await fetch(`${API_BASE}/api/months`);
   if (!res.ok) throw new Error('Failed to fetch months');
   return res.json();
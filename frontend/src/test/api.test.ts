@@ -7,6 +7,10 @@ import {
   fetchHotTopics,
   fetchDailyStats,
   fetchTrendData,
+  fetchMonthPapersPage,
+  fetchMonthBundle,
+  fetchAvailableMonths,
+  fetchPapersBatch,
   type FlowData,
   type EmergingTopicsReport,
   type TrendSignal,
@@ -72,6 +76,93 @@ describe('API Functions', () => {
     });
   });
 
+  describe('fetchMonthPapersPage', () => {
+    it('should pass the cursor and return the next one', async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        headers: new Headers({ 'X-Next-Cursor': 'next-token' }),
+        json: async () => [],
+      });
+
+      const result = await fetchMonthPapersPage('2024-01', { limit: 20, cursor: 'abc' });
+
+      expect(mockFetch).toHaveBeenCalledWith(
+        expect.stringContaining('/api/months/2024-01/papers?limit=20&cursor=abc')
+      );
+      expect(result).toEqual({ papers: [], nextCursor: 'next-token' });
+    });
+
+    it('should return a null cursor on the last page', async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        headers: new Headers(),
+        json: async () => [],
+      });
+
+      const result = await fetchMonthPapersPage('2024-01');
+
+      expect(result.nextCursor).toBeNull();
+    });
+  });
+
+  describe('fetchAvailableMonths', () => {
+    it('should return the month index', async () => {
+      const index = {
+        months: [{ month: '2024-01', paperCount: 20, taggedCount: 18, lastUpdated: '2024-01-31T12:00:00' }],
+      };
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        json: async () => index,
+      });
+
+      const result = await fetchAvailableMonths();
+
+      expect(mockFetch).toHaveBeenCalledWith(expect.stringContaining('/api/months'));
+      expect(result).toEqual(index);
+    });
+  });
+
+  describe('fetchPapersBatch', () => {
+    it('should post the ids and view', async () => {
+      const batch = { papers: [], missing: ['2401.00001'] };
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        json: async () => batch,
+      });
+
+      const result = await fetchPapersBatch(['2401.00001'], 'detail');
+
+      expect(mockFetch).toHaveBeenCalledWith(
+        expect.stringContaining('/api/papers/batch'),
+        expect.objectContaining({ method: 'POST', body: JSON.stringify({ ids: ['2401.00001'], view: 'detail' }) })
+      );
+      expect(result).toEqual(batch);
+    });
+  });
+
+  describe('fetchMonthBundle', () => {
+    it('should request the selected sections', async () => {
+      const bundle = { month: '2024-01', summary: null, clusters: null, graph: null, papers: [], nextCursor: null };
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        json: async () => bundle,
+      });
+
+      const result = await fetchMonthBundle('2024-01', { include: ['summary', 'papers'], limit: 50 });
+
+      expect(mockFetch).toHaveBeenCalledWith(
+        expect.stringContaining('/api/months/2024-01/bundle?include=summary%2Cpapers&limit=50')
+      );
+      expect(result).toEqual(bundle);
+    });
+
+    it('should throw error on failed request', async () => {
+      mockFetch.mockResolvedValueOnce({ ok: false, status: 400 });
+
+      await expect(fetchMonthBundle('2024-01')).rejects.toThrow('Failed to fetch month bundle');
+    });
+  });
+
   describe('fetchEmergingReport', () => {
     const mockReport: EmergingTopicsReport = {
       generated_at: '2024-01-15T10:00:00Z',